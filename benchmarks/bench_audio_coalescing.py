@@ -0,0 +1,86 @@
+"""Bedrock audioInput events/sec with uplink coalescing on and off.
+
+A simulated client streams 16 kHz PCM in real time at several chunk sizes into
+an ``S2sSessionManager`` whose Bedrock stream is replaced by a recorder. For
+each chunk size the script reports client chunks/sec, audioInput events/sec
+sent to Bedrock, and how long audio waited in the coalescer (enqueue of a
+batch's first chunk to send).
+
+    python benchmarks/bench_audio_coalescing.py [--seconds 2] [--chunk-ms 10 20 32 64]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import base64
+
+from s2s_session_manager import INPUT_BYTES_PER_MS, S2sSessionManager
+
+
+class RecordingInputStream:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, chunk):
+        self.sent.append((asyncio.get_running_loop().time(), chunk.value.bytes_))
+
+
+class RecordingStream:
+    def __init__(self):
+        self.input_stream = RecordingInputStream()
+
+
+async def stream_audio(chunk_ms, seconds, coalesce):
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="bench", timezone="UTC")
+    if not coalesce:
+        s.audio_coalesce_target_bytes = 0
+    s.stream = RecordingStream()
+    s.is_active = True
+    s.audio_task = asyncio.create_task(s._process_audio_input())
+    loop = asyncio.get_running_loop()
+
+    chunk_bytes = int(chunk_ms * INPUT_BYTES_PER_MS)
+    chunk_count = int(seconds * 1000 / chunk_ms)
+    enqueued_at = {}
+    start = loop.time()
+    for i in range(chunk_count):
+        await asyncio.sleep(max(0.0, start + i * chunk_ms / 1000 - loop.time()))
+        tag = i % 256
+        enqueued_at[tag] = loop.time()
+        s.add_audio_chunk("p1", "a1", bytes([tag]) * chunk_bytes)
+    await asyncio.sleep(0.1)
+    s.audio_task.cancel()
+    await asyncio.gather(s.audio_task, return_exceptions=True)
+
+    waits = []
+    for sent_at, payload in s.stream.input_stream.sent:
+        pcm = base64.b64decode(json.loads(payload)["event"]["audioInput"]["content"])
+        waits.append(sent_at - enqueued_at[pcm[0]])
+    return chunk_count / seconds, len(s.stream.input_stream.sent) / seconds, waits
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--chunk-ms", type=float, nargs="+", default=[10, 20, 32, 64])
+    args = parser.parse_args()
+
+    print(f"{'chunk':>7} {'chunks/s':>9} {'events/s off':>13} {'events/s on':>12} {'reduction':>10} {'p95 wait':>9}")
+    for chunk_ms in args.chunk_ms:
+        chunks_per_s, events_off, _ = await stream_audio(chunk_ms, args.seconds, coalesce=False)
+        _, events_on, waits = await stream_audio(chunk_ms, args.seconds, coalesce=True)
+        p95 = statistics.quantiles(waits, n=20)[-1] if len(waits) > 1 else waits[0]
+        print(f"{chunk_ms:5.0f}ms {chunks_per_s:9.1f} {events_off:13.1f} {events_on:12.1f} "
+              f"{1 - events_on / events_off:10.0%} {p95 * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
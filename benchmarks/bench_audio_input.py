@@ -0,0 +1,83 @@
+"""Per-frame CPU cost of routing an inbound audioInput frame to Bedrock bytes.
+
+Compares the original path (generic ``json.loads`` + body unwrap + event
+dispatch + ``S2sEvent.audio_input`` + ``json.dumps``) with the fast path used
+by the WebSocket receive loop today.
+
+    python benchmarks/bench_audio_input.py [--frames 20000] [--chunk-bytes 1024]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from s2s_events import S2sEvent, parse_audio_input_message
+
+
+def legacy_path(message):
+    data = json.loads(message)
+    if "body" in data:
+        body = data["body"]
+        data = json.loads(body) if isinstance(body, str) else body
+    if data.get("type") == "init" or "event" not in data:
+        return None
+    event_type = list(data["event"].keys())[0]
+    if event_type in ("sessionStart", "sessionEnd", "promptStart", "contentStart", "clientEvent"):
+        return None
+    prompt_name = data["event"]["audioInput"]["promptName"]
+    content_name = data["event"]["audioInput"]["contentName"]
+    audio_base64 = data["event"]["audioInput"]["content"]
+    queued = {"prompt_name": prompt_name, "content_name": content_name, "audio_bytes": audio_base64}
+    event = S2sEvent.audio_input(queued["prompt_name"], queued["content_name"], queued["audio_bytes"])
+    return json.dumps(event).encode("utf-8")
+
+
+def fast_path(message, prefix_cache={}):
+    prompt_name, content_name, audio_base64 = parse_audio_input_message(message)
+    key = (prompt_name, content_name)
+    prefix = prefix_cache.get(key)
+    if prefix is None:
+        prefix = prefix_cache[key] = S2sEvent.audio_input_prefix(prompt_name, content_name)
+    return S2sEvent.encode_audio_input(prefix, audio_base64)
+
+
+def measure(func, messages):
+    start = time.process_time()
+    for message in messages:
+        func(message)
+    return (time.process_time() - start) / len(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--chunk-bytes", type=int, default=1024, help="PCM bytes per frame before base64")
+    args = parser.parse_args()
+
+    messages = [
+        json.dumps(
+            S2sEvent.audio_input(
+                "prompt-1", "audio-1", base64.b64encode(os.urandom(args.chunk_bytes)).decode("ascii")
+            )
+        )
+        for _ in range(256)
+    ]
+    assert all(legacy_path(m) == fast_path(m) for m in messages)
+    frames = (messages * (args.frames // len(messages) + 1))[: args.frames]
+
+    measure(legacy_path, frames[:1000])
+    measure(fast_path, frames[:1000])
+    legacy = measure(legacy_path, frames)
+    fast = measure(fast_path, frames)
+    print(f"frames={args.frames} chunk_bytes={args.chunk_bytes}")
+    print(f"legacy: {legacy * 1e6:8.2f} us/frame")
+    print(f"fast:   {fast * 1e6:8.2f} us/frame ({legacy / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
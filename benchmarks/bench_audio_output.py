@@ -0,0 +1,76 @@
+"""Per-event CPU cost of forwarding a Bedrock audioOutput event to the client.
+
+Compares the JSON downlink (``EventSerializer`` text frames) with the binary
+downlink (one base64 decode, PCM split into header-tagged frames).
+
+    python benchmarks/bench_audio_output.py [--events 5000] [--pcm-bytes 19200]
+"""
+import argparse
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from audio_frames import AUDIO_OUTPUT, split_audio_frames
+from event_serializer import EventSerializer
+
+
+def json_downlink(response, serializer=EventSerializer()):
+    return serializer.serialize(response)
+
+
+def binary_downlink(response):
+    audio_output = response["event"]["audioOutput"]
+    return split_audio_frames(
+        AUDIO_OUTPUT,
+        audio_output["promptName"],
+        audio_output["contentId"],
+        base64.b64decode(audio_output["content"]),
+    )
+
+
+def measure(func, responses):
+    start = time.process_time()
+    sent = 0
+    for response in responses:
+        sent += sum(len(frame) for frame in func(response))
+    return (time.process_time() - start) / len(responses), sent / len(responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--pcm-bytes", type=int, default=19200, help="PCM bytes per audioOutput event")
+    args = parser.parse_args()
+
+    responses = [
+        {
+            "event": {
+                "audioOutput": {
+                    "promptName": "prompt-1",
+                    "contentId": "0b3c0f4e-8a4f-4a59-9d7e-6a3d2c1b0a99",
+                    "role": "ASSISTANT",
+                    "content": base64.b64encode(os.urandom(args.pcm_bytes)).decode("ascii"),
+                }
+            },
+            "timestamp": 1767225600000,
+        }
+        for _ in range(64)
+    ]
+    events = (responses * (args.events // len(responses) + 1))[: args.events]
+
+    measure(json_downlink, events[:500])
+    measure(binary_downlink, events[:500])
+    json_cpu, json_bytes = measure(json_downlink, events)
+    binary_cpu, binary_bytes = measure(binary_downlink, events)
+    print(f"events={args.events} pcm_bytes={args.pcm_bytes}")
+    print(f"json:   {json_cpu * 1e6:8.2f} us/event {json_bytes:9.0f} bytes/event")
+    print(f"binary: {binary_cpu * 1e6:8.2f} us/event {binary_bytes:9.0f} bytes/event "
+          f"({json_cpu / binary_cpu:.1f}x less CPU, {1 - binary_bytes / json_bytes:.0%} fewer bytes)")
+
+
+if __name__ == "__main__":
+    main()
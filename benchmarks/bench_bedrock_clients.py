@@ -0,0 +1,85 @@
+"""Bedrock client setup cost with a client per session vs the shared registry.
+
+``--sessions`` sessions start concurrently. Each obtains a Bedrock runtime
+client (real ``create_bedrock_runtime_client`` construction, which builds a CRT
+HTTP client and TLS context on the event loop) and opens its stream. Opening is
+simulated: the first stream on a client pays a ``--handshake-ms`` TLS/HTTP2
+connection setup, later streams on the same client multiplex over that
+connection. Reports per-session setup time and the number of connections opened.
+
+    python benchmarks/bench_bedrock_clients.py [--sessions 50] [--handshake-ms 120]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bedrock_client_registry import BedrockClientRegistry
+from data_access import create_bedrock_runtime_client
+
+
+class SimulatedConnections:
+    """One connection per client, set up once and shared by its streams."""
+
+    def __init__(self, handshake_ms):
+        self.handshake_ms = handshake_ms
+        self._ready = {}
+
+    async def open_stream(self, client):
+        ready = self._ready.get(id(client))
+        if ready is None:
+            ready = self._ready[id(client)] = asyncio.ensure_future(asyncio.sleep(self.handshake_ms / 1000))
+        await ready
+
+    @property
+    def count(self):
+        return len(self._ready)
+
+
+async def run(get_client, sessions, handshake_ms):
+    connections = SimulatedConnections(handshake_ms)
+    keep = []
+
+    async def session(i):
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        client = get_client()
+        keep.append(client)
+        await connections.open_stream(client)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    setups = await asyncio.gather(*(session(i) for i in range(sessions)))
+    return setups, time.perf_counter() - started, connections.count
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=120)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    create_bedrock_runtime_client("us-east-1")  # import/JIT warm-up
+
+    registry = BedrockClientRegistry()
+    variants = (
+        ("per-session", lambda: create_bedrock_runtime_client("us-east-1")),
+        ("shared", lambda: registry.get("us-east-1", "amazon.nova-2-sonic-v1:0")),
+    )
+    for name, get_client in variants:
+        setups, wall, connections = await run(get_client, args.sessions, args.handshake_ms)
+        print(f"{name:<12} setup median {statistics.median(setups) * 1000:7.1f} ms  "
+              f"max {max(setups) * 1000:7.1f} ms  wall {wall * 1000:7.1f} ms  connections {connections}")
+    print(f"registry: {registry.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
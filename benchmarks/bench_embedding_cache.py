@@ -0,0 +1,114 @@
+"""Title-embedding round trips with and without the process-wide ``EmbeddingCache``.
+
+Replays ``--sessions`` concurrent conversations of ``--turns`` event-matching
+tool calls (``update_event``/``delete_event``/``open_event`` all embed the title
+through ``CandidateLookup``). Each conversation keeps coming back to the event it
+is working on ("move the dentist", "make the dentist an hour"), switching to
+another of a handful of titles with probability ``--switch``; titles are spoken
+with varying case and spacing. Titles are private to each conversation unless
+``--shared-titles`` lets users share common ones ("Gym", "Dentist"). Bedrock
+``invoke_model`` sleeps ``--embed-ms``. Reports Bedrock calls and the embedding
+time the tool calls waited on.
+
+    python benchmarks/bench_embedding_cache.py [--sessions 20] [--turns 12] [--embed-ms 80] [--shared-titles]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+from data_access import CalendarRepository
+from embedding_cache import embedding_cache
+from in_memory_services import InMemoryBedrock
+from tool_executor import ToolExecutor
+from tools.candidate_lookup import candidate_lookup_for_tool
+
+TITLES = ["Dentist", "Team standup", "Gym", "Mom's birthday dinner", "Dentist checkup", "Flight to Denver", "Yoga"]
+TOOLS = {"update_event": "current_title", "delete_event": "title", "open_event": "current_title"}
+
+
+class SlowBedrock(InMemoryBedrock):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def invoke_model(self, **kwargs):
+        time.sleep(self.latency)
+        return super().invoke_model(**kwargs)
+
+
+def conversation(seed, turns, switch, shared_titles):
+    rng = random.Random(seed)
+    user_titles = rng.sample(TITLES, 3)
+    if not shared_titles:
+        user_titles = [f"{title} {seed}" for title in user_titles]
+    title = user_titles[0]
+    calls = []
+    for _ in range(turns):
+        if rng.random() < switch:
+            title = rng.choice(user_titles)
+        spoken = rng.choice([title, title.lower(), f" {title} ", title.upper()])
+        tool_name = rng.choice(list(TOOLS))
+        calls.append((tool_name, json.dumps({TOOLS[tool_name]: spoken})))
+    return calls
+
+
+async def run(conversations, bedrock, cached):
+    embedding_cache.max_vectors = 1000 if cached else 0
+    embedding_cache.clear()
+    bedrock.invocations.clear()
+    executor = ToolExecutor(max_workers=len(conversations), max_per_user=1)
+
+    async def session(user_id, calls):
+        repo = CalendarRepository(None, None, bedrock, None, executor=executor, user_id=user_id)
+        waited = 0.0
+        for tool_name, content in calls:
+            lookup = candidate_lookup_for_tool(tool_name, repo, user_id, content, "UTC")
+            started = time.perf_counter()
+            await lookup.query_vector()
+            waited += time.perf_counter() - started
+        return waited
+
+    try:
+        waits = await asyncio.gather(*(session(f"bench-user-{i}", calls) for i, calls in enumerate(conversations)))
+    finally:
+        executor.shutdown()
+    return len(bedrock.invocations), sum(waits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--switch", type=float, default=0.3, help="chance a turn moves on to another event")
+    parser.add_argument("--embed-ms", type=float, default=80)
+    parser.add_argument("--shared-titles", action="store_true", help="draw every user's titles from one small set")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    conversations = [conversation(seed, args.turns, args.switch, args.shared_titles) for seed in range(args.sessions)]
+    bedrock = SlowBedrock(args.embed_ms / 1000)
+    tool_calls = args.sessions * args.turns
+    print(f"{args.sessions} sessions x {args.turns} tool calls, embedding {args.embed_ms:.0f} ms")
+    for name, cached in (("no cache", False), ("EmbeddingCache", True)):
+        calls, waited = asyncio.run(run(conversations, bedrock, cached))
+        print(f"{name:<15} bedrock calls {calls:4d}/{tool_calls}  "
+              f"embedding wait {waited / tool_calls * 1000:6.1f} ms per tool call  total {waited:6.2f} s")
+    stats = embedding_cache.stats()
+    print(f"cache: {stats['vectors']} vectors, hit rate {stats['hit_rate']:.0%} "
+          f"({stats['hits']} hits, {stats['coalesced']} coalesced, {stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    main()
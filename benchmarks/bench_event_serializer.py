@@ -0,0 +1,176 @@
+"""Serialization cost of the JSON downlink: legacy splitter vs ``EventSerializer``.
+
+Replays a Nova Sonic output stream through both encoders and reports CPU time,
+events/sec and bytes copied per second of stream (timestamps in the events set
+the stream's duration). "Bytes copied" counts every string or
+bytes object the encoder materializes: ``json.dumps`` results, ``.encode()``
+results, spliced content and the frames handed to ``send_text``.
+
+By default a synthetic stream shaped like a recorded session is generated
+(text turns interleaved with 0.1-0.5 s audioOutput events). Pass
+``--recording`` with a JSONL file of raw Bedrock output events (the payloads
+logged as "Received event: ..." at debug level) to replay a real session.
+
+    python benchmarks/bench_event_serializer.py [--recording events.jsonl] [--turns 200]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import event_serializer
+from event_serializer import EventSerializer
+
+MAX_SIZE = 10000
+
+
+class CountingJson:
+    """``json`` stand-in that tallies the size of every ``dumps`` result."""
+
+    def __init__(self):
+        self.copied = 0
+
+    def dumps(self, obj, **kwargs):
+        encoded = json.dumps(obj, **kwargs)
+        self.copied += len(encoded)
+        return encoded
+
+
+def legacy_split(response, counter, max_size=MAX_SIZE):
+    """The splitter ``forward_responses`` used before ``EventSerializer``."""
+    event = counter.dumps(response)
+    event_bytes = event.encode("utf-8")
+    counter.copied += len(event_bytes)
+    if len(event_bytes) <= max_size or "event" not in response:
+        return [response]
+    event_type = list(response["event"].keys())[0]
+    event_data = response["event"][event_type]
+    if "content" not in event_data:
+        return [response]
+    content = event_data["content"]
+    template_event = response.copy()
+    template_event["event"] = {event_type: event_data.copy()}
+    template_event["event"][event_type]["content"] = ""
+    overhead_bytes = counter.dumps(template_event).encode("utf-8")
+    counter.copied += len(overhead_bytes)
+    max_content_size = max_size - len(overhead_bytes) - 100
+    if event_type == "audioOutput":
+        max_content_size = (max_content_size // 4) * 4
+    chunks = []
+    for i in range(0, len(content), max_content_size):
+        chunk_event = response.copy()
+        chunk_event["event"] = {event_type: event_data.copy()}
+        chunk_event["event"][event_type]["content"] = content[i : i + max_content_size]
+        counter.copied += len(chunk_event["event"][event_type]["content"])
+        chunks.append(chunk_event)
+    return chunks
+
+
+def legacy_forward(response, counter):
+    frames = []
+    event = counter.dumps(response)
+    event_size = len(event.encode("utf-8"))
+    counter.copied += event_size
+    chunks = legacy_split(response, counter) if event_size > MAX_SIZE else [response]
+    for chunk in chunks:
+        chunk_json = counter.dumps(chunk)
+        counter.copied += len(chunk_json.encode("utf-8"))
+        frames.append(chunk_json)
+    return frames
+
+
+def serializer_forward(response, counter, serializer):
+    frames = serializer.serialize(response)
+    counter.copied += sum(len(frame) for frame in frames)
+    content = response.get("event", {}).get(next(iter(response.get("event", {})), ""), {})
+    if isinstance(content, dict) and isinstance(content.get("content"), str):
+        counter.copied += len(content["content"]) + 2
+    return frames
+
+
+def synthetic_stream(turns, seed=7):
+    rng = random.Random(seed)
+    events = []
+    ts = 1767225600000
+    for turn in range(turns):
+        text_id = f"text-{turn}"
+        audio_id = f"audio-{turn}"
+        events.append({"event": {"contentStart": {"promptName": "p1", "contentId": text_id, "type": "TEXT", "role": "ASSISTANT",
+                                                  "additionalModelFields": "{\"generationStage\":\"SPECULATIVE\"}"}}})
+        events.append({"event": {"textOutput": {"promptName": "p1", "contentId": text_id, "role": "ASSISTANT",
+                                                "content": "Sure, I moved your dentist appointment to Tuesday at 3pm. " * rng.randint(1, 4)}}})
+        events.append({"event": {"contentEnd": {"promptName": "p1", "contentId": text_id, "type": "TEXT", "stopReason": "PARTIAL_TURN"}}})
+        events.append({"event": {"contentStart": {"promptName": "p1", "contentId": audio_id, "type": "AUDIO", "role": "ASSISTANT"}}})
+        for _ in range(rng.randint(4, 12)):
+            pcm = os.urandom(rng.choice((4800, 9600, 19200, 24000)))
+            events.append({"event": {"audioOutput": {"promptName": "p1", "contentId": audio_id, "role": "ASSISTANT",
+                                                     "content": base64.b64encode(pcm).decode("ascii")}}})
+        events.append({"event": {"contentEnd": {"promptName": "p1", "contentId": audio_id, "type": "AUDIO", "stopReason": "END_TURN"}}})
+    for event in events:
+        ts += 20
+        event["timestamp"] = ts
+    return events
+
+
+def load_recording(path):
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                events.append(json.loads(line))
+    return events
+
+
+def stream_seconds(events):
+    timestamps = [event["timestamp"] for event in events if "timestamp" in event]
+    if len(timestamps) < 2:
+        return None
+    return (max(timestamps) - min(timestamps)) / 1000
+
+
+def run(name, forward, events, counter):
+    start = time.process_time()
+    frames = 0
+    for event in events:
+        frames += len(forward(event))
+    elapsed = time.process_time() - start
+    duration = stream_seconds(events)
+    per_stream_second = f"{counter.copied / duration / 1e6:7.2f} MB copied/stream-s  " if duration else ""
+    print(f"{name:<10} {elapsed * 1e3:8.1f} ms cpu  {len(events) / elapsed:9.0f} events/s  "
+          f"{per_stream_second}{counter.copied / len(events) / 1e3:6.1f} KB copied/event  {frames} frames")
+    return elapsed, counter.copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", help="JSONL file of Bedrock output events")
+    parser.add_argument("--turns", type=int, default=200, help="assistant turns in the synthetic stream")
+    args = parser.parse_args()
+
+    events = load_recording(args.recording) if args.recording else synthetic_stream(args.turns)
+    legacy_counter = CountingJson()
+    new_counter = CountingJson()
+    serializer = EventSerializer(max_size=MAX_SIZE)
+    event_serializer.json = new_counter
+
+    for event in events:
+        legacy = [json.loads(f) for f in legacy_forward(event, CountingJson())]
+        new = [json.loads(f) for f in serializer.serialize(event)]
+        assert legacy == new, event.get("event", {}).keys()
+    new_counter.copied = 0
+
+    print(f"events={len(events)}")
+    legacy_cpu, legacy_copied = run("legacy", lambda e: legacy_forward(e, legacy_counter), events, legacy_counter)
+    new_cpu, new_copied = run("serializer", lambda e: serializer_forward(e, new_counter, serializer), events, new_counter)
+    print(f"cpu: {legacy_cpu / new_cpu:.1f}x faster, bytes copied: {1 - new_copied / legacy_copied:.0%} fewer")
+
+
+if __name__ == "__main__":
+    main()
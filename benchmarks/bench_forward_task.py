@@ -0,0 +1,116 @@
+"""Task allocations in the WebSocket forwarder: 1 s polling vs the output buffer's close signal.
+
+A producer pushes audioOutput events into an ``OutputBuffer`` at a fixed rate
+while the forwarder drains them to a no-op WebSocket. A task factory counts
+every task created on the loop. The script also times how long each forwarder
+takes to notice that the upstream stream died.
+
+    python benchmarks/bench_forward_task.py [--rate 500] [--seconds 2]
+"""
+import argparse
+import asyncio
+import base64
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from starlette.websockets import WebSocketState
+
+import agent
+from output_buffer import OutputBuffer
+
+
+class NullWebSocket:
+    client_state = WebSocketState.CONNECTED
+    application_state = WebSocketState.CONNECTED
+
+    async def send_text(self, text):
+        pass
+
+    async def send_bytes(self, data):
+        pass
+
+    async def close(self, code=1000, reason=None):
+        self.client_state = WebSocketState.DISCONNECTED
+
+
+class Session:
+    def __init__(self):
+        self.output_queue = OutputBuffer(max_audio_ms=float("inf"))
+        self.is_active = True
+        self._session_end_sent = False
+        self.upstream_failed = False
+
+
+async def polling_forwarder(websocket, stream_manager):
+    """The forwarder loop as it was before the close signal."""
+    while True:
+        queue_get_task = asyncio.create_task(stream_manager.output_queue.get())
+        try:
+            response = await asyncio.wait_for(queue_get_task, timeout=1.0)
+        except asyncio.TimeoutError:
+            queue_get_task.cancel()
+            if not stream_manager.is_active:
+                await websocket.close(code=1011, reason="Upstream stream failed")
+                break
+            continue
+        await websocket.send_text(agent.EventSerializer().serialize(response)[0])
+
+
+async def run(forwarder, rate, seconds, close_signal):
+    loop = asyncio.get_running_loop()
+    created = 0
+
+    def counting_factory(loop, coro, **kwargs):
+        nonlocal created
+        created += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    session = Session()
+    event = {"event": {"audioOutput": {"contentId": "c1", "content": base64.b64encode(bytes(1920)).decode()}}}
+    ws = NullWebSocket()
+    task = asyncio.create_task(forwarder(ws, session))
+    loop.set_task_factory(counting_factory)
+    start = loop.time()
+    events = int(rate * seconds)
+    for i in range(events):
+        await asyncio.sleep(max(0.0, start + i / rate - loop.time()))
+        session.output_queue.put_nowait(event)
+    while not session.output_queue.empty():
+        await asyncio.sleep(0.001)
+    tasks = created
+    loop.set_task_factory(None)
+
+    # Upstream dies: how long until the forwarder gives up on the socket?
+    died_at = time.perf_counter()
+    session.is_active = False
+    if close_signal:
+        session.output_queue.close()
+    await task
+    return events, tasks, time.perf_counter() - died_at
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=500, help="audioOutput events per second")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    for name, forwarder, close_signal in (
+        ("polling", polling_forwarder, False),
+        ("close signal", agent.forward_responses, True),
+    ):
+        events, tasks, detect = await run(forwarder, args.rate, args.seconds, close_signal)
+        print(f"{name:<13} {events} events  {tasks / args.seconds:7.1f} tasks/s  "
+              f"{tasks / events:.2f} tasks/event  upstream failure noticed after {detect * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
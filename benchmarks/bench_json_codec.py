@@ -0,0 +1,126 @@
+"""JSON throughput on session traffic: previous ``json`` calls vs ``json_codec`` backends.
+
+Replays the JSON work one session does on the event loop:
+
+- decoding every Bedrock output event (``_process_responses``),
+- decoding client text frames (``parse_audio_input_message`` and the event path),
+- encoding events and tool results sent to Bedrock (``send_raw_event``,
+  ``_handle_tool_processing``),
+- encoding downlink events that carry no content (``EventSerializer`` fallback).
+
+The Bedrock stream is the synthetic recorded-session shape from
+``bench_event_serializer`` (or ``--recording`` events.jsonl); client uplink is
+32 ms audioInput chunks for as long as that stream lasts, plus tool results
+shaped like calendar tool output (DynamoDB ``Decimal`` numbers, dates).
+
+    python benchmarks/bench_json_codec.py [--recording events.jsonl] [--turns 200]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import json_codec
+from bench_event_serializer import load_recording, stream_seconds, synthetic_stream
+from s2s_events import S2sEvent
+
+
+def session_traffic(events, tool_calls):
+    bedrock_out = [json.dumps(event).encode("utf-8") for event in events]
+    seconds = stream_seconds(events) or 60
+    chunk = base64.b64encode(os.urandom(1024)).decode("ascii")
+    client_in = [json.dumps(S2sEvent.audio_input("p1", "a1", chunk)) for _ in range(int(seconds * 1000 / 32))]
+    tool_results = [
+        {
+            "result": "Event updated",
+            "updated_event": {
+                "id": f"evt-{n}",
+                "title": "Dentist appointment",
+                "startDate": datetime(2026, 10, 20, 15, 0, tzinfo=timezone.utc),
+                "endDate": datetime(2026, 10, 20, 16, 0, tzinfo=timezone.utc),
+                "priority": Decimal("2"),
+                "length": Decimal("1.5"),
+                "exceptionDates": {date(2026, 11, day) for day in range(1, 6)},
+                "notifications": [{"id": "n1", "timeBefore": Decimal("10"), "timeUnit": "minutes"}] * 3,
+            },
+        }
+        for n in range(tool_calls)
+    ]
+    bedrock_in = [S2sEvent.text_input_tool("p1", f"tool-{n}", "{}") for n in range(tool_calls)]
+    bedrock_in += [S2sEvent.content_end("p1", f"c-{n}") for n in range(tool_calls * 4)]
+    downlink = [event for event in events if not isinstance(next(iter(event["event"].values())).get("content"), str)]
+    return bedrock_out, client_in, bedrock_in, tool_results, downlink
+
+
+def previous(bedrock_out, client_in, bedrock_in, tool_results, downlink):
+    for payload in bedrock_out:
+        json.loads(payload.decode("utf-8"))
+    for message in client_in:
+        json.loads(message)
+    for event in bedrock_in:
+        json.dumps(event).encode("utf-8")
+    for result in tool_results:
+        json.dumps(result, default=json_codec.json_default)
+    for event in downlink:
+        json.dumps(event)
+
+
+def codec(bedrock_out, client_in, bedrock_in, tool_results, downlink):
+    for payload in bedrock_out:
+        json_codec.loads(payload)
+    for message in client_in:
+        json_codec.loads(message)
+    for event in bedrock_in:
+        json_codec.dumps_bytes(event)
+    for result in tool_results:
+        json_codec.dumps(result)
+    for event in downlink:
+        json_codec.dumps(event)
+
+
+def timed(func, traffic, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        func(*traffic)
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", help="JSONL file of Bedrock output events")
+    parser.add_argument("--turns", type=int, default=200, help="assistant turns in the synthetic stream")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = load_recording(args.recording) if args.recording else synthetic_stream(args.turns)
+    traffic = session_traffic(events, tool_calls=max(1, args.turns // 4))
+    messages = sum(len(part) for part in traffic)
+    megabytes = (sum(len(p) for p in traffic[0]) + sum(len(m) for m in traffic[1])) / 1e6
+    seconds = stream_seconds(events) or 60
+    print(f"messages={messages} decoded={megabytes:.1f} MB stream={seconds:.0f}s")
+
+    baseline = timed(previous, traffic, args.repeat)
+    print(f"{'json (previous)':<20} {baseline * 1e3:8.1f} ms cpu  {messages / baseline:10.0f} msg/s  "
+          f"{baseline / seconds * 1e3:6.2f} ms per stream-s")
+    for backend in ("stdlib", "orjson"):
+        if json_codec.use_backend(backend) != backend:
+            print(f"{'json_codec ' + backend:<20} not installed")
+            continue
+        elapsed = timed(codec, traffic, args.repeat)
+        print(f"{'json_codec ' + backend:<20} {elapsed * 1e3:8.1f} ms cpu  {messages / elapsed:10.0f} msg/s  "
+              f"{elapsed / seconds * 1e3:6.2f} ms per stream-s  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Caller-thread time spent logging one update_event tool call.
+
+Replays the records an ``update_event`` on a recurring event with editor
+content emits (parsed request, DynamoDB items, Lambda payload/result) through
+the previous setup (``basicConfig`` stdout handler, f-strings) and through
+``logging_config`` (queue handler, ``%s`` arguments, redaction). Output goes to
+a pipe drained by a reader thread, like container stdout.
+
+    python benchmarks/bench_logging.py [--calls 2000]
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import logging_config
+
+logger = logging.getLogger("tools.update_event_tool")
+
+
+def editor_doc(paragraphs):
+    return {
+        "type": "doc",
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": f"Paragraph {n} " + "lorem ipsum " * 40}]}
+            for n in range(paragraphs)
+        ],
+    }
+
+
+def ddb_item(index):
+    return {
+        "userId": {"S": "user-123"},
+        "id": {"S": f"evt-{index}"},
+        "title": {"S": "Weekly planning"},
+        "startDate": {"S": "2026-10-19T15:00:00Z"},
+        "endDate": {"S": "2026-10-19T16:00:00Z"},
+        "description": {"S": "Agenda and notes " * 50},
+        "content": {"S": str(editor_doc(20))},
+        "exceptionDates": {"L": [{"S": f"2026-{month:02d}-01"} for month in range(1, 13)]},
+        "notifications": {"L": [{"M": {"timeBefore": {"N": "10"}, "timeUnit": {"S": "minutes"}}}]},
+    }
+
+
+def tool_call_fstrings(request, item, config, payload, result):
+    logger.info(f"Processing update_event with content: {request}")
+    logger.info(f"Parsed event details for update: {request}")
+    logger.info(f"Fetched recurring event config from DynamoDB: {config}")
+    logger.info(f"Fetched event item from DynamoDB for update: {item}")
+    logger.info(f"Payload for content update Lambda: {payload}")
+    logger.info(f"Lambda result for content update: {result}")
+    logger.info(f"Updated single event occurrence in DynamoDB: {item}")
+    logger.info(f"Created new repeating event config in DynamoDB: {config}")
+
+
+def tool_call_lazy(request, item, config, payload, result):
+    logger.info("Processing update_event with content: %s", request)
+    logger.info("Parsed event details for update: %s", request)
+    logger.info("Fetched recurring event config from DynamoDB: %s", config)
+    logger.info("Fetched event item from DynamoDB for update: %s", item)
+    logger.info("Payload for content update Lambda: %s", payload)
+    logger.info("Lambda result for content update: %s", result)
+    logger.info("Updated single event occurrence in DynamoDB: %s", item)
+    logger.info("Created new repeating event config in DynamoDB: %s", config)
+
+
+def drain(read_fd, written):
+    with os.fdopen(read_fd, "rb", buffering=0) as reader:
+        while chunk := reader.read(65536):
+            written[0] += len(chunk)
+
+
+def run(label, call, calls, configure):
+    read_fd, write_fd = os.pipe()
+    written = [0]
+    reader = threading.Thread(target=drain, args=(read_fd, written), daemon=True)
+    reader.start()
+    stream = os.fdopen(write_fd, "w", buffering=1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    configure(stream)
+
+    request = {"title": "Weekly planning", "start_date": "2026-10-19", "start_time": "15:00", "content": "x" * 200}
+    item = ddb_item(1)
+    config = ddb_item(2)
+    payload = {"userId": "user-123", "prompt": "Add the action items", "content": editor_doc(20)}
+    result = {"statusCode": 200, "body": {"doc": editor_doc(24)}}
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        call(request, item, config, payload, result)
+    elapsed = time.perf_counter() - started
+
+    logging_config.stop_logging()
+    for handler in list(root.handlers):
+        handler.flush()
+        root.removeHandler(handler)
+    stream.close()
+    reader.join()
+    print(f"{label:<40} {elapsed / calls * 1e6:8.1f} us, {written[0] / calls / 1024:6.1f} KiB written per tool call")
+    return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    def sync_handler(stream):
+        logging.basicConfig(level=logging.INFO, format=logging_config.DEFAULT_FORMAT, stream=stream, force=True)
+
+    def async_handler(stream):
+        logging_config.configure_logging(level=logging.INFO, stream=stream, sample_rates={})
+
+    def async_sampled(stream):
+        logging_config.configure_logging(level=logging.INFO, stream=stream, sample_rates={"tools": 10})
+
+    before = run("stdout handler + f-strings (previous)", tool_call_fstrings, args.calls, sync_handler)
+    after = run("queue handler + lazy redacted args", tool_call_lazy, args.calls, async_handler)
+    run("queue handler, tools sampled 1 in 10", tool_call_lazy, args.calls, async_sampled)
+    print(f"event-loop/tool-thread time saved per call: {(before - after) * 1e6:.1f} us ({before / after:.1f}x)")
+
+    # _process_responses logs every Bedrock event at DEBUG; with INFO enabled the
+    # f-string still rendered the (base64 audio) event before being discarded.
+    stream_logger = logging.getLogger("s2s_session_manager")
+    event = {"event": {"audioOutput": {"contentId": "a1", "content": "A" * 10240}}}
+    for label, log in (
+        ("disabled DEBUG, f-string", lambda: stream_logger.debug(f"Received event: {event}")),
+        ("disabled DEBUG, %s argument", lambda: stream_logger.debug("Received event: %s", event)),
+    ):
+        started = time.perf_counter()
+        for _ in range(args.calls * 10):
+            log()
+        print(f"{label:<40} {(time.perf_counter() - started) / (args.calls * 10) * 1e6:8.2f} us per Bedrock event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Per-update cost of the metrics used on the realtime hot paths.
+
+    python benchmarks/bench_metrics.py [--iterations 1000000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metrics import MetricsRegistry
+
+
+def per_call_ns(func, iterations):
+    started = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - started) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_events_total", "Events", ["direction", "event"])
+    child = counter.labels("sent", "audioInput")
+    histogram = registry.histogram("bench_latency_seconds", "Latency", ["pooled"]).labels("true")
+
+    baseline = per_call_ns(lambda: None, args.iterations)
+    cases = (
+        ("counter child inc()", child.inc),
+        ("counter labels(...).inc()", lambda: counter.labels("sent", "audioInput").inc()),
+        ("histogram child observe()", lambda: histogram.observe(0.123)),
+    )
+    for name, func in cases:
+        print(f"{name:<28} {per_call_ns(func, args.iterations) - baseline:6.0f} ns/update")
+    started = time.process_time()
+    registry.render()
+    print(f"{'render()':<28} {(time.process_time() - started) * 1e6:6.0f} us")
+
+
+if __name__ == "__main__":
+    main()
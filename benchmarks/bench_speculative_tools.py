@@ -0,0 +1,145 @@
+"""Tool-turn latency with lookups started at ``toolUse`` vs at the TOOL ``contentEnd``.
+
+Runs ``update_event``, ``delete_event`` and ``open_event`` through a real
+``S2sSessionManager`` and tool executor against the in-memory AWS stand-ins from
+``tests/in_memory_services.py``, with each call slowed to a typical in-region
+latency (``--embed-ms`` Titan embedding, ``--search-ms`` OpenSearch kNN query,
+``--ddb-ms`` DynamoDB request). For each ``--gap-ms`` between the ``toolUse`` and
+its ``contentEnd`` it reports the median time from ``contentEnd`` to the tool
+result, which is what the user waits on before the model can answer.
+
+    python benchmarks/bench_speculative_tools.py [--gap-ms 0,25,100] [--turns 15]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+
+import s2s_session_manager
+from in_memory_services import InMemoryBedrock, InMemoryDynamoDB, InMemoryOpenSearch, text_embedding
+from s2s_session_manager import SPECULATIVE_TOOLS, PendingTool, S2sSessionManager
+from tool_executor import ToolExecutor
+
+EVENT = {
+    "eventId": "evt-42",
+    "userId": "bench-user",
+    "title": "Dentist",
+    "startDate": "2026-03-02T15:00:00.000Z",
+    "endDate": "2026-03-02T16:00:00.000Z",
+}
+PAYLOADS = {
+    "update_event": {
+        "current_title": "dentist", "current_start_date": "2026-03-02", "current_start_time": "15:00",
+        "new_title": "Dentist checkup",
+    },
+    "delete_event": {"title": "dentist", "start_date": "2026-03-02", "start_time": "15:00"},
+    "open_event": {"current_title": "dentist", "current_start_date": "2026-03-02", "current_start_time": "15:00"},
+}
+
+
+class SlowBedrock(InMemoryBedrock):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def invoke_model(self, **kwargs):
+        time.sleep(self.latency)
+        return super().invoke_model(**kwargs)
+
+
+class SlowOpenSearch(InMemoryOpenSearch):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def search(self, **kwargs):
+        time.sleep(self.latency)
+        return super().search(**kwargs)
+
+
+class SlowDynamoDB(InMemoryDynamoDB):
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def get_item(self, **kwargs):
+        time.sleep(self.latency)
+        return super().get_item(**kwargs)
+
+    def put_item(self, **kwargs):
+        time.sleep(self.latency)
+        return super().put_item(**kwargs)
+
+    def delete_item(self, **kwargs):
+        time.sleep(self.latency)
+        return super().delete_item(**kwargs)
+
+
+def reset_event(ddb):
+    item = {"userId": {"S": EVENT["userId"]}, "id": {"S": EVENT["eventId"]}}
+    item.update({key: {"S": EVENT[key]} for key in ("startDate", "endDate")})
+    item["description"] = {"S": EVENT["title"]}
+    InMemoryDynamoDB.put_item(ddb, TableName="Events", Item=item)
+
+
+async def tool_turn(s, ddb, tool_name, gap, n):
+    reset_event(ddb)
+    pending = PendingTool(
+        {"toolUseId": f"{tool_name}-{n}", "toolName": tool_name, "content": json.dumps(PAYLOADS[tool_name])}
+    )
+    s._start_speculation(pending)  # no-op when speculation is off
+    await asyncio.sleep(gap)
+    started = time.perf_counter()
+    result = await s.processToolUse(tool_name, pending.tool_use_content)
+    elapsed = time.perf_counter() - started
+    assert "event" in result["result"].lower(), result
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--gap-ms", default="0,25,100", help="toolUse -> contentEnd gaps to try")
+    parser.add_argument("--turns", type=int, default=15)
+    parser.add_argument("--embed-ms", type=float, default=80)
+    parser.add_argument("--search-ms", type=float, default=40)
+    parser.add_argument("--ddb-ms", type=float, default=8)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    ddb = SlowDynamoDB(args.ddb_ms / 1000)
+    opensearch = SlowOpenSearch(args.search_ms / 1000)
+    opensearch.index("calendar-events", "doc-1", {**EVENT, "title_vector": text_embedding(EVENT["title"])})
+    s2s_session_manager.ddb_client = ddb
+    s2s_session_manager.bedrock_client = SlowBedrock(args.embed_ms / 1000)
+    s2s_session_manager.opensearch_client = opensearch
+    executor = ToolExecutor(max_workers=8, max_per_user=8)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id=EVENT["userId"], timezone="UTC", tool_executor=executor)
+
+    print(f"embed {args.embed_ms:.0f} ms, search {args.search_ms:.0f} ms, dynamodb {args.ddb_ms:.0f} ms; "
+          f"median contentEnd -> result over {args.turns} turns")
+    for gap_ms in (float(gap) for gap in args.gap_ms.split(",")):
+        for tool_name in PAYLOADS:
+            medians = {}
+            for mode, tools in (("at contentEnd", frozenset()), ("at toolUse", SPECULATIVE_TOOLS)):
+                s.speculative_tools = tools
+                samples = [await tool_turn(s, ddb, tool_name, gap_ms / 1000, n) for n in range(args.turns)]
+                medians[mode] = statistics.median(samples)
+            before, after = medians["at contentEnd"], medians["at toolUse"]
+            print(f"gap {gap_ms:5.0f} ms  {tool_name:<13} {before * 1000:7.1f} ms -> {after * 1000:7.1f} ms  "
+                  f"(-{(before - after) * 1000:5.1f} ms, {(1 - after / before) * 100:4.0f}%)")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Time-to-first-audio for sessions on a fresh vs a pre-warmed Bedrock stream.
+
+Bedrock is simulated: opening a bidirectional stream costs ``--handshake-ms``
+and the model answers with its first audioOutput ``--model-ms`` after the
+stream starts reading. Each session measures from ``initialize_stream`` to the
+first audioOutput event, exactly as ``S2sSessionManager`` reports it in
+production (``time_to_first_audio``).
+
+    python benchmarks/bench_stream_pool.py [--sessions 20] [--handshake-ms 250] [--model-ms 300]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import statistics
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+os.environ.pop("BEDROCK_AGENTCORE_MEMORY_ID", None)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bedrock_stream_pool import BedrockStreamPool
+from s2s_session_manager import S2sSessionManager
+
+AUDIO = json.dumps(
+    {"event": {"audioOutput": {"contentId": "a1", "content": base64.b64encode(bytes(4800)).decode()}}}
+).encode()
+
+
+class SimulatedStream:
+    def __init__(self, model_ms):
+        self.model_ms = model_ms
+        self.input_stream = SimpleNamespace(close=self._close)
+        self._sent = False
+
+    async def _close(self):
+        pass
+
+    async def await_output(self):
+        return None, self
+
+    async def receive(self):
+        if self._sent:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.model_ms / 1000)
+        self._sent = True
+        return SimpleNamespace(value=SimpleNamespace(bytes_=AUDIO))
+
+
+class SimulatedClient:
+    def __init__(self, handshake_ms, model_ms):
+        self.handshake_ms = handshake_ms
+        self.model_ms = model_ms
+
+    async def invoke_model_with_bidirectional_stream(self, _input):
+        await asyncio.sleep(self.handshake_ms / 1000)
+        return SimulatedStream(self.model_ms)
+
+
+async def run_session(pool, client):
+    s = S2sSessionManager(region="us-east-1", model_id="nova", user_id="bench", timezone="UTC", stream_pool=pool)
+    s.bedrock_client = client
+    await s.initialize_stream()
+    while s.time_to_first_audio is None:
+        await asyncio.sleep(0.001)
+    ttfa = s.time_to_first_audio
+    await s.close()
+    return ttfa
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=250)
+    parser.add_argument("--model-ms", type=float, default=300)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    client = SimulatedClient(args.handshake_ms, args.model_ms)
+
+    async def opener(region, model_id):
+        return client, await client.invoke_model_with_bidirectional_stream(None)
+
+    fresh = [await run_session(None, client) for _ in range(args.sessions)]
+
+    pool = BedrockStreamPool(size=2, idle_ttl=60, opener=opener)
+    pool.warm("us-east-1", "nova")
+    pooled = []
+    for _ in range(args.sessions):
+        await asyncio.sleep(args.handshake_ms / 1000 * 1.5)  # sessions arrive slower than the pool refills
+        pooled.append(await run_session(pool, client))
+    stats = pool.stats()
+    await pool.stop()
+
+    for name, samples in (("fresh", fresh), ("pooled", pooled)):
+        print(f"{name:<7} median {statistics.median(samples) * 1000:6.0f} ms  "
+              f"max {max(samples) * 1000:6.0f} ms  ({len(samples)} sessions)")
+    print(f"pool hits={stats['hits']} misses={stats['misses']} opened={stats['opened']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+import logging
+import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from tool_executor import tool_executor as default_tool_executor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Voice sessions (active or parked for resumption) one process will host.
+DEFAULT_MAX_SESSIONS = int(os.getenv("CLARITY_MAX_SESSIONS", "50"))
+# New sessions are refused while this many tool calls are already waiting for a thread.
+DEFAULT_MAX_TOOL_BACKLOG = int(os.getenv("CLARITY_MAX_TOOL_BACKLOG", "32"))
+# Hint sent to rejected clients.
+RETRY_AFTER_MS = int(os.getenv("CLARITY_ADMISSION_RETRY_AFTER_MS", "2000"))
+
+SERVER_AT_CAPACITY = "SERVER_AT_CAPACITY"
+TOOLS_SATURATED = "TOOLS_SATURATED"
+SERVER_DRAINING = "SERVER_DRAINING"
+
+# Client-facing message and WebSocket close reason (at most 123 bytes) per refusal.
+REJECTION_MESSAGES = {
+    SERVER_AT_CAPACITY: ("Server is at capacity, please retry shortly", "Server at capacity"),
+    TOOLS_SATURATED: ("Server is busy with other requests, please retry shortly", "Server busy"),
+    SERVER_DRAINING: ("Server is restarting, please reconnect", "Server restarting"),
+}
+
+
+class SessionPermit:
+    """One admitted session's slot; ``release`` is idempotent."""
+
+    __slots__ = ("_controller", "_released")
+
+    def __init__(self, controller):
+        self._controller = controller
+        self._released = False
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self._controller._release()
+
+
+class AdmissionController:
+    """
+    Per-process admission control for voice sessions.
+
+    Every ``sessionStart`` asks for a ``SessionPermit``. A permit is refused when
+    ``max_sessions`` sessions already hold one, or when the shared tool executor
+    has more than ``max_tool_backlog`` calls queued, since a new session would
+    only add to a backlog every existing session is already waiting on. While
+    ``draining`` (see ``drain.DrainController``) every request is refused. A
+    refusal is cheap (no Bedrock stream is opened), so the client can retry
+    another instance straight away.
+
+    ``capacity()`` backs ``/health`` so the load balancer can route around a
+    saturated process.
+    """
+
+    def __init__(
+        self,
+        max_sessions=DEFAULT_MAX_SESSIONS,
+        max_tool_backlog=DEFAULT_MAX_TOOL_BACKLOG,
+        tool_executor=None,
+    ):
+        self.max_sessions = max_sessions
+        self.max_tool_backlog = max_tool_backlog
+        self.tool_executor = tool_executor or default_tool_executor
+        self.draining = False
+        self.active = 0
+        self.admitted = 0
+        self.rejected = {SERVER_AT_CAPACITY: 0, TOOLS_SATURATED: 0, SERVER_DRAINING: 0}
+
+    def _rejection_reason(self):
+        if self.draining:
+            return SERVER_DRAINING
+        if self.active >= self.max_sessions:
+            return SERVER_AT_CAPACITY
+        if self.tool_executor.queue_depth >= self.max_tool_backlog:
+            return TOOLS_SATURATED
+        return None
+
+    def try_admit(self):
+        """Return ``(permit, None)`` or ``(None, reason)``."""
+        reason = self._rejection_reason()
+        if reason is not None:
+            self.rejected[reason] += 1
+            logger.warning(
+                f"Rejecting session: {reason} (active={self.active}/{self.max_sessions}, "
+                f"tool backlog={self.tool_executor.queue_depth}/{self.max_tool_backlog})"
+            )
+            return None, reason
+        self.active += 1
+        self.admitted += 1
+        return SessionPermit(self), None
+
+    def _release(self):
+        self.active = max(0, self.active - 1)
+
+    @staticmethod
+    def rejection_event(reason):
+        """Client-facing error event for a refused ``sessionStart``."""
+        return {
+            "type": "error",
+            "code": reason,
+            "message": REJECTION_MESSAGES[reason][0],
+            "retryAfterMs": RETRY_AFTER_MS,
+        }
+
+    @staticmethod
+    def close_reason(reason):
+        """WebSocket close reason for a refused ``sessionStart``."""
+        return REJECTION_MESSAGES[reason][1]
+
+    def capacity(self):
+        return {
+            "accepting": self._rejection_reason() is None,
+            "draining": self.draining,
+            "active_sessions": self.active,
+            "max_sessions": self.max_sessions,
+            "remaining_sessions": max(0, self.max_sessions - self.active),
+            "tool_backlog": self.tool_executor.queue_depth,
+            "max_tool_backlog": self.max_tool_backlog,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+        }
+
+
+admission_controller = AdmissionController()
@@ -1,13 +1,11 @@
 import os
 import asyncio
+import base64
 import logging
-import json
 import uvicorn
-import requests
-from requests.exceptions import RequestException
 from datetime import datetime
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.websockets import WebSocketState
 import sys
@@ -15,13 +13,47 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from s2s_session_manager import S2sSessionManager
-from s2s_events import S2sEvent
-
-# configure logging for stdout
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from s2s_events import S2sEvent, parse_audio_input_message
+from event_serializer import EventSerializer
+from output_buffer import OutputBufferClosed
+from audio_frames import (
+    AUDIO_FORMATS,
+    AUDIO_INPUT,
+    AUDIO_OUTPUT,
+    FORMAT_BINARY,
+    FORMAT_JSON,
+    AudioFrameError,
+    decode_audio_frame,
+    split_audio_frames,
+)
+from tool_executor import tool_executor
+from credentials_provider import credential_provider
+from bedrock_stream_pool import bedrock_stream_pool
+from session_registry import ParkedSession, session_registry
+from admission import admission_controller
+from drain import SERVER_DRAINING_EVENT_TYPE, drain_controller
+from bedrock_client_registry import bedrock_client_registry
+from embedding_cache import embedding_cache
+from metrics import CLIENT_MESSAGES, registry as metrics_registry
+from tracing import configure_local_tracing
+import json_codec
+import logging_config
+
+# configure logging for stdout (written by a background thread, see logging_config)
+logging_config.configure_logging()
 logger = logging.getLogger(__name__)
 
 
+NOVA_SONIC_MODEL_ID = "amazon.nova-2-sonic-v1:0"
+# Shared secret for /admin endpoints; they are disabled when unset.
+ADMIN_TOKEN = os.getenv("CLARITY_ADMIN_TOKEN")
+
+# Per-message counters resolved once; they are bumped for every frame.
+_CLIENT_TEXT_RECEIVED = CLIENT_MESSAGES.labels("received", "text")
+_CLIENT_BINARY_RECEIVED = CLIENT_MESSAGES.labels("received", "binary")
+_CLIENT_TEXT_SENT = CLIENT_MESSAGES.labels("sent", "text")
+_CLIENT_BINARY_SENT = CLIENT_MESSAGES.labels("sent", "binary")
+
 # Audio configuration
 INPUT_SAMPLE_RATE = 16000
 OUTPUT_SAMPLE_RATE = 24000
@@ -29,9 +61,6 @@ CHANNELS = 1
 FORMAT = 8
 CHUNK_SIZE = 1024
 
-# Global variable to track credential refresh task
-credential_refresh_task = None
-
 
 async def send_open_event_context(stream_manager, event_id, before_convo=False, source=None):
     """Send hidden context to Nova Sonic about the currently opened event."""
@@ -93,163 +122,52 @@ async def send_closed_event_context(stream_manager, previously_open_event_id, so
     return True
 
 
-def get_imdsv2_token():
-    """
-    Get IMDSv2 token for secure metadata access.
-
-    Returns:
-        str: The IMDSv2 token, or None if IMDSv2 is not available
-    """
-    try:
-        response = requests.put(
-            "http://169.254.169.254/latest/api/token",
-            headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
-            timeout=2,
-        )
-        if response.status_code == 200:
-            return response.text
-    except Exception:
-        pass
-    return None
-
-def get_credentials_from_imds():
-    """
-    Manually retrieve IAM role credentials from envrionment Metadata Service.
-
-    This utility method fetches credentials directly from IMDS without using boto3.
-    It tries both IMDSv1 and IMDSv2 methods.
-
-    Returns:
-        dict: A dictionary containing the credentials or error information
-    """
-    result = {
-        "success": False,
-        "credentials": None,
-        "role_name": None,
-        "method_used": None,
-        "error": None,
-    }
-
-    try:
-        # Try IMDSv2 first
-        token = get_imdsv2_token()
-        headers = {}
-
-        if token:
-            headers["X-aws-ec2-metadata-token"] = token
-            result["method_used"] = "IMDSv2"
-        else:
-            result["method_used"] = "IMDSv1"
-
-        # Get the IAM role name
-        role_response = requests.get(
-            "http://169.254.169.254/latest/meta-data/iam/security-credentials/",
-            headers=headers,
-            timeout=2,
-        )
-
-        if role_response.status_code != 200:
-            result["error"] = (
-                f"Failed to retrieve IAM role name: HTTP {role_response.status_code}"
-            )
-            return result
-
-        role_name = role_response.text.strip()
-        result["role_name"] = role_name
-
-        # Get the credentials for the role
-        creds_response = requests.get(
-            f"http://169.254.169.254/latest/meta-data/iam/security-credentials/{role_name}",
-            headers=headers,
-            timeout=2,
-        )
-
-        if creds_response.status_code != 200:
-            result["error"] = (
-                f"Failed to retrieve credentials for role {role_name}: HTTP {creds_response.status_code}"
-            )
-            return result
-
-        # Parse the credentials
-        credentials = creds_response.json()
-
-        result["success"] = True
-        result["credentials"] = {
-            "AccessKeyId": credentials.get("AccessKeyId"),
-            "SecretAccessKey": credentials.get("SecretAccessKey"),
-            "Token": credentials.get("Token"),
-            "Expiration": credentials.get("Expiration"),
-            "Code": credentials.get("Code"),
-            "Type": credentials.get("Type"),
-            "LastUpdated": credentials.get("LastUpdated"),
-        }
-
-    except RequestException as e:
-        result["error"] = f"Request exception: {str(e)}"
-    except Exception as e:
-        result["error"] = f"Unexpected error: {str(e)}"
-
-    return result
-
-
-async def refresh_credentials_from_imds():
-    """
-    Background task to periodically refresh credentials from IMDS and update environment variables.
-    This ensures the EnvironmentCredentialsResolver always has fresh credentials.
-    """
-    logger.info("Starting credential refresh background task")
-
-    while True:
-        try:
-            # Fetch credentials from IMDS
-            imds_result = get_credentials_from_imds()
+def collect_runtime_metrics():
+    """Scrape-time gauges read from the components that already keep these numbers."""
+    sessions = drain_controller.live_sessions()
+    capacity = admission_controller.capacity()
+    executor = tool_executor.stats()
+    pool = bedrock_stream_pool.stats()
+    clients = bedrock_client_registry.stats()
+    log_stats = logging_config.stats()
+    embeddings = embedding_cache.stats()
+    output_depth = {}
+    buffered_audio_ms = 0.0
+    for session in sessions:
+        for cls, queued in session.output_queue.queued_by_class().items():
+            output_depth[(cls,)] = output_depth.get((cls,), 0) + queued
+        buffered_audio_ms += session.output_queue.buffered_audio_ms
+    return [
+        ("clarity_active_sessions", "Sessions holding an admission permit (live and parked)", (),
+         {(): capacity["active_sessions"]}),
+        ("clarity_live_sessions", "Sessions attached to a WebSocket", (), {(): len(sessions)}),
+        ("clarity_parked_sessions", "Sessions parked for resumption", (), {(): len(session_registry)}),
+        ("clarity_audio_input_queue_depth", "Client audio chunks waiting to be sent to Bedrock", (),
+         {(): sum(session.audio_input_queue.qsize() for session in sessions)}),
+        ("clarity_output_queue_depth", "Outbound events waiting for clients, by class", ("class",), output_depth),
+        ("clarity_output_buffered_audio_seconds", "Outbound audio waiting for clients, in playback seconds", (),
+         {(): buffered_audio_ms / 1000}),
+        ("clarity_tool_queue_depth", "Tool calls waiting for an executor thread", (), {(): executor["queue_depth"]}),
+        ("clarity_tool_running", "Tool calls running on the executor", (), {(): executor["running"]}),
+        ("clarity_stream_pool_ready", "Pre-opened Bedrock streams ready, by model", ("model",),
+         {(model,): ready for model, ready in pool["ready"].items()}),
+        ("clarity_bedrock_connections", "Open HTTP connections held by shared Bedrock clients", (),
+         {(): clients["open_connections"]}),
+        ("clarity_credentials_version", "Credential rotations seen by the shared provider", (),
+         {(): credential_provider.version}),
+        ("clarity_log_queue_depth", "Log records waiting for the writer thread", (), {(): log_stats["queued"]}),
+        ("clarity_log_records_discarded", "Log records not written, by reason", ("reason",),
+         {("queue_full",): log_stats["dropped"], ("sampled",): log_stats["sampled_out"]}),
+        ("clarity_embedding_cache_vectors", "Title embeddings held in the process-wide cache", (),
+         {(): embeddings["vectors"]}),
+        ("clarity_embedding_cache_hit_ratio", "Share of title embedding lookups served without a Bedrock call", (),
+         {(): embeddings["hit_rate"]}),
+    ]
+
+
+metrics_registry.register_collector(collect_runtime_metrics)
 
-            if imds_result["success"]:
-                creds = imds_result["credentials"]
 
-                # Update environment variables
-                os.environ["AWS_ACCESS_KEY_ID"] = creds["AccessKeyId"]
-                os.environ["AWS_SECRET_ACCESS_KEY"] = creds["SecretAccessKey"]
-                os.environ["AWS_SESSION_TOKEN"] = creds["Token"]
-
-                logger.info("✅ Credentials refreshed from IMD.")
-
-                # Parse expiration time and calculate refresh interval
-                # Refresh 5 minutes before expiration
-                try:
-                    expiration = datetime.fromisoformat(
-                        creds["Expiration"].replace("Z", "+00:00")
-                    )
-                    now = datetime.now(expiration.tzinfo)
-                    time_until_expiration = (expiration - now).total_seconds()
-
-                    # Refresh 5 minutes (300 seconds) before expiration, or in 1 hour if expiration is far away
-                    refresh_interval = min(max(time_until_expiration - 300, 60), 3600)
-                    logger.info(f"   Next refresh in {refresh_interval:.0f} seconds")
-                except Exception as e:
-                    logger.warning(
-                        f"Could not parse expiration time, using default 1 hour refresh: {e}"
-                    )
-                    refresh_interval = 3600
-
-                # Wait until next refresh
-                await asyncio.sleep(refresh_interval)
-            else:
-                logger.error(
-                    f"Failed to refresh credentials from IMDS: {imds_result['error']}"
-                )
-                # Retry in 5 minutes on failure
-                await asyncio.sleep(300)
-
-        except asyncio.CancelledError:
-            logger.info("Credential refresh task cancelled")
-            break
-        except Exception as e:
-            logger.error(f"Error in credential refresh task: {e}", exc_info=True)
-            # Retry in 5 minutes on error
-            await asyncio.sleep(300)
-            
-            
 # Create FastAPI app
 app = FastAPI(title="Nova Sonic S2S WebSocket Server")
 
@@ -265,71 +183,81 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup_event():
-    global credential_refresh_task
-
     logger.info("🚀 Application starting up...")
-    logger.info(f"📍 AWS Region: {os.getenv('AWS_DEFAULT_REGION', 'us-east-1')}")
+    logger.info("📍 AWS Region: %s", os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
     for route in app.routes:
         path = getattr(route, "path", None)
         methods = getattr(route, "methods", None)
-        logger.info(f"Route loaded: path={path}, methods={methods}, type={type(route).__name__}")
+        logger.info("Route loaded: path=%s, methods=%s, type=%s", path, methods, type(route).__name__)
 
-    # Check if credentials are already in environment (local mode)
-    if os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY"):
-        logger.info("✅ Using credentials from environment variables (local mode)")
-        logger.info("   Credential refresh task will not be started")
-    else:
-        # Try to fetch credentials from IMDS and start refresh task
-        logger.info("🔄 Attempting to fetch credentials from ENV IMDS...")
+    # Loads environment credentials (local mode) or fetches from IMDS and keeps
+    # refreshing them in the background without blocking the event loop.
+    await credential_provider.start()
 
-        imds_result = get_credentials_from_imds()
+    # Local runs only; in the container opentelemetry-instrument owns the tracer provider.
+    configure_local_tracing()
 
-        if imds_result["success"]:
-            creds = imds_result["credentials"]
+    # Keep a few Bedrock streams open so sessionStart skips the handshake.
+    if bedrock_stream_pool.enabled:
+        await bedrock_stream_pool.start()
+        bedrock_stream_pool.warm(os.getenv("AWS_DEFAULT_REGION", "us-east-1"), NOVA_SONIC_MODEL_ID)
+        logger.info("Bedrock stream pool warming %s streams", bedrock_stream_pool.size)
 
-            # Set initial credentials in environment
-            os.environ["AWS_ACCESS_KEY_ID"] = creds["AccessKeyId"]
-            os.environ["AWS_SECRET_ACCESS_KEY"] = creds["SecretAccessKey"]
-            os.environ["AWS_SESSION_TOKEN"] = creds["Token"]
 
-            logger.info("✅ Initial credentials loaded from IMDS.")
+@app.on_event("shutdown")
+async def shutdown_event():
+    logger.info("🛑 Application shutting down...")
 
-            # Start background task to refresh credentials
-            credential_refresh_task = asyncio.create_task(
-                refresh_credentials_from_imds()
-            )
-            logger.info("🔄 Credential refresh background task started")
-        else:
-            logger.error(
-                f"❌ Failed to fetch credentials from IMDS: {imds_result['error']}"
-            )
-            logger.error(
-                "   Application may not function correctly without credentials"
-            )
+    await session_registry.close_all()
+    await bedrock_stream_pool.stop()
 
+    await credential_provider.stop()
+    logger.info("Credential refresh task stopped")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    global credential_refresh_task
+    tool_executor.shutdown()
 
-    logger.info("🛑 Application shutting down...")
 
-    # Cancel credential refresh task if running
-    if credential_refresh_task and not credential_refresh_task.done():
-        logger.info("Stopping credential refresh task...")
-        credential_refresh_task.cancel()
-        try:
-            await credential_refresh_task
-        except asyncio.CancelledError:
-            pass
-        logger.info("Credential refresh task stopped")
+def _capacity_status(capacity):
+    if capacity["accepting"]:
+        return "healthy"
+    return "draining" if capacity["draining"] else "saturated"
 
 
 @app.get("/health")
-@app.get("/")
 async def health_check():
     logger.info("Health check request received")
-    return JSONResponse({"status": "healthy"})
+    # Saturated instances report 503 so the load balancer routes new sessions elsewhere.
+    capacity = admission_controller.capacity()
+    status_code = 200 if capacity["accepting"] else 503
+    return JSONResponse({"status": _capacity_status(capacity), "capacity": capacity}, status_code=status_code)
+
+
+@app.get("/")
+async def root():
+    # Liveness only: a saturated or draining instance is still up, so this stays 200.
+    capacity = admission_controller.capacity()
+    return JSONResponse({"status": _capacity_status(capacity), "capacity": capacity})
+
+
+@app.post("/admin/drain")
+async def start_drain(timeout: float | None = None, x_admin_token: str | None = Header(default=None)):
+    """Stop taking sessions and retire live ones at their next turn boundary."""
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        return JSONResponse({"status": "forbidden"}, status_code=403)
+    drain_controller.start(timeout)
+    return JSONResponse(drain_controller.status(), status_code=202)
+
+
+@app.get("/admin/drain")
+async def drain_status(x_admin_token: str | None = Header(default=None)):
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        return JSONResponse({"status": "forbidden"}, status_code=403)
+    return JSONResponse(drain_controller.status())
+
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/ping")
@@ -340,33 +268,34 @@ async def ping():
 @app.get("/credentials/info")
 async def credential_info():
     """Get information about credential configuration (for debugging)"""
-    # Determine credential source
-    if os.getenv("AWS_ACCESS_KEY_ID") and os.getenv("AWS_SECRET_ACCESS_KEY"):
+    status = credential_provider.status()
+    if status["mode"] == "local":
         credential_source = "Environment Variables (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_SESSION_TOKEN)"
-        mode = "local"
         note = "Using static credentials from environment variables"
     else:
         credential_source = "ENV IMDS (IMDSv2 preferred, falls back to IMDSv1)"
-        mode = "ec2"
-        note = "Credentials are automatically refreshed from IMDS by background task"
+        note = "Credentials are refreshed from IMDS ahead of expiry by the shared credential provider"
 
     return JSONResponse(
         {
             "status": "ok",
-            "mode": mode,
+            "mode": "local" if status["mode"] == "local" else "ec2",
             "credential_source": credential_source,
             "region": os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
             "note": note,
+            "expiration": status["expiration"],
+            "refresh_count": status["refresh_count"],
+            "last_error": status["last_error"],
         }
     )
 
 @app.websocket("/ws")
 async def websocket_handler(websocket: WebSocket):
-    logger.info(f"WebSocket connection attempted from {websocket.client}")
+    logger.info("WebSocket connection attempted from %s", websocket.client)
     
     # Accept the WebSocket connection
     await websocket.accept()
-    logger.info(f"WebSocket connection accepted")
+    logger.info("WebSocket connection accepted")
     
     aws_region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
     stream_manager = None
@@ -375,23 +304,72 @@ async def websocket_handler(websocket: WebSocket):
     user_id = None
     timezone = None
     init_received = False
+    audio_input_format = FORMAT_JSON
+    audio_output_format = FORMAT_JSON
     pending_open_event_context = None
+    resume_token = None
+    disconnect_code = None
+    admission_permit = None
     
     try:
         # Main message processing loop
         while True:
             try:
-                message = await websocket.receive_text()
+                ws_message = await websocket.receive()
+                if ws_message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(
+                        ws_message.get("code", 1000), ws_message.get("reason")
+                    )
+
+                binary_frame = ws_message.get("bytes")
+                if binary_frame is not None:
+                    _CLIENT_BINARY_RECEIVED.inc()
+                    if audio_input_format != FORMAT_BINARY:
+                        logger.warning("Received binary frame but binary audio input was not negotiated")
+                        await websocket.send_json(
+                            {
+                                "type": "error",
+                                "message": "Binary audio frames require audioInputFormat 'binary' in the init payload",
+                            }
+                        )
+                        continue
+                    if not (stream_manager and stream_manager.is_active):
+                        logger.debug("Dropping binary audio frame without an active stream")
+                        continue
+                    try:
+                        frame_type, prompt_name, content_name, pcm = decode_audio_frame(binary_frame)
+                    except AudioFrameError as e:
+                        logger.warning("Invalid binary audio frame: %s", e)
+                        continue
+                    if frame_type != AUDIO_INPUT:
+                        logger.warning("Unexpected binary frame type from client: %s", frame_type)
+                        continue
+                    stream_manager.add_audio_chunk(prompt_name, content_name, pcm)
+                    continue
+
+                message = ws_message.get("text")
+                if message is None:
+                    continue
+                _CLIENT_TEXT_RECEIVED.inc()
+
+                # Fast path: audioInput is the bulk of inbound traffic, so hand it
+                # straight to the audio queue without the general event routing.
+                if stream_manager and stream_manager.is_active:
+                    audio_frame = parse_audio_input_message(message)
+                    if audio_frame is not None:
+                        stream_manager.add_audio_chunk(*audio_frame)
+                        continue
+
                 logger.debug("Received message from client")
                 
                 try:
-                    data = json.loads(message)
+                    data = json_codec.loads(message)
 
                     # Handle wrapped body format
                     if "body" in data:
                         body = data["body"]
                         if isinstance(body, str):
-                            data = json.loads(body)
+                            data = json_codec.loads(body)
                         else:
                             data = body
 
@@ -427,7 +405,7 @@ async def websocket_handler(websocket: WebSocket):
                             ZoneInfo(init_timezone)
                         except Exception:
                             logger.warning(
-                                f"Invalid timezone in init payload: {init_timezone}"
+                                "Invalid timezone in init payload: %s", init_timezone
                             )
                             await websocket.send_json(
                                 {
@@ -438,12 +416,82 @@ async def websocket_handler(websocket: WebSocket):
                             await websocket.close(code=1008)
                             break
 
+                        init_audio_input_format = data.get("audioInputFormat", FORMAT_JSON)
+                        if init_audio_input_format not in AUDIO_FORMATS:
+                            logger.warning(
+                                "Invalid audioInputFormat in init payload: %s", init_audio_input_format
+                            )
+                            await websocket.send_json(
+                                {
+                                    "type": "error",
+                                    "message": "audioInputFormat must be one of: " + ", ".join(AUDIO_FORMATS),
+                                }
+                            )
+                            await websocket.close(code=1008)
+                            break
+
+                        init_audio_output_format = data.get("audioOutputFormat", FORMAT_JSON)
+                        if init_audio_output_format not in AUDIO_FORMATS:
+                            logger.warning(
+                                "Invalid audioOutputFormat in init payload: %s", init_audio_output_format
+                            )
+                            await websocket.send_json(
+                                {
+                                    "type": "error",
+                                    "message": "audioOutputFormat must be one of: " + ", ".join(AUDIO_FORMATS),
+                                }
+                            )
+                            await websocket.close(code=1008)
+                            break
+
                         user_id = init_user_id
                         timezone = init_timezone
+                        audio_input_format = init_audio_input_format
+                        audio_output_format = init_audio_output_format
                         init_received = True
                         logger.info(
-                            f"Init payload accepted for userId={user_id}, timezone={timezone}"
+                            "Init payload accepted for userId=%s, timezone=%s, audioInputFormat=%s, audioOutputFormat=%s",
+                            user_id, timezone, audio_input_format, audio_output_format
                         )
+
+                        # Reattach to a session parked when this client's previous socket dropped.
+                        requested_resume_token = data.get("resumeToken")
+                        resumed = None
+                        if requested_resume_token:
+                            resumed = session_registry.resume(requested_resume_token, user_id)
+                        if resumed is not None:
+                            stream_manager = resumed.session
+                            pending_open_event_context = resumed.pending_open_event_context
+                            admission_permit = resumed.permit
+                            drain_controller.track(stream_manager)
+                        if (data.get("resumable") is True or requested_resume_token) and session_registry.enabled:
+                            resume_token = session_registry.issue_token()
+
+                        # Only clients that negotiate protocol options expect an ack.
+                        if (
+                            "audioInputFormat" in data
+                            or "audioOutputFormat" in data
+                            or "resumable" in data
+                            or requested_resume_token
+                        ):
+                            init_ack = {
+                                "type": "init_ack",
+                                "audioInputFormat": audio_input_format,
+                                "audioOutputFormat": audio_output_format,
+                            }
+                            if resume_token:
+                                init_ack["resumeToken"] = resume_token
+                            if requested_resume_token:
+                                init_ack["resumed"] = resumed is not None
+                            await websocket.send_json(init_ack)
+
+                        if resumed is not None:
+                            # Events produced while detached are still queued; deliver them now.
+                            forward_task = asyncio.create_task(
+                                forward_responses(
+                                    websocket, stream_manager, audio_output_format=audio_output_format
+                                )
+                            )
                         continue
 
                     if "event" not in data:
@@ -472,6 +520,7 @@ async def websocket_handler(websocket: WebSocket):
                         # Clean up existing session if any
                         if stream_manager:
                             logger.info("Cleaning up existing session")
+                            drain_controller.untrack(stream_manager)
                             await stream_manager.close()
                         if forward_task and not forward_task.done():
                             forward_task.cancel()
@@ -479,11 +528,26 @@ async def websocket_handler(websocket: WebSocket):
                                 await forward_task
                             except asyncio.CancelledError:
                                 pass
+                        if admission_permit:
+                            admission_permit.release()
+
+                        # Refuse before opening anything upstream when the process is saturated
+                        admission_permit, rejection = admission_controller.try_admit()
+                        if admission_permit is None:
+                            stream_manager = None
+                            await websocket.send_json(admission_controller.rejection_event(rejection))
+                            await websocket.close(code=1013, reason=admission_controller.close_reason(rejection))
+                            break
 
                         # Create a new stream manager for this connection
                         stream_manager = S2sSessionManager(
-                            model_id="amazon.nova-2-sonic-v1:0", region=aws_region, user_id=user_id, timezone=timezone
+                            model_id=NOVA_SONIC_MODEL_ID,
+                            region=aws_region,
+                            user_id=user_id,
+                            timezone=timezone,
+                            stream_pool=bedrock_stream_pool,
                         )
+                        drain_controller.track(stream_manager)
                         pending_open_event_context = None
 
                         # Initialize the Bedrock stream
@@ -491,14 +555,14 @@ async def websocket_handler(websocket: WebSocket):
 
                         # Start a task to forward responses from Bedrock to the WebSocket
                         forward_task = asyncio.create_task(
-                            forward_responses(websocket, stream_manager)
+                            forward_responses(
+                                websocket, stream_manager, audio_output_format=audio_output_format
+                            )
                         )
 
                         # Now send the sessionStart event to Bedrock
                         await stream_manager.send_raw_event(data)
-                        logger.info(
-                            f"SessionStart event sent to Bedrock {json.dumps(data)}"
-                        )
+                        logger.debug("SessionStart event sent to Bedrock %s", data)
 
                         # Continue to next iteration to process next event
                         continue
@@ -509,8 +573,12 @@ async def websocket_handler(websocket: WebSocket):
 
                         if stream_manager:
                             # Close locally to avoid upstream shutdown race validation errors.
+                            drain_controller.untrack(stream_manager)
                             await stream_manager.close()
                             stream_manager = None
+                        if admission_permit:
+                            admission_permit.release()
+                            admission_permit = None
                         if forward_task and not forward_task.done():
                             forward_task.cancel()
                             try:
@@ -562,7 +630,7 @@ async def websocket_handler(websocket: WebSocket):
                         elif (event_type == "clientEvent" and data["event"]["clientEvent"].get("name") == "event_opened"):
                             stream_manager.open_event_id = data["event"]["clientEvent"]["payload"]["eventId"]
                             stream_manager.open_event_pre_last_update = None
-                            logger.info(f"👉Set opened event ID: {stream_manager.open_event_id}")
+                            logger.info("👉Set opened event ID: %s", stream_manager.open_event_id)
                             sent = await send_open_event_context(
                                 stream_manager, 
                                 stream_manager.open_event_id, 
@@ -586,7 +654,7 @@ async def websocket_handler(websocket: WebSocket):
                             previous_open_event_id = stream_manager.open_event_id
                             stream_manager.open_event_id = None
                             stream_manager.open_event_pre_last_update = None
-                            logger.info(f"👉Cleared opened event ID due to event_closed")
+                            logger.info("👉Cleared opened event ID due to event_closed")
                             sent = await send_closed_event_context(
                                 stream_manager, previous_open_event_id, data["event"]["clientEvent"]["payload"].get("source")
                             )
@@ -618,11 +686,11 @@ async def websocket_handler(websocket: WebSocket):
                             await stream_manager.send_raw_event(data)
                     elif event_type not in ["sessionStart", "sessionEnd"]:
                         logger.warning(
-                            f"Received event {event_type} but no active stream manager"
+                            "Received event %s but no active stream manager", event_type
                         )
 
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON received from WebSocket: {e}")
+                except json_codec.JSONDecodeError as e:
+                    logger.error("Invalid JSON received from WebSocket: %s", e)
                     try:
                         await websocket.send_json(
                             {"type": "error", "message": "Invalid JSON format"}
@@ -631,7 +699,7 @@ async def websocket_handler(websocket: WebSocket):
                         pass
                 except Exception as exp:
                     logger.error(
-                        f"Error processing WebSocket message: {exp}", exc_info=True
+                        "Error processing WebSocket message: %s", exp, exc_info=True
                     )
                     try:
                         await websocket.send_json(
@@ -642,9 +710,10 @@ async def websocket_handler(websocket: WebSocket):
                     
             except WebSocketDisconnect as e:
                 ws_disconnected = True
-                logger.info(f"WebSocket disconnected: {websocket.client}")
+                disconnect_code = getattr(e, "code", None)
+                logger.info("WebSocket disconnected: %s", websocket.client)
                 logger.info(
-                    f"Disconnect details: code={getattr(e, 'code', 'N/A')}, reason={getattr(e, 'reason', 'N/A')}"
+                    "Disconnect details: code=%s, reason=%s", getattr(e, 'code', 'N/A'), getattr(e, 'reason', 'N/A')
                 )
                 if stream_manager and stream_manager.is_active:
                     logger.info(
@@ -652,11 +721,11 @@ async def websocket_handler(websocket: WebSocket):
                     )
                 break
             except Exception as e:
-                logger.error(f"Websocket error: {e}", exc_info=True)
+                logger.error("Websocket error: %s", e, exc_info=True)
                 break
             
     except Exception as e:
-        logger.error(f"WebSocket handler error: {e}", exc_info=True)
+        logger.error("WebSocket handler error: %s", e, exc_info=True)
         try:
             await websocket.send_json(
                 {"type": "error", "message": "WebSocket handler error"}
@@ -666,8 +735,39 @@ async def websocket_handler(websocket: WebSocket):
     finally:
         # Clean up resources
         logger.info("Cleaning up WebSocket connection resources")
+        # A dropped (not deliberately closed) socket keeps a resumable session alive.
+        if (
+            resume_token
+            and stream_manager
+            and stream_manager.is_active
+            and ws_disconnected
+            and disconnect_code != 1000
+            and websocket.application_state != WebSocketState.DISCONNECTED
+        ):
+            if forward_task and not forward_task.done():
+                forward_task.cancel()
+                try:
+                    await forward_task
+                except asyncio.CancelledError:
+                    pass
+            parked = ParkedSession(
+                stream_manager,
+                user_id,
+                timezone,
+                audio_input_format,
+                audio_output_format,
+                pending_open_event_context,
+                admission_permit,
+            )
+            if session_registry.park(resume_token, parked):
+                drain_controller.untrack(stream_manager)
+                stream_manager = None
+                admission_permit = None
         if stream_manager:
+            drain_controller.untrack(stream_manager)
             await stream_manager.close()
+        if admission_permit:
+            admission_permit.release()
         if forward_task and not forward_task.done():
             forward_task.cancel()
             try:
@@ -683,118 +783,38 @@ async def websocket_handler(websocket: WebSocket):
             try:
                 await websocket.close()
             except Exception as e:
-                logger.debug(f"WebSocket close skipped/failed (likely already closed): {e}")
+                logger.debug("WebSocket close skipped/failed (likely already closed): %s", e)
 
         logger.info("Connection closed")
         
         
-def split_large_event(response, max_size=16000):
-    """
-    Split a large event into smaller chunks by dividing the content field.
-    For audio events, ensures splits occur at sample boundaries to avoid noise.
-    Returns a list of events to send.
-    """
-    event = json.dumps(response)
-    event_size = len(event.encode("utf-8"))
-
-    # If event is small enough, return as-is
-    if event_size <= max_size:
-        return [response]
-
-    # Get event type and data
-    if "event" not in response:
-        return [response]
-
-    event_type = list(response["event"].keys())[0]
-    event_data = response["event"][event_type]
-
-    # Only split events that have a 'content' field (audioOutput, textOutput, etc.)
-    if "content" not in event_data:
-        logger.warning(
-            f"Event {event_type} is large ({event_size} bytes) but has no content field to split"
-        )
-        return [response]
-
-    content = event_data["content"]
-
-    # Calculate how much content we can fit per chunk
-    # Create a template event to measure overhead
-    template_event = response.copy()
-    template_event["event"] = {event_type: event_data.copy()}
-    template_event["event"][event_type]["content"] = ""
-    overhead = len(json.dumps(template_event).encode("utf-8"))
-
-    # Calculate max content size per chunk (leave some margin)
-    max_content_size = max_size - overhead - 100
-
-    # For audio events, align to sample boundaries
-    # Base64 encoding: 4 chars = 3 bytes of binary data
-    # PCM 16-bit: 2 bytes per sample
-    # Must align to multiples of 4 chars for valid base64 (no padding issues)
-    if event_type == "audioOutput":
-        # Align to 4-char boundaries for complete base64 groups
-        # This ensures each chunk is valid base64 without padding issues
-        alignment = 4
-        max_content_size = (max_content_size // alignment) * alignment
-        logger.debug(
-            f"Audio splitting: aligned chunk size to {max_content_size} chars (base64 boundary)"
-        )
-
-    # Split content into chunks
-    chunks = []
-    for i in range(0, len(content), max_content_size):
-        chunk_content = content[i : i + max_content_size]
-
-        # For base64 content, ensure proper padding if needed
-        if event_type == "audioOutput":
-            # Each chunk should be a multiple of 4 chars (already aligned above)
-            # But verify and add padding if somehow needed
-            remainder = len(chunk_content) % 4
-            if remainder != 0:
-                # This shouldn't happen due to alignment, but just in case
-                padding_needed = 4 - remainder
-                chunk_content += "=" * padding_needed
-                logger.warning(f"Added {padding_needed} padding chars to audio chunk")
-
-        # Create new event with chunked content
-        chunk_event = response.copy()
-        chunk_event["event"] = {event_type: event_data.copy()}
-        chunk_event["event"][event_type]["content"] = chunk_content
-
-        chunks.append(chunk_event)
-
-    logger.info(
-        f"Split {event_type} event ({event_size} bytes) into {len(chunks)} chunks"
-    )
-    return chunks
-
+async def forward_responses(websocket: WebSocket, stream_manager, audio_output_format=FORMAT_JSON):
+    """Forward responses from Bedrock to the WebSocket client.
 
-async def forward_responses(websocket: WebSocket, stream_manager):
-    """Forward responses from Bedrock to the WebSocket client."""
+    With ``audio_output_format="binary"`` audioOutput events are decoded once and
+    sent as raw PCM binary frames (see ``audio_frames``); everything else stays JSON.
+    """
+    serializer = EventSerializer()
     try:
         while True:
-            # Avoid hanging forever if the upstream stream died unexpectedly.
-            queue_get_task = asyncio.create_task(stream_manager.output_queue.get())
+            # The session closes its output buffer when the stream ends, so this
+            # wakes up immediately on upstream failure instead of polling.
             try:
-                response = await asyncio.wait_for(queue_get_task, timeout=1.0)
-            except asyncio.TimeoutError:
-                queue_get_task.cancel()
-                try:
-                    await queue_get_task
-                except asyncio.CancelledError:
-                    pass
-                if not stream_manager.is_active:
-                    if getattr(stream_manager, "_session_end_sent", False):
-                        logger.info("Stream ended normally, stopping forward task")
-                        break
-                    logger.warning("Stream became inactive unexpectedly; closing websocket")
-                    if (
-                        websocket.client_state != WebSocketState.DISCONNECTED
-                        and websocket.application_state != WebSocketState.DISCONNECTED
-                    ):
-                        await websocket.close(code=1011, reason="Upstream stream failed")
+                response = await stream_manager.output_queue.get()
+            except OutputBufferClosed:
+                if (
+                    getattr(stream_manager, "_session_end_sent", False)
+                    and not getattr(stream_manager, "upstream_failed", False)
+                ):
+                    logger.info("Stream ended normally, stopping forward task")
                     break
-                continue
+                logger.warning("Stream ended unexpectedly; closing websocket")
+                if (
+                    websocket.client_state != WebSocketState.DISCONNECTED
+                    and websocket.application_state != WebSocketState.DISCONNECTED
+                ):
+                    await websocket.close(code=1011, reason="Upstream stream failed")
+                break
 
             # Send to WebSocket
             try:
@@ -807,9 +827,33 @@ async def forward_responses(websocket: WebSocket, stream_manager):
                         await websocket.close(code=1000, reason="Conversation ended")
                     break
 
-                # Check if event needs to be split
-                event = json.dumps(response)
-                event_size = len(event.encode("utf-8"))
+                if response.get("type") == SERVER_DRAINING_EVENT_TYPE:
+                    # 1012 (service restart): the client should reconnect, reaching another instance.
+                    logger.info("Session retired by drain, closing websocket")
+                    if (
+                        websocket.client_state != WebSocketState.DISCONNECTED
+                        and websocket.application_state != WebSocketState.DISCONNECTED
+                    ):
+                        await websocket.send_json(response)
+                        await websocket.close(code=1012, reason="Server restarting")
+                    break
+
+                if audio_output_format == FORMAT_BINARY:
+                    audio_output = response.get("event", {}).get("audioOutput")
+                    if audio_output is not None:
+                        frames = split_audio_frames(
+                            AUDIO_OUTPUT,
+                            audio_output.get("promptName", ""),
+                            audio_output.get("contentId", ""),
+                            base64.b64decode(audio_output.get("content", "")),
+                        )
+                        for frame in frames:
+                            await websocket.send_bytes(frame)
+                        _CLIENT_BINARY_SENT.inc(len(frames))
+                        continue
+
+                # Encode once; large content is split into several frames
+                frames = serializer.serialize(response)
 
                 # Get event type for logging
                 event_type = (
@@ -817,46 +861,37 @@ async def forward_responses(websocket: WebSocket, stream_manager):
                     if "event" in response
                     else "unknown"
                 )
-
-                # Split large events
-                if event_size > 10000:
-                    logger.warning(
-                        f"!!!! Large {event_type} event detected (size: {event_size} bytes) - splitting..."
-                    )
-                    events_to_send = split_large_event(response, max_size=10000)
-                else:
-                    events_to_send = [response]
+                if len(frames) > 1:
+                    logger.debug("Large %s event split into %d frames", event_type, len(frames))
 
                 # Send all chunks
-                for idx, event_chunk in enumerate(events_to_send):
-                    chunk_json = json.dumps(event_chunk)
-                    chunk_size = len(chunk_json.encode("utf-8"))
-
-                    await websocket.send_text(chunk_json)
-
-                    error_data = event_chunk.get("event", {}).get("error", {})
-                    if error_data.get("fatal") is True:
-                        logger.error(
-                            f"Fatal stream error forwarded to client: {error_data.get('code', 'UNKNOWN')}"
-                        )
-                        if (
-                            websocket.client_state != WebSocketState.DISCONNECTED
-                            and websocket.application_state != WebSocketState.DISCONNECTED
-                        ):
-                            await websocket.close(code=1011, reason="Upstream stream failed")
-                        return
+                for idx, frame in enumerate(frames):
+                    await websocket.send_text(frame)
+                    _CLIENT_TEXT_SENT.inc()
 
-                    if len(events_to_send) > 1:
+                    if len(frames) > 1:
                         logger.debug(
-                            f"Forwarded {event_type} chunk {idx + 1}/{len(events_to_send)} to client (size: {chunk_size} bytes)"
+                            "Forwarded %s chunk %d/%d to client (size: %d bytes)", event_type, idx + 1, len(frames), len(frame)
                         )
                     else:
                         logger.debug(
-                            f"Forwarded {event_type} to client (size: {chunk_size} bytes)"
+                            "Forwarded %s to client (size: %d bytes)", event_type, len(frame)
                         )
 
+                error_data = response.get("event", {}).get("error", {})
+                if error_data.get("fatal") is True:
+                    logger.error(
+                        "Fatal stream error forwarded to client: %s", error_data.get('code', 'UNKNOWN')
+                    )
+                    if (
+                        websocket.client_state != WebSocketState.DISCONNECTED
+                        and websocket.application_state != WebSocketState.DISCONNECTED
+                    ):
+                        await websocket.close(code=1011, reason="Upstream stream failed")
+                    return
+
             except Exception as e:
-                logger.error(f"Error sending response to client: {e}", exc_info=True)
+                logger.error("Error sending response to client: %s", e, exc_info=True)
                 # Check if it's a connection error that should break the loop
                 error_str = str(e).lower()
                 if "closed" in error_str or "disconnect" in error_str:
@@ -867,10 +902,22 @@ async def forward_responses(websocket: WebSocket, stream_manager):
     except asyncio.CancelledError:
         logger.debug("Forward responses task cancelled")
     except Exception as e:
-        logger.error(f"Error forwarding responses: {e}", exc_info=True)
+        logger.error("Error forwarding responses: %s", e, exc_info=True)
     finally:
         logger.info("Forward responses task ended")
 
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains voice sessions on SIGTERM before closing connections."""
+
+    async def shutdown(self, sockets=None):
+        try:
+            await drain_controller.drain()
+        except Exception:
+            logger.error("Drain failed; shutting down anyway", exc_info=True)
+        await super().shutdown(sockets=sockets)
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -885,14 +932,14 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8080"))
 
-    logger.info(f"Starting Nova Sonic S2S WebSocket Server on {host}:{port}")
+    logger.info("Starting Nova Sonic S2S WebSocket Server on %s:%s", host, port)
 
     try:
-        uvicorn.run(app, host=host, port=port)
+        DrainingServer(uvicorn.Config(app, host=host, port=port)).run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server error: {e}")
+        logger.error("Server error: %s", e)
         if args.debug:
             import traceback
 
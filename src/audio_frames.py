@@ -0,0 +1,83 @@
+"""Binary WebSocket audio frames.
+
+Clients can negotiate binary audio in the ``init`` payload instead of sending
+base64 PCM inside JSON events. Each binary WebSocket message carries one chunk
+of raw 16-bit mono PCM behind a small header:
+
+    [frame type: u8]
+    [prompt name length: u8][prompt name: UTF-8]
+    [content name length: u8][content name: UTF-8]
+    [PCM samples ...]
+
+Audio input frames carry the ``promptName``/``contentName`` of the matching
+Bedrock ``audioInput`` event. Audio output frames (24 kHz PCM from Bedrock)
+carry the ``promptName`` and the ``contentId`` of the ``audioOutput`` event in
+the same two slots; one event may be split across several frames.
+"""
+
+AUDIO_INPUT = 0x01
+AUDIO_OUTPUT = 0x02
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+AUDIO_FORMATS = (FORMAT_JSON, FORMAT_BINARY)
+
+MAX_NAME_BYTES = 255
+# Same per-message ceiling the JSON downlink uses when splitting audioOutput.
+MAX_FRAME_BYTES = 10000
+
+
+class AudioFrameError(ValueError):
+    """Raised when a binary audio frame is malformed."""
+
+
+def encode_audio_frame_header(frame_type, prompt_name, content_name):
+    """Encode the header that precedes the PCM payload of a binary audio frame."""
+    header = bytearray([frame_type])
+    for name in (prompt_name, content_name):
+        encoded = name.encode("utf-8")
+        if len(encoded) > MAX_NAME_BYTES:
+            raise AudioFrameError(f"Name too long for binary audio frame: {len(encoded)} bytes")
+        header.append(len(encoded))
+        header += encoded
+    return bytes(header)
+
+
+def encode_audio_frame(frame_type, prompt_name, content_name, pcm):
+    """Encode one binary audio frame."""
+    return encode_audio_frame_header(frame_type, prompt_name, content_name) + pcm
+
+
+def split_audio_frames(frame_type, prompt_name, content_name, pcm, max_frame_bytes=MAX_FRAME_BYTES):
+    """Encode ``pcm`` as one or more frames of at most ``max_frame_bytes``, split on sample boundaries."""
+    header = encode_audio_frame_header(frame_type, prompt_name, content_name)
+    chunk_size = (max_frame_bytes - len(header)) & ~1
+    if chunk_size <= 0:
+        raise AudioFrameError("max_frame_bytes is too small for the frame header")
+    if len(pcm) <= chunk_size:
+        return [header + pcm]
+    return [header + pcm[i : i + chunk_size] for i in range(0, len(pcm), chunk_size)]
+
+
+def decode_audio_frame(data):
+    """Decode a binary audio frame into ``(frame_type, prompt_name, content_name, pcm)``."""
+    try:
+        frame_type = data[0]
+        offset = 1
+        names = []
+        for _ in range(2):
+            length = data[offset]
+            offset += 1
+            if offset + length > len(data):
+                raise AudioFrameError("Truncated binary audio frame header")
+            names.append(data[offset : offset + length].decode("utf-8"))
+            offset += length
+    except IndexError:
+        raise AudioFrameError("Truncated binary audio frame header") from None
+    except UnicodeDecodeError:
+        raise AudioFrameError("Binary audio frame names must be UTF-8") from None
+
+    pcm = data[offset:]
+    if len(pcm) % 2:
+        raise AudioFrameError("PCM payload must contain whole 16-bit samples")
+    return frame_type, names[0], names[1], pcm
@@ -0,0 +1,93 @@
+import logging
+import time
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from data_access import create_bedrock_runtime_client
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class _RegistryEntry:
+    __slots__ = ("client", "created_at")
+
+    def __init__(self, client, created_at):
+        self.client = client
+        self.created_at = created_at
+
+
+class BedrockClientRegistry:
+    """
+    Process-wide Bedrock runtime clients, one per (region, model id).
+
+    Building a ``BedrockRuntimeClient`` creates its own CRT HTTP client and TLS
+    context, and each client keeps its own HTTP/2 connection. Sessions that share
+    a client also share that connection, multiplexing their bidirectional
+    streams over it instead of each doing a TLS handshake.
+
+    Credential rotation does not touch the clients: their identity resolver reads
+    the current credentials from the credential provider on every request. A client
+    is only rebuilt after ``clear()`` (a configuration change). Sessions already
+    holding the previous client keep it until they end; it is simply no longer
+    handed out.
+    """
+
+    def __init__(self, factory=None):
+        self._factory = factory or create_bedrock_runtime_client
+        self._entries = {}
+        self._retired = []
+        self.created = 0
+        self.reused = 0
+        self.setup_seconds_total = 0.0
+
+    def get(self, region, model_id):
+        """Return the shared client for ``model_id`` in ``region``, creating it if needed."""
+        if self._retired:
+            self._prune_retired()
+        key = (region, model_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.reused += 1
+            return entry.client
+
+        started = time.perf_counter()
+        client = self._factory(region)
+        self.setup_seconds_total += time.perf_counter() - started
+        self.created += 1
+        self._entries[key] = _RegistryEntry(client, time.monotonic())
+        return client
+
+    def clear(self):
+        """Forget every client; the next ``get`` creates new ones."""
+        self._retired.extend(entry.client for entry in self._entries.values())
+        self._entries.clear()
+        logger.info("Bedrock client registry cleared; %s clients retired", len(self._retired))
+
+    @staticmethod
+    def _open_connections(client):
+        transport = getattr(getattr(client, "_config", None), "transport", None)
+        connections = getattr(transport, "_connections", None) or {}
+        return sum(1 for connection in connections.values() if connection.is_open())
+
+    def _prune_retired(self):
+        """Drop retired clients whose connections have all closed."""
+        self._retired = [client for client in self._retired if self._open_connections(client)]
+
+    def connection_count(self):
+        """Open HTTP connections held by current and retired clients."""
+        self._prune_retired()
+        clients = [entry.client for entry in self._entries.values()] + self._retired
+        return sum(self._open_connections(client) for client in clients)
+
+    def stats(self):
+        return {
+            "clients": len(self._entries),
+            "created": self.created,
+            "reused": self.reused,
+            "avg_setup_ms": round(self.setup_seconds_total / self.created * 1000, 1) if self.created else None,
+            "open_connections": self.connection_count(),
+        }
+
+
+bedrock_client_registry = BedrockClientRegistry()
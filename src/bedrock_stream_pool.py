@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from aws_sdk_bedrock_runtime.client import InvokeModelWithBidirectionalStreamOperationInput
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bedrock_client_registry import bedrock_client_registry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Ready streams kept per (region, model id); 0 disables the pool.
+DEFAULT_POOL_SIZE = int(os.getenv("CLARITY_STREAM_POOL_SIZE", "2"))
+# An opened stream that has not carried a sessionStart is discarded after this long.
+DEFAULT_IDLE_TTL_SECONDS = float(os.getenv("CLARITY_STREAM_POOL_IDLE_TTL_SECONDS", "45"))
+MAINTENANCE_INTERVAL_SECONDS = 5
+RETRY_BACKOFF_SECONDS = 10
+
+
+async def open_bedrock_stream(region, model_id):
+    """Open a bidirectional stream on the shared client; returns ``(client, stream)``."""
+    client = bedrock_client_registry.get(region, model_id)
+    stream = await client.invoke_model_with_bidirectional_stream(
+        InvokeModelWithBidirectionalStreamOperationInput(model_id=model_id)
+    )
+    return client, stream
+
+
+class PooledStream:
+    """A bidirectional stream opened ahead of time, plus the client that owns it."""
+
+    __slots__ = ("client", "stream", "opened_at")
+
+    def __init__(self, client, stream, opened_at):
+        self.client = client
+        self.stream = stream
+        self.opened_at = opened_at
+
+
+class BedrockStreamPool:
+    """
+    Per-process pool of pre-opened Bedrock bidirectional streams.
+
+    ``warm(region, model_id)`` keeps up to ``size`` ready streams for that model,
+    refilled in the background. ``acquire`` hands one out without any network
+    round trip, or returns ``None`` so the caller opens a stream itself. Streams
+    idle for longer than ``idle_ttl`` are closed instead of handed out.
+
+    The pool also aggregates time-to-first-audio for sessions that did and did
+    not get a pooled stream, so the benefit can be compared in production.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, idle_ttl=DEFAULT_IDLE_TTL_SECONDS, opener=None):
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self._opener = opener or open_bedrock_stream
+        self._ready = {}
+        self._warm_keys = set()
+        self._fill_tasks = {}
+        self._close_tasks = set()
+        self._retry_after = {}
+        self._maintenance_task = None
+        self.hits = 0
+        self.misses = 0
+        self.opened = 0
+        self.open_failures = 0
+        self.expired = 0
+        self._time_to_first_audio = {
+            "pooled": {"count": 0, "total_seconds": 0.0},
+            "fresh": {"count": 0, "total_seconds": 0.0},
+        }
+
+    @property
+    def enabled(self):
+        return self.size > 0
+
+    # Lifecycle
+    async def start(self):
+        if not self.enabled or self._maintenance_task is not None:
+            return
+        self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def stop(self):
+        tasks = [t for t in [self._maintenance_task, *self._fill_tasks.values()] if t and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._maintenance_task = None
+        self._fill_tasks.clear()
+        entries = [entry for ready in self._ready.values() for entry in ready]
+        self._ready.clear()
+        await asyncio.gather(*(self._close(entry) for entry in entries), *self._close_tasks)
+
+    def warm(self, region, model_id):
+        """Keep ready streams for ``model_id`` in ``region`` from now on."""
+        if not self.enabled:
+            return
+        key = (region, model_id)
+        self._warm_keys.add(key)
+        self._schedule_fill(key)
+
+    # Hand-out
+    async def acquire(self, region, model_id):
+        """Return a ready ``PooledStream`` or ``None`` if none is available."""
+        key = (region, model_id)
+        self._evict_expired(key)
+        ready = self._ready.get(key)
+        if ready:
+            entry = ready.popleft()
+            self.hits += 1
+            self._schedule_fill(key)
+            logger.info(f"Using pre-warmed Bedrock stream ({len(ready)} left for {model_id})")
+            return entry
+        self.misses += 1
+        self._schedule_fill(key)
+        return None
+
+    # Refill
+    def _schedule_fill(self, key):
+        if key not in self._warm_keys:
+            return
+        task = self._fill_tasks.get(key)
+        if task is not None and not task.done():
+            return
+        if time.monotonic() < self._retry_after.get(key, 0):
+            return
+        self._fill_tasks[key] = asyncio.create_task(self._fill(key))
+
+    async def _fill(self, key):
+        region, model_id = key
+        ready = self._ready.setdefault(key, deque())
+        while len(ready) < self.size:
+            try:
+                client, stream = await self._opener(region, model_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.open_failures += 1
+                self._retry_after[key] = time.monotonic() + RETRY_BACKOFF_SECONDS
+                logger.warning(f"Failed to pre-open Bedrock stream for {model_id}: {e}")
+                return
+            self.opened += 1
+            ready.append(PooledStream(client, stream, time.monotonic()))
+
+    def _evict_expired(self, key):
+        ready = self._ready.get(key)
+        if not ready:
+            return
+        cutoff = time.monotonic() - self.idle_ttl
+        while ready and ready[0].opened_at <= cutoff:
+            entry = ready.popleft()
+            self.expired += 1
+            task = asyncio.create_task(self._close(entry))
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+    async def _maintain(self):
+        while True:
+            try:
+                await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+                for key in list(self._warm_keys):
+                    self._evict_expired(key)
+                    self._schedule_fill(key)
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                logger.error("Error maintaining Bedrock stream pool", exc_info=True)
+
+    @staticmethod
+    async def _close(entry):
+        try:
+            await entry.stream.input_stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing idle pooled stream: {e}")
+
+    # Metrics
+    def record_time_to_first_audio(self, pooled, seconds):
+        bucket = self._time_to_first_audio["pooled" if pooled else "fresh"]
+        bucket["count"] += 1
+        bucket["total_seconds"] += seconds
+
+    def stats(self):
+        time_to_first_audio = {
+            name: {
+                "count": bucket["count"],
+                "avg_ms": round(bucket["total_seconds"] / bucket["count"] * 1000, 1) if bucket["count"] else None,
+            }
+            for name, bucket in self._time_to_first_audio.items()
+        }
+        return {
+            "size": self.size,
+            "idle_ttl_seconds": self.idle_ttl,
+            "ready": {f"{region}/{model_id}": len(ready) for (region, model_id), ready in self._ready.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "opened": self.opened,
+            "open_failures": self.open_failures,
+            "expired": self.expired,
+            "time_to_first_audio": time_to_first_audio,
+        }
+
+
+bedrock_stream_pool = BedrockStreamPool()
@@ -0,0 +1,378 @@
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+import botocore.session
+import boto3
+import httpx
+from botocore.credentials import (
+    CredentialProvider as BotocoreCredentialProvider,
+    DeferredRefreshableCredentials,
+)
+from botocore.exceptions import NoCredentialsError
+from requests_aws4auth import AWS4Auth
+from smithy_core.aio.interfaces.identity import IdentityResolver
+from smithy_core.exceptions import SmithyIdentityError
+from smithy_aws_core.identity.components import AWSCredentialsIdentity, AWSIdentityProperties
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+IMDS_BASE_URL = "http://169.254.169.254"
+IMDS_TIMEOUT_SECONDS = 2
+# Refresh well ahead of expiry; botocore starts its own advisory refresh 15 minutes out.
+DEFAULT_REFRESH_MARGIN_SECONDS = int(os.getenv("CLARITY_CREDENTIAL_REFRESH_MARGIN_SECONDS", "1200"))
+RETRY_INTERVAL_SECONDS = 60
+# Static environment credentials never expire; botocore still wants an expiry time.
+STATIC_CREDENTIALS_TTL = timedelta(hours=12)
+
+
+async def fetch_imds_credentials(client):
+    """
+    Retrieve IAM role credentials from the Instance Metadata Service.
+
+    Tries IMDSv2 first and falls back to IMDSv1.
+
+    Returns:
+        dict: A dictionary containing the credentials or error information
+    """
+    result = {
+        "success": False,
+        "credentials": None,
+        "role_name": None,
+        "method_used": None,
+        "error": None,
+    }
+
+    try:
+        headers = {}
+        try:
+            token_response = await client.put(
+                f"{IMDS_BASE_URL}/latest/api/token",
+                headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
+            )
+            token = token_response.text if token_response.status_code == 200 else None
+        except httpx.HTTPError:
+            token = None
+
+        if token:
+            headers["X-aws-ec2-metadata-token"] = token
+            result["method_used"] = "IMDSv2"
+        else:
+            result["method_used"] = "IMDSv1"
+
+        role_response = await client.get(
+            f"{IMDS_BASE_URL}/latest/meta-data/iam/security-credentials/", headers=headers
+        )
+        if role_response.status_code != 200:
+            result["error"] = f"Failed to retrieve IAM role name: HTTP {role_response.status_code}"
+            return result
+
+        role_name = role_response.text.strip()
+        result["role_name"] = role_name
+
+        creds_response = await client.get(
+            f"{IMDS_BASE_URL}/latest/meta-data/iam/security-credentials/{role_name}", headers=headers
+        )
+        if creds_response.status_code != 200:
+            result["error"] = (
+                f"Failed to retrieve credentials for role {role_name}: HTTP {creds_response.status_code}"
+            )
+            return result
+
+        credentials = creds_response.json()
+        result["success"] = True
+        result["credentials"] = {
+            "AccessKeyId": credentials.get("AccessKeyId"),
+            "SecretAccessKey": credentials.get("SecretAccessKey"),
+            "Token": credentials.get("Token"),
+            "Expiration": _parse_expiration(credentials.get("Expiration")),
+        }
+    except httpx.HTTPError as e:
+        result["error"] = f"Request exception: {str(e)}"
+    except Exception as e:
+        result["error"] = f"Unexpected error: {str(e)}"
+
+    return result
+
+
+def _parse_expiration(value):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        logger.warning(f"Could not parse credential expiration: {value}")
+        return None
+
+
+def _credentials_from_environment():
+    access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
+    secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+    if not access_key_id or not secret_access_key:
+        return None
+    return {
+        "AccessKeyId": access_key_id,
+        "SecretAccessKey": secret_access_key,
+        "Token": os.getenv("AWS_SESSION_TOKEN"),
+        "Expiration": None,
+    }
+
+
+class CredentialProvider:
+    """
+    Process-wide AWS credential cache.
+
+    Credentials come from environment variables (local mode) or from IMDS. IMDS
+    credentials are refreshed in the background ahead of expiry, and concurrent
+    callers share a single in-flight refresh. Every client reads from here: the
+    Bedrock stream through ``smithy_resolver()``, boto3 clients through
+    ``boto3_session()`` and the OpenSearch signer through ``aws4auth()``.
+    """
+
+    def __init__(self, refresh_margin_seconds=DEFAULT_REFRESH_MARGIN_SECONDS, imds_client_factory=None):
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._imds_client_factory = imds_client_factory or (
+            lambda: httpx.AsyncClient(timeout=IMDS_TIMEOUT_SECONDS)
+        )
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._refresh_future = None
+        self._refresh_task = None
+        self._loop = None
+        self._listeners = []
+        self.mode = None  # "local" or "imds"
+        self.version = 0
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_error = None
+
+    # Cache
+    def current(self):
+        """Return the cached credentials without refreshing (may be None or stale)."""
+        with self._lock:
+            return self._credentials
+
+    def _set_credentials(self, credentials):
+        with self._lock:
+            self._credentials = credentials
+            self.version += 1
+        for listener in list(self._listeners):
+            try:
+                listener(credentials)
+            except Exception:
+                logger.error("Credential listener failed", exc_info=True)
+
+    def add_listener(self, listener):
+        """Call ``listener(credentials)`` every time credentials rotate."""
+        self._listeners.append(listener)
+
+    def _needs_refresh(self, credentials, margin=None):
+        if credentials is None:
+            return True
+        expiration = credentials.get("Expiration")
+        if expiration is None:
+            return False
+        margin = self.refresh_margin if margin is None else margin
+        return datetime.now(timezone.utc) >= expiration - margin
+
+    # Refresh
+    async def get_credentials(self):
+        """Return valid credentials, refreshing (single-flight) only if they are about to expire."""
+        credentials = self.current()
+        if not self._needs_refresh(credentials):
+            return credentials
+        if credentials is not None and not self._needs_refresh(credentials, margin=timedelta(0)):
+            # Still valid: refresh in the background and answer from cache.
+            self._start_refresh()
+            return credentials
+        return await self.refresh()
+
+    async def refresh(self):
+        """Refresh credentials; concurrent callers await the same in-flight fetch."""
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self):
+        if self._refresh_future is None or self._refresh_future.done():
+            self._refresh_future = asyncio.ensure_future(self._do_refresh())
+            # Background refreshes may have no awaiter; mark their failures as retrieved.
+            self._refresh_future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return self._refresh_future
+
+    async def _do_refresh(self):
+        credentials = _credentials_from_environment() if self.mode != "imds" else None
+        if credentials is not None:
+            self.mode = "local"
+        else:
+            async with self._imds_client_factory() as client:
+                imds_result = await fetch_imds_credentials(client)
+            if not imds_result["success"]:
+                self.failure_count += 1
+                self.last_error = imds_result["error"]
+                logger.error(f"Failed to refresh credentials from IMDS: {imds_result['error']}")
+                raise NoCredentialsError()
+            credentials = imds_result["credentials"]
+            self.mode = "imds"
+
+        self.refresh_count += 1
+        self.last_error = None
+        self._set_credentials(credentials)
+        logger.info("✅ Credentials refreshed.")
+        return credentials
+
+    async def _refresh_loop(self):
+        logger.info("Starting credential refresh background task")
+        while True:
+            try:
+                credentials = self.current()
+                expiration = credentials.get("Expiration") if credentials else None
+                if expiration is None:
+                    refresh_in = 3600
+                else:
+                    until_refresh = (expiration - self.refresh_margin - datetime.now(timezone.utc)).total_seconds()
+                    refresh_in = min(max(until_refresh, 60), 3600)
+                logger.info(f"   Next credential refresh in {refresh_in:.0f} seconds")
+                await asyncio.sleep(refresh_in)
+                await self.refresh()
+            except asyncio.CancelledError:
+                logger.info("Credential refresh task cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in credential refresh task: {e}")
+                await asyncio.sleep(RETRY_INTERVAL_SECONDS)
+
+    async def start(self):
+        """Load initial credentials and, in IMDS mode, start refreshing them ahead of expiry."""
+        self._loop = asyncio.get_running_loop()
+        environment_credentials = _credentials_from_environment()
+        if environment_credentials:
+            self.mode = "local"
+            self._set_credentials(environment_credentials)
+            logger.info("✅ Using credentials from environment variables (local mode)")
+            return
+
+        logger.info("🔄 Attempting to fetch credentials from IMDS...")
+        self.mode = "imds"
+        try:
+            await self.refresh()
+            logger.info("✅ Initial credentials loaded from IMDS.")
+        except NoCredentialsError:
+            logger.error("❌ Application may not function correctly without credentials")
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+        self._refresh_task = None
+
+    def status(self):
+        credentials = self.current()
+        expiration = credentials.get("Expiration") if credentials else None
+        return {
+            "mode": self.mode,
+            "has_credentials": credentials is not None,
+            "expiration": expiration.isoformat() if expiration else None,
+            "version": self.version,
+            "refresh_count": self.refresh_count,
+            "failure_count": self.failure_count,
+            "last_error": self.last_error,
+        }
+
+    # Client hooks
+    def _blocking_credentials(self):
+        """Credentials for synchronous callers running off the event loop (boto3, requests)."""
+        credentials = self.current()
+        if not self._needs_refresh(credentials, margin=timedelta(0)):
+            return credentials
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if running_loop is not loop:
+                future = asyncio.run_coroutine_threadsafe(self.get_credentials(), loop)
+                return future.result(timeout=IMDS_TIMEOUT_SECONDS * 3 + 1)
+        credentials = _credentials_from_environment()
+        if credentials is None:
+            raise NoCredentialsError()
+        return credentials
+
+    def _botocore_metadata(self):
+        credentials = self._blocking_credentials()
+        expiration = credentials.get("Expiration") or datetime.now(timezone.utc) + STATIC_CREDENTIALS_TTL
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretAccessKey"],
+            "token": credentials.get("Token"),
+            "expiry_time": expiration.isoformat(),
+        }
+
+    def botocore_credentials(self):
+        """Lazily-resolved botocore credentials that always read from this provider."""
+        return DeferredRefreshableCredentials(
+            refresh_using=self._botocore_metadata, method=_BotocoreProviderAdapter.METHOD
+        )
+
+    def boto3_session(self):
+        """boto3 session whose clients resolve credentials through this provider."""
+        botocore_session = botocore.session.Session()
+        resolver = botocore_session.get_component("credential_provider")
+        resolver.insert_before("env", _BotocoreProviderAdapter(self))
+        return boto3.Session(botocore_session=botocore_session)
+
+    def aws4auth(self, region, service):
+        """requests signer for OpenSearch that re-reads credentials on every request."""
+        return AWS4Auth(refreshable_credentials=self.botocore_credentials(), region=region, service=service)
+
+    def smithy_resolver(self):
+        """Identity resolver for the Bedrock bidirectional-stream client."""
+        return ProviderCredentialsResolver(self)
+
+
+class _BotocoreProviderAdapter(BotocoreCredentialProvider):
+    METHOD = "clarity-credential-provider"
+    CANONICAL_NAME = "ClarityCredentialProvider"
+
+    def __init__(self, provider):
+        super().__init__()
+        self._provider = provider
+
+    def load(self):
+        return self._provider.botocore_credentials()
+
+
+class ProviderCredentialsResolver(IdentityResolver[AWSCredentialsIdentity, AWSIdentityProperties]):
+    """Resolves Bedrock stream credentials from the shared CredentialProvider."""
+
+    def __init__(self, provider):
+        self._provider = provider
+
+    async def get_identity(self, *, properties: AWSIdentityProperties) -> AWSCredentialsIdentity:
+        try:
+            credentials = await self._provider.get_credentials()
+        except NoCredentialsError as e:
+            credentials = _credentials_from_environment()
+            if credentials is None:
+                raise SmithyIdentityError("No AWS credentials available") from e
+        return AWSCredentialsIdentity(
+            access_key_id=credentials["AccessKeyId"],
+            secret_access_key=credentials["SecretAccessKey"],
+            session_token=credentials.get("Token"),
+            expiration=credentials.get("Expiration"),
+        )
+
+
+def _export_to_environment(credentials):
+    """Keep AWS_* environment variables in sync for libraries that read them directly."""
+    os.environ["AWS_ACCESS_KEY_ID"] = credentials["AccessKeyId"]
+    os.environ["AWS_SECRET_ACCESS_KEY"] = credentials["SecretAccessKey"]
+    if credentials.get("Token"):
+        os.environ["AWS_SESSION_TOKEN"] = credentials["Token"]
+
+
+# Process-wide credential provider
+credential_provider = CredentialProvider()
+credential_provider.add_listener(_export_to_environment)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import logging
+import os
+import boto3
+from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient
+from aws_sdk_bedrock_runtime.config import Config as BedrockRuntimeConfig
+from botocore.config import Config as BotoConfig
+from opensearchpy import OpenSearch, RequestsHttpConnection
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from tool_executor import tool_executor as default_tool_executor
+from credentials_provider import credential_provider
+from embedding_cache import embedding_cache
+import utils
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+TITAN_EMBED_MODEL_ID = "amazon.titan-embed-text-v1"
+
+# Connection pool sizing for the shared AWS clients. Every tool thread and every
+# session in the process reuses these keep-alive connections.
+MAX_POOL_CONNECTIONS = int(os.getenv("CLARITY_AWS_MAX_POOL_CONNECTIONS", "50"))
+OPENSEARCH_TIMEOUT_SECONDS = float(os.getenv("CLARITY_OPENSEARCH_TIMEOUT_SECONDS", "10"))
+
+
+def boto_client_config():
+    """botocore config with a larger keep-alive connection pool."""
+    return BotoConfig(
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        retries={"mode": "standard"},
+    )
+
+
+def create_boto3_client(service_name, region_name="us-east-1", session=None):
+    """Create a boto3 client that shares a pooled, keep-alive HTTP connection set."""
+    session = session or boto3.Session()
+    return session.client(service_name, region_name=region_name, config=boto_client_config())
+
+
+def create_opensearch_client(host, http_auth):
+    """Create an OpenSearch client with a pooled, keep-alive requests session."""
+    return OpenSearch(
+        hosts=[{"host": host, "port": 443}],
+        http_auth=http_auth,
+        use_ssl=True,
+        verify_certs=True,
+        connection_class=RequestsHttpConnection,
+        pool_maxsize=MAX_POOL_CONNECTIONS,
+        timeout=OPENSEARCH_TIMEOUT_SECONDS,
+    )
+
+
+def create_bedrock_runtime_client(region):
+    """Create a Bedrock runtime client (bidirectional streaming) backed by the shared credential provider."""
+    config = BedrockRuntimeConfig(
+        endpoint_uri=f"https://bedrock-runtime.{region}.amazonaws.com",
+        region=region,
+        aws_credentials_identity_resolver=credential_provider.smithy_resolver(),
+    )
+    return BedrockRuntimeClient(config=config)
+
+
+class CalendarRepository:
+    """Awaitable access to the DynamoDB, Lambda, Bedrock, OpenSearch and memory clients.
+
+    boto3 and opensearch-py are blocking libraries, so every call is dispatched to the
+    bounded tool executor on behalf of ``user_id``; the tools ``await`` the result and
+    can run independent calls concurrently with ``gather``. Responses are returned as
+    the client returns them.
+    """
+
+    def __init__(
+        self,
+        ddb_client,
+        lambda_client,
+        bedrock_client,
+        opensearch_client,
+        memory_client=None,
+        executor=None,
+        user_id=None,
+    ):
+        self.ddb_client = ddb_client
+        self.lambda_client = lambda_client
+        self.bedrock_client = bedrock_client
+        self.opensearch_client = opensearch_client
+        self.memory_client = memory_client
+        self.executor = executor or default_tool_executor
+        self.user_id = user_id
+
+    async def _call(self, func, *args, **kwargs):
+        return await self.executor.run(self.user_id, func, *args, **kwargs)
+
+    @staticmethod
+    async def gather(*calls):
+        """Await independent repository calls concurrently."""
+        return await asyncio.gather(*calls)
+
+    # DynamoDB
+    async def get_item(self, table_name, key, **kwargs):
+        return await self._call(self.ddb_client.get_item, TableName=table_name, Key=key, **kwargs)
+
+    async def put_item(self, table_name, item, **kwargs):
+        return await self._call(self.ddb_client.put_item, TableName=table_name, Item=item, **kwargs)
+
+    async def update_item(self, table_name, key, **kwargs):
+        return await self._call(self.ddb_client.update_item, TableName=table_name, Key=key, **kwargs)
+
+    async def delete_item(self, table_name, key, **kwargs):
+        return await self._call(self.ddb_client.delete_item, TableName=table_name, Key=key, **kwargs)
+
+    async def query(self, table_name, **kwargs):
+        return await self._call(self.ddb_client.query, TableName=table_name, **kwargs)
+
+    # Lambda
+    async def generate_content(self, prompt, event_content):
+        """Editor document from the content-generation Lambda for ``prompt`` applied to ``event_content``."""
+        return await self._call(utils.generate_update_content, self.lambda_client, self.user_id, prompt, event_content)
+
+    # Bedrock embeddings
+    async def embed_text(self, text, model_id=TITAN_EMBED_MODEL_ID):
+        """Return the embedding vector for ``text`` (served from the process-wide cache when possible)."""
+        def embed():
+            response = self.bedrock_client.invoke_model(
+                body=json.dumps({"inputText": text}),
+                modelId=model_id,
+            )
+            return json.loads(response["body"].read())["embedding"]
+
+        return await self._call(embedding_cache.get, text, model_id, embed)
+
+    # OpenSearch
+    async def search(self, index, body):
+        return await self._call(self.opensearch_client.search, index=index, body=body)
+
+    # AgentCore memory
+    async def create_memory_event(self, **kwargs):
+        if self.memory_client is None:
+            raise RuntimeError("No AgentCore memory client configured")
+        return await self._call(self.memory_client.create_event, **kwargs)
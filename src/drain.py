@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from admission import admission_controller as default_admission_controller
+from session_registry import session_registry as default_session_registry
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long live sessions get to finish their current turn once draining starts.
+DEFAULT_DRAIN_TIMEOUT_SECONDS = float(os.getenv("CLARITY_DRAIN_TIMEOUT_SECONDS", "25"))
+DRAIN_POLL_INTERVAL_SECONDS = 0.1
+
+SERVER_DRAINING_EVENT_TYPE = "server_draining"
+
+
+class DrainController:
+    """
+    Takes the process out of rotation without cutting users off mid-sentence.
+
+    ``drain()`` (SIGTERM via ``DrainingServer`` or ``POST /admin/drain``) stops
+    admitting sessions, so ``/health`` turns 503, then waits for every live
+    session to reach a turn boundary: no tool call running and no assistant
+    audio streaming or queued. Each such session is told ``server_draining``
+    (the client reconnects elsewhere) and closed. Sessions still busy at the
+    deadline are closed anyway and counted as killed; parked sessions are
+    closed straight away. Conversation history for all of them is written to
+    AgentCore memory together at the end instead of one session at a time.
+    """
+
+    def __init__(self, timeout=DEFAULT_DRAIN_TIMEOUT_SECONDS, admission=None, registry=None):
+        self.timeout = timeout
+        self.admission = admission or default_admission_controller
+        self.registry = registry or default_session_registry
+        self._sessions = set()
+        self._drain_task = None
+        self.report = None
+
+    @property
+    def draining(self):
+        return self._drain_task is not None
+
+    def track(self, session):
+        self._sessions.add(session)
+
+    def untrack(self, session):
+        self._sessions.discard(session)
+
+    def live_sessions(self):
+        """Sessions currently attached to a WebSocket."""
+        return list(self._sessions)
+
+    def start(self, timeout=None):
+        """Begin draining in the background (idempotent); returns the drain task."""
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self._drain(self.timeout if timeout is None else timeout))
+        return self._drain_task
+
+    async def drain(self, timeout=None):
+        """Drain and return the report; concurrent callers share one drain."""
+        return await asyncio.shield(self.start(timeout))
+
+    @staticmethod
+    def _notify(session, reason):
+        session.output_queue.put_nowait(
+            {
+                "type": SERVER_DRAINING_EVENT_TYPE,
+                "reason": reason,
+                "timestamp": int(datetime.now().timestamp() * 1000),
+            }
+        )
+
+    async def _retire(self, session, reason):
+        self._notify(session, reason)
+        try:
+            await session.close(flush_memory=False)
+        except Exception:
+            logger.error("Error closing session while draining", exc_info=True)
+
+    async def _drain(self, timeout):
+        started = time.monotonic()
+        deadline = started + timeout
+        self.admission.draining = True
+        logger.info(f"Draining: {len(self._sessions)} live sessions, deadline {timeout:.0f}s")
+
+        parked = len(self.registry)
+        await self.registry.close_all()
+
+        retired = []
+        closing = []
+        drained = 0
+        while True:
+            for session in list(self._sessions):
+                if session.is_active and not session.is_idle():
+                    continue
+                self._sessions.discard(session)
+                retired.append(session)
+                closing.append(asyncio.create_task(self._retire(session, "Server is restarting")))
+                drained += 1
+            if not self._sessions or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(DRAIN_POLL_INTERVAL_SECONDS)
+
+        killed = len(self._sessions)
+        for session in list(self._sessions):
+            logger.warning(f"Drain deadline reached; closing busy session for user {session.user_id}")
+            retired.append(session)
+            closing.append(asyncio.create_task(self._retire(session, "Server is restarting")))
+        self._sessions.clear()
+        await asyncio.gather(*closing)
+
+        flushed = await asyncio.gather(*(session.flush_deferred_memory() for session in retired))
+        self.report = {
+            "sessions_drained": drained,
+            "sessions_killed": killed,
+            "parked_closed": parked,
+            "memory_events_written": sum(1 for written in flushed if written),
+            "duration_seconds": round(time.monotonic() - started, 2),
+        }
+        logger.info(f"Drain complete: {self.report}")
+        return self.report
+
+    def status(self):
+        return {
+            "draining": self.draining,
+            "complete": self.report is not None,
+            "live_sessions": len(self._sessions),
+            "report": self.report,
+        }
+
+
+drain_controller = DrainController()
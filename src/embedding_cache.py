@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from metrics import EMBEDDING_CACHE_EVICTIONS, EMBEDDING_CACHE_REQUESTS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# A Titan v1 vector is 1536 doubles (~12 KiB stored), so the default holds ~12 MiB.
+MAX_VECTORS = int(os.getenv("CLARITY_EMBEDDING_CACHE_MAX_VECTORS", "1000"))
+TTL_SECONDS = float(os.getenv("CLARITY_EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+
+
+def normalize_text(text):
+    """Cache key form of a spoken title: case-folded, whitespace collapsed."""
+    return " ".join(str(text).casefold().split())
+
+
+class EmbeddingCache:
+    """
+    Process-wide cache of text embeddings, keyed on (model id, normalized text).
+
+    The event-matching tools embed the spoken title on every call, and users
+    keep referring to the same event across turns ("move the dentist", "actually
+    make the dentist 4pm"). Entries are evicted least-recently-used once
+    ``max_vectors`` are held and expire after ``ttl_seconds``. Tools run on
+    executor threads, so concurrent misses for the same key are single-flight:
+    one thread calls Bedrock and the others wait for its vector. Failures are
+    never cached.
+    """
+
+    def __init__(self, max_vectors=MAX_VECTORS, ttl_seconds=TTL_SECONDS, clock=time.monotonic):
+        self.max_vectors = max_vectors
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (vector, expires_at), oldest first
+        self._inflight = {}  # key -> Future for the thread computing it
+        # Also serializes the EMBEDDING_CACHE_* metric updates, which come from executor threads.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, text, model_id, compute):
+        """Return the embedding for ``text``, calling ``compute()`` only when no live entry or request exists."""
+        if not text or self.max_vectors <= 0:
+            return compute()
+        key = (model_id, normalize_text(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    EMBEDDING_CACHE_REQUESTS.labels("hit").inc()
+                    return entry[0].tolist()
+                del self._entries[key]
+                EMBEDDING_CACHE_EVICTIONS.labels("expired").inc()
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+                EMBEDDING_CACHE_REQUESTS.labels("miss").inc()
+            else:
+                self.coalesced += 1
+                EMBEDDING_CACHE_REQUESTS.labels("coalesced").inc()
+
+        if not owner:
+            return future.result().tolist()
+
+        try:
+            vector = array("d", compute())
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved for when there are none.
+            future.exception()
+            raise
+        with self._lock:
+            del self._inflight[key]
+            self._entries[key] = (vector, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_vectors:
+                self._entries.popitem(last=False)
+                EMBEDDING_CACHE_EVICTIONS.labels("lru").inc()
+        future.set_result(vector)
+        return vector.tolist()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            "vectors": len(self._entries),
+            "max_vectors": self.max_vectors,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / requests, 3) if requests else None,
+        }
+
+
+embedding_cache = EmbeddingCache()
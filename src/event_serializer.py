@@ -0,0 +1,121 @@
+"""Single-pass JSON framing for events sent to the WebSocket client.
+
+Outbound events from Bedrock are forwarded as JSON text frames of at most
+``max_size`` bytes; events whose ``content`` does not fit are split into
+several events that differ only in their ``content`` slice. ``EventSerializer``
+produces those frames while encoding every event exactly once: the JSON around
+``content`` comes from a template cached per event type and metadata, and the
+content itself is sliced and spliced in directly.
+"""
+import json
+import logging
+from collections import OrderedDict
+
+import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Same ceiling the downlink has always used for a single WebSocket text frame.
+DEFAULT_MAX_FRAME_SIZE = 10000
+# Headroom kept per chunk, as in the original splitter.
+CHUNK_MARGIN = 100
+# Base64 content never needs JSON escaping, so it can be sliced as-is.
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+# Stands in for the content while rendering a template; never appears in real events.
+_PLACEHOLDER = "\x00event-serializer-content\x00"
+_ENCODED_PLACEHOLDER = json.dumps(_PLACEHOLDER)
+
+
+def _is_plain_base64(content):
+    if not content.isascii():
+        return False
+    return not content.encode("ascii").translate(None, _BASE64_ALPHABET)
+
+
+class EventSerializer:
+    """Encode outbound events into pre-framed JSON strings, splitting large content.
+
+    ``json.dumps`` output is ASCII (``ensure_ascii``), so string lengths are byte
+    sizes and never need a separate ``encode`` to measure. Events without string
+    ``content`` are never split and go through the faster ``json_codec``.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_FRAME_SIZE, template_cache_size=256):
+        self.max_size = max_size
+        self.template_cache_size = template_cache_size
+        self._templates = OrderedDict()
+        self.template_hits = 0
+        self.template_misses = 0
+
+    def _template(self, event_type, event_data):
+        """Return ``(prefix, suffix)`` surrounding the encoded content of ``event_type``."""
+        try:
+            key = (event_type, tuple((k, v) for k, v in event_data.items() if k != "content"),
+                   tuple(event_data))
+            cached = self._templates.get(key)
+        except TypeError:
+            # Unhashable metadata (nested dicts/lists): render without caching.
+            key = None
+            cached = None
+        if cached is not None:
+            self._templates.move_to_end(key)
+            self.template_hits += 1
+            return cached
+
+        self.template_misses += 1
+        templated = dict(event_data)
+        templated["content"] = _PLACEHOLDER
+        rendered = json.dumps({event_type: templated})
+        prefix, suffix = rendered.split(_ENCODED_PLACEHOLDER, 1)
+        template = ('{"event": ' + prefix, suffix)
+        if key is not None:
+            self._templates[key] = template
+            if len(self._templates) > self.template_cache_size:
+                self._templates.popitem(last=False)
+        return template
+
+    def serialize(self, response):
+        """Return the JSON text frames for ``response`` (usually exactly one)."""
+        event = response.get("event")
+        if not isinstance(event, dict) or len(event) != 1:
+            return [json_codec.dumps(response)]
+        event_type, event_data = next(iter(event.items()))
+        content = event_data.get("content") if isinstance(event_data, dict) else None
+        if not isinstance(content, str):
+            return [json_codec.dumps(response)]
+
+        prefix, suffix = self._template(event_type, event_data)
+        if len(response) > 1:
+            rest = {key: value for key, value in response.items() if key != "event"}
+            suffix = suffix + ", " + json.dumps(rest)[1:]
+        else:
+            suffix = suffix + "}"
+
+        plain = _is_plain_base64(content)
+        encoded = '"' + content + '"' if plain else json.dumps(content)
+        overhead = len(prefix) + len(suffix)
+        if overhead + len(encoded) <= self.max_size:
+            return [prefix + encoded + suffix]
+
+        max_content_size = self.max_size - overhead - 2 - CHUNK_MARGIN
+        if event_type == "audioOutput":
+            # Keep every chunk a whole number of base64 groups.
+            max_content_size -= max_content_size % 4
+        if max_content_size <= 0:
+            logger.warning("Event %s metadata alone exceeds %s bytes; sending unsplit", event_type, self.max_size)
+            return [prefix + encoded + suffix]
+
+        if plain:
+            frames = [
+                prefix + '"' + content[i : i + max_content_size] + '"' + suffix
+                for i in range(0, len(content), max_content_size)
+            ]
+        else:
+            frames = [
+                prefix + json.dumps(content[i : i + max_content_size]) + suffix
+                for i in range(0, len(content), max_content_size)
+            ]
+        logger.debug(
+            "Split %s event (%s bytes) into %s chunks", event_type, overhead + len(encoded), len(frames)
+        )
+        return frames
@@ -0,0 +1,112 @@
+"""JSON encoding/decoding for the streaming hot path.
+
+Every Bedrock event, client message and tool result goes through ``loads`` /
+``dumps`` here. When ``orjson`` is installed it does the work (several times
+faster than the stdlib on these payloads, and it reads/writes UTF-8 bytes
+directly so Bedrock payloads skip a decode/encode); otherwise the stdlib
+``json`` module is used with compact separators. ``CLARITY_JSON_BACKEND=stdlib``
+forces the fallback.
+
+Both backends produce compact JSON that may contain non-ASCII characters, and
+both encode ``Decimal`` (DynamoDB numbers), ``date``/``datetime`` and ``set``
+values the same way through ``json_default``. Code that needs ASCII-only output
+to measure frame sizes (``event_serializer``) keeps using ``json`` directly.
+"""
+import json
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib is the fallback
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# orjson raises its own JSONDecodeError, a subclass of this one.
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_default(value):
+    """Encode the non-JSON types tool results carry (DynamoDB numbers, dates, sets)."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+class _StdlibBackend:
+    name = "stdlib"
+
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=json_default)
+
+    def dumps(self, value):
+        return self._encoder.encode(value)
+
+    def dumps_bytes(self, value):
+        return self._encoder.encode(value).encode("utf-8")
+
+    @staticmethod
+    def loads(data):
+        return json.loads(data)
+
+
+class _OrjsonBackend:
+    name = "orjson"
+
+    # Non-string keys are stringified like the stdlib does; datetimes are
+    # rendered by orjson itself, matching ``isoformat()`` for naive and aware values.
+    _options = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, value):
+        return orjson.dumps(value, default=json_default, option=self._options).decode("utf-8")
+
+    def dumps_bytes(self, value):
+        return orjson.dumps(value, default=json_default, option=self._options)
+
+    @staticmethod
+    def loads(data):
+        return orjson.loads(data)
+
+
+def _select_backend(name=None):
+    name = (name or os.getenv("CLARITY_JSON_BACKEND", "auto")).lower()
+    if name == "stdlib" or orjson is None:
+        if name == "orjson":
+            logger.warning("CLARITY_JSON_BACKEND=orjson but orjson is not installed; using the stdlib")
+        return _StdlibBackend()
+    return _OrjsonBackend()
+
+
+_backend = _select_backend()
+
+
+def use_backend(name):
+    """Switch backends at runtime (``"orjson"``, ``"stdlib"`` or ``"auto"``); returns the one in use."""
+    global _backend
+    _backend = _select_backend(name)
+    return _backend.name
+
+
+def backend_name():
+    return _backend.name
+
+
+def dumps(value):
+    """Encode ``value`` as a compact JSON ``str``."""
+    return _backend.dumps(value)
+
+
+def dumps_bytes(value):
+    """Encode ``value`` as compact UTF-8 JSON ``bytes`` (what the Bedrock stream takes)."""
+    return _backend.dumps_bytes(value)
+
+
+def loads(data):
+    """Decode JSON from ``str`` or UTF-8 ``bytes``; raises ``JSONDecodeError`` on bad input."""
+    return _backend.loads(data)
@@ -0,0 +1,296 @@
+"""Asynchronous, redacting, sampled logging.
+
+``configure_logging()`` replaces the blocking stdout handler ``basicConfig``
+would install with a ``QueueHandler``: the caller only renders the message and
+enqueues the record, and a ``QueueListener`` thread formats the line and writes
+it. Everything left on the calling thread (the event loop, or a tool thread) is
+bounded:
+
+- sampling: INFO/DEBUG records from loggers listed in ``CLARITY_LOG_SAMPLE``
+  (``name=N`` pairs, e.g. ``tools.update_event_tool=10``) are kept 1 in N per
+  call site; warnings and errors are always kept;
+- lazy formatting: call sites pass ``%s`` arguments instead of f-strings, so a
+  disabled level or a sampled-out record is never rendered;
+- redaction and truncation: container arguments are rendered by ``summarize()``,
+  which masks private or bulky fields (editor content, prompts, descriptions,
+  credentials, embedding vectors) and caps depth, item count and string length.
+
+When the queue is full the record is dropped and counted rather than blocking
+the caller.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+DEFAULT_LEVEL = os.getenv("CLARITY_LOG_LEVEL", "INFO")
+DEFAULT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+# Longest string rendered for a single argument / for a whole message.
+MAX_ARG_CHARS = int(os.getenv("CLARITY_LOG_MAX_ARG_CHARS", "512"))
+MAX_MESSAGE_CHARS = int(os.getenv("CLARITY_LOG_MAX_MESSAGE_CHARS", "4096"))
+# Records waiting for the writer thread before new ones are dropped.
+QUEUE_SIZE = int(os.getenv("CLARITY_LOG_QUEUE_SIZE", "10000"))
+
+REDACTED = "<redacted>"
+# Compared case-insensitively against mapping keys at any depth.
+DEFAULT_REDACT_KEYS = frozenset(
+    {
+        "content",
+        "description",
+        "prompt",
+        "doc",
+        "vector",
+        "title_vector",
+        "embedding",
+        "password",
+        "secret",
+        "token",
+        "resumetoken",
+        "authorization",
+        "x-admin-token",
+        "accesskeyid",
+        "secretaccesskey",
+        "sessiontoken",
+        "aws_access_key_id",
+        "aws_secret_access_key",
+        "aws_session_token",
+    }
+)
+
+
+def parse_sample_rates(spec):
+    """Parse ``"logger=N,other=M"`` into ``{"logger": N, "other": M}``; bad entries are ignored."""
+    rates = {}
+    for entry in (spec or "").split(","):
+        name, _, every = entry.strip().partition("=")
+        try:
+            rates[name.strip()] = int(every)
+        except ValueError:
+            continue
+    return {name: every for name, every in rates.items() if name and every > 1}
+
+
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def _truncate(text, limit):
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit} chars)"
+
+
+class Summarizer:
+    """Bounded, redacted rendering of log arguments.
+
+    Containers are walked depth-first into a character budget and the walk stops
+    as soon as the budget is spent, so a 50 KB DynamoDB item costs about as much
+    as a small one. Mapping values under ``redact_keys`` are never rendered.
+    """
+
+    def __init__(self, redact_keys=DEFAULT_REDACT_KEYS, max_chars=MAX_ARG_CHARS, max_depth=4, max_items=16):
+        self.redact_keys = frozenset(key.lower() for key in redact_keys)
+        self.max_chars = max_chars
+        self.max_depth = max_depth
+        self.max_items = max_items
+
+    def __call__(self, value):
+        if isinstance(value, _CONTAINERS):
+            parts = []
+            self._render(value, parts, self.max_depth, self.max_chars)
+            return "".join(parts)
+        if isinstance(value, (str, bytes)) and len(value) > self.max_chars:
+            return _truncate(value if isinstance(value, str) else repr(value), self.max_chars)
+        return value
+
+    def _render(self, value, parts, depth, budget):
+        """Append ``value``'s rendering to ``parts`` and return the characters left in ``budget``."""
+        if not isinstance(value, _CONTAINERS):
+            text = repr(value[: budget + 1]) if isinstance(value, (str, bytes)) else repr(value)
+            if len(text) > budget:
+                text = text[:budget] + "..."
+            parts.append(text)
+            return budget - len(text)
+        if isinstance(value, dict):
+            opening, closing, items = "{", "}", value.items()
+        elif isinstance(value, list):
+            opening, closing, items = "[", "]", value
+        elif isinstance(value, tuple):
+            opening, closing, items = "(", ")", value
+        else:
+            opening, closing, items = "{", "}", value
+        if not value or depth <= 0:
+            text = opening + ("..." if value else "") + closing
+            parts.append(text)
+            return budget - len(text)
+        parts.append(opening)
+        budget -= 1
+        is_mapping = isinstance(value, dict)
+        for index, item in enumerate(items):
+            if budget <= 0 or index >= self.max_items:
+                parts.append(", ..." if index else "...")
+                break
+            if index:
+                parts.append(", ")
+                budget -= 2
+            if is_mapping:
+                key, item = item
+                key_text = repr(key) + ": "
+                parts.append(key_text)
+                budget -= len(key_text)
+                if isinstance(key, str) and key.lower() in self.redact_keys:
+                    parts.append(REDACTED)
+                    budget -= len(REDACTED)
+                    continue
+            if type(item) in _SCALARS:
+                # Inline the common leaf case (DynamoDB attribute values are {"S": ...}).
+                text = repr(item[: budget + 1]) if type(item) is str else repr(item)
+                if len(text) > budget:
+                    text = text[: max(budget, 0)] + "..."
+                parts.append(text)
+                budget -= len(text)
+            else:
+                budget = self._render(item, parts, depth - 1, budget)
+        parts.append(closing)
+        return budget - 1
+
+
+summarize = Summarizer()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1 in N INFO/DEBUG records per call site for the configured loggers (and their children)."""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._rate_by_logger = {}
+        self._seen = {}
+        # Tool threads and the event loop log through the same handler.
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def _rate(self, name):
+        every = self._rate_by_logger.get(name)
+        if every is None:
+            every = 1
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    every = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._rate_by_logger[name] = every
+        return every
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        every = self._rate(record.name)
+        if every <= 1:
+            return True
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            seen = self._seen.get(site, 0)
+            self._seen[site] = seen + 1
+            if seen % every == 0:
+                return True
+            self.sampled_out += 1
+        return False
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """Renders (summarized) messages on the caller's thread and leaves formatting and I/O to the listener."""
+
+    def __init__(self, log_queue, summarizer=summarize, max_message_chars=MAX_MESSAGE_CHARS):
+        super().__init__(log_queue)
+        self.summarizer = summarizer
+        self.max_message_chars = max_message_chars
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Arguments may be mutated as soon as the caller returns, so the message
+        # is rendered here; only the cheap, immutable result crosses threads.
+        args = record.args
+        if args:
+            if isinstance(args, dict) and "%(" in str(record.msg):
+                args = {key: self.summarizer(value) for key, value in args.items()}
+            elif isinstance(args, dict):
+                # logger.info("item %s", item) stores a lone mapping argument as args itself
+                args = (self.summarizer(args),)
+            else:
+                args = tuple(self.summarizer(value) for value in args)
+        message = str(record.msg) % args if args else str(record.msg)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        prepared = logging.makeLogRecord(record.__dict__)
+        prepared.msg = _truncate(message, self.max_message_chars)
+        prepared.args = None
+        prepared.exc_info = None
+        prepared.message = prepared.msg
+        return prepared
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _LoggingState:
+    handler = None
+    listener = None
+    sampler = None
+
+
+_state = _LoggingState()
+
+
+def configure_logging(level=DEFAULT_LEVEL, stream=None, fmt=DEFAULT_FORMAT, sample_rates=None):
+    """Route the root logger through the async queue handler (idempotent; reconfigures on repeat calls)."""
+    stop_logging()
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv("CLARITY_LOG_SAMPLE", ""))
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(logging.Formatter(fmt))
+    log_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    handler = AsyncQueueHandler(log_queue)
+    sampler = SamplingFilter(sample_rates)
+    handler.addFilter(sampler)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        if isinstance(existing, logging.StreamHandler) and getattr(existing, "stream", None) in (sys.stdout, sys.stderr):
+            root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    _state.handler, _state.listener, _state.sampler = handler, listener, sampler
+    return handler
+
+
+def stop_logging():
+    """Flush queued records and detach the queue handler."""
+    if _state.listener is not None:
+        _state.listener.stop()
+    if _state.handler is not None:
+        logging.getLogger().removeHandler(_state.handler)
+    _state.handler = _state.listener = _state.sampler = None
+
+
+def stats():
+    handler = _state.handler
+    return {
+        "queued": handler.queue.qsize() if handler is not None else 0,
+        "dropped": handler.dropped if handler is not None else 0,
+        "sampled_out": _state.sampler.sampled_out if _state.sampler is not None else 0,
+    }
+
+
+atexit.register(stop_logging)
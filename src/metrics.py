@@ -0,0 +1,269 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+The realtime loops update these on every event, so updates are kept to a dict
+lookup and an addition: no locks and no allocation once a label combination
+has been seen. That is only safe on the event loop; code updating a metric from
+executor threads must serialize the updates itself (the embedding cache
+increments its counters under its own lock). Hot paths should resolve
+``metric.labels(...)`` once and keep the child. Values that already live
+elsewhere (queue depths, executor and pool stats) are read by collectors at
+scrape time instead of being mirrored on every change.
+
+The API follows ``prometheus_client`` (``labels().inc()``, ``observe``, ``set``)
+so the module can be swapped for it without touching call sites.
+"""
+import bisect
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+# Seconds; tuned for voice latencies (tens of ms to several seconds).
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _ValueChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds):
+        self._upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self._upper_bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount=1):
+        self._default.value += amount
+
+    def render(self):
+        lines = self._header()
+        for values, child in self._children.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value):
+        self._default.value = value
+
+    def dec(self, amount=1):
+        self._default.value -= amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.upper_bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def render(self):
+        lines = self._header()
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Owns the process metrics and scrape-time collectors; ``render()`` serves ``/metrics``."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collect):
+        """Add ``collect()`` returning gauge families ``(name, documentation, labelnames, {label values: value})``."""
+        self._collectors.append(collect)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception:
+                logger.error("Metrics collector failed", exc_info=True)
+                continue
+            for name, documentation, labelnames, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                for values, value in samples.items():
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Realtime pipeline
+AUDIO_INPUT_DROPPED = registry.counter(
+    "clarity_audio_input_dropped_total", "Client audio chunks dropped because the uplink queue was full"
+)
+OUTPUT_DROPPED = registry.counter(
+    "clarity_output_dropped_total", "Outbound events dropped for slow clients, by class", ["class"]
+)
+OUTPUT_DROPPED_AUDIO_SECONDS = registry.counter(
+    "clarity_output_dropped_audio_seconds_total", "Outbound audio dropped for slow clients, in playback seconds"
+)
+OUTPUT_PURGED_AUDIO_SECONDS = registry.counter(
+    "clarity_output_purged_audio_seconds_total", "Queued assistant audio discarded on barge-in, in playback seconds"
+)
+BEDROCK_EVENTS = registry.counter(
+    "clarity_bedrock_events_total", "Events exchanged with Bedrock, by direction and event type", ["direction", "event"]
+)
+CLIENT_MESSAGES = registry.counter(
+    "clarity_client_messages_total", "WebSocket messages exchanged with clients, by direction and frame kind",
+    ["direction", "kind"],
+)
+BEDROCK_FIRST_EVENT_SECONDS = registry.histogram(
+    "clarity_bedrock_first_event_seconds", "Stream request to the first event from Bedrock", ["pooled"]
+)
+TIME_TO_FIRST_AUDIO_SECONDS = registry.histogram(
+    "clarity_time_to_first_audio_seconds", "Stream request to the first audioOutput from Bedrock", ["pooled"]
+)
+
+# Tools and memory
+TOOL_SECONDS = registry.histogram("clarity_tool_duration_seconds", "Tool call latency", ["tool"])
+TOOL_CALLS = registry.counter("clarity_tool_calls_total", "Tool calls by outcome", ["tool", "outcome"])
+TOOL_TIMEOUTS = registry.counter(
+    "clarity_tool_timeouts_total", "Tool calls that exceeded their latency budget, by timeout action", ["tool", "action"]
+)
+TOOL_TIMEOUT_SECONDS = registry.histogram(
+    "clarity_tool_timeout_seconds",
+    "How long tool calls that exceeded their budget actually ran (until cancelled or finished)",
+    ["tool"],
+    buckets=(1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0),
+)
+TOOL_PERCEIVED_LATENCY_SECONDS = registry.histogram(
+    "clarity_tool_perceived_latency_seconds",
+    "Time from toolUse until the model first has something to say (result, progress prompt or timeout fallback)",
+    ["tool", "first_response"],
+    buckets=(0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0),
+)
+EMBEDDING_CACHE_REQUESTS = registry.counter(
+    "clarity_embedding_cache_requests_total",
+    "Title embedding lookups, by result (hit, miss, coalesced onto an in-flight request)",
+    ["result"],
+)
+EMBEDDING_CACHE_EVICTIONS = registry.counter(
+    "clarity_embedding_cache_evictions_total", "Cached title embeddings evicted, by reason (lru, expired)", ["reason"]
+)
+TOOL_SPECULATIONS = registry.counter(
+    "clarity_tool_speculations_total",
+    "Read-only tool lookups started at toolUse, by outcome (used, failed, discarded)",
+    ["tool", "outcome"],
+)
+TOOL_SPECULATION_LEAD_SECONDS = registry.histogram(
+    "clarity_tool_speculation_lead_seconds",
+    "Head start speculative lookups had: time from toolUse to the tool running",
+    ["tool"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+MEMORY_FLUSH_SECONDS = registry.histogram(
+    "clarity_memory_flush_seconds", "AgentCore memory write latency", ["outcome"]
+)
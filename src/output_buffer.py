@@ -0,0 +1,194 @@
+import asyncio
+import os
+from collections import deque
+from metrics import OUTPUT_DROPPED, OUTPUT_DROPPED_AUDIO_SECONDS, OUTPUT_PURGED_AUDIO_SECONDS
+
+# Audio waiting for a slow client is capped by playback time, not event count.
+DEFAULT_MAX_AUDIO_MS = float(os.getenv("CLARITY_OUTPUT_AUDIO_BUFFER_MS", "15000"))
+# Nova Sonic audioOutput is 24 kHz, 16-bit mono PCM, base64 encoded.
+OUTPUT_BYTES_PER_MS = 24000 * 2 / 1000
+
+AUDIO = "audio"
+TEXT = "text"
+CONTROL = "control"
+EVENT_CLASSES = (AUDIO, TEXT, CONTROL)
+_DROPPED_METRIC = {cls: OUTPUT_DROPPED.labels(cls) for cls in EVENT_CLASSES}
+
+
+class OutputBufferClosed(Exception):
+    """Raised by ``get`` once the buffer is closed and fully drained."""
+
+
+def classify_event(event):
+    """Return the delivery class of an outbound event."""
+    body = event.get("event") if isinstance(event, dict) else None
+    if isinstance(body, dict):
+        if "audioOutput" in body:
+            return AUDIO
+        if "textOutput" in body:
+            return TEXT
+    return CONTROL
+
+
+def audio_duration_ms(event):
+    """Playback duration of an audioOutput event."""
+    content = event["event"]["audioOutput"].get("content") or ""
+    return len(content) * 3 / 4 / OUTPUT_BYTES_PER_MS
+
+
+class OutputBuffer:
+    """FIFO of events bound for the client that never drops control or text events.
+
+    Drop-in for the ``asyncio.Queue`` the session used before (``put``,
+    ``put_nowait``, ``get``, ``get_nowait``, ``empty``, ``qsize``). Events keep
+    their arrival order; only audio is bounded, by buffered playback time, and
+    when a slow client lets it grow past ``max_audio_ms`` the oldest audio is
+    evicted first. Evictions are counted per class in ``stats()``.
+
+    ``close()`` is the terminal signal for consumers: events already queued are
+    still delivered, then ``get`` raises ``OutputBufferClosed``.
+    """
+
+    def __init__(self, max_audio_ms=DEFAULT_MAX_AUDIO_MS):
+        self.max_audio_ms = max_audio_ms
+        # Entries are [event, class, duration_ms, live]; evicted audio is marked
+        # dead in place so removal from the middle stays O(1).
+        self._entries = deque()
+        self._audio_entries = deque()
+        self._live = 0
+        self._not_empty = asyncio.Event()
+        self._closed = False
+        self.buffered_audio_ms = 0.0
+        self.dropped = {cls: 0 for cls in EVENT_CLASSES}
+        self.dropped_audio_ms = 0.0
+        self.delivered = {cls: 0 for cls in EVENT_CLASSES}
+        self.purged_audio = 0
+        self.purged_audio_ms = 0.0
+
+    def qsize(self):
+        return self._live
+
+    def empty(self):
+        return self._live == 0
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Stop accepting events and wake consumers once the backlog is drained."""
+        self._closed = True
+        self._not_empty.set()
+
+    def put_nowait(self, event):
+        if self._closed:
+            return
+        cls = classify_event(event)
+        duration_ms = audio_duration_ms(event) if cls == AUDIO else 0.0
+        entry = [event, cls, duration_ms, True]
+        self._entries.append(entry)
+        self._live += 1
+        if cls == AUDIO:
+            self._audio_entries.append(entry)
+            self.buffered_audio_ms += duration_ms
+            self._evict_audio()
+        self._not_empty.set()
+
+    async def put(self, event):
+        self.put_nowait(event)
+
+    def _evict_audio(self):
+        # Always keep the newest chunk so a single oversized event still plays.
+        while self.buffered_audio_ms > self.max_audio_ms and len(self._audio_entries) > 1:
+            entry = self._audio_entries.popleft()
+            if entry[3]:
+                self._drop(entry)
+
+    def _drop(self, entry):
+        entry[3] = False
+        self._live -= 1
+        self.dropped[entry[1]] += 1
+        _DROPPED_METRIC[entry[1]].inc()
+        if entry[1] == AUDIO:
+            self.buffered_audio_ms -= entry[2]
+            self.dropped_audio_ms += entry[2]
+            OUTPUT_DROPPED_AUDIO_SECONDS.inc(entry[2] / 1000)
+
+    def purge_audio(self, content_id=None):
+        """Discard queued audio (only ``content_id``'s, if given); return the milliseconds removed.
+
+        Used on barge-in, when audio the client has not played yet is stale.
+        """
+        purged_ms = 0.0
+        kept = deque()
+        for entry in self._audio_entries:
+            if not entry[3]:
+                continue
+            event_content_id = entry[0]["event"]["audioOutput"].get("contentId")
+            if content_id is not None and event_content_id != content_id:
+                kept.append(entry)
+                continue
+            entry[3] = False
+            self._live -= 1
+            self.buffered_audio_ms -= entry[2]
+            self.purged_audio += 1
+            purged_ms += entry[2]
+        self._audio_entries = kept
+        self.purged_audio_ms += purged_ms
+        OUTPUT_PURGED_AUDIO_SECONDS.inc(purged_ms / 1000)
+        return purged_ms
+
+    def get_nowait(self):
+        while self._entries:
+            entry = self._entries.popleft()
+            if not entry[3]:
+                continue
+            entry[3] = False
+            self._live -= 1
+            if entry[1] == AUDIO:
+                self.buffered_audio_ms -= entry[2]
+                if self._audio_entries and self._audio_entries[0] is entry:
+                    self._audio_entries.popleft()
+            self.delivered[entry[1]] += 1
+            return entry[0]
+        if not self._closed:
+            self._not_empty.clear()
+        raise asyncio.QueueEmpty
+
+    async def get(self):
+        """Return the next event, waiting if needed; raise ``OutputBufferClosed`` at the end."""
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._closed:
+                    raise OutputBufferClosed from None
+                await self._not_empty.wait()
+
+    def clear(self):
+        """Discard everything queued without counting it as dropped."""
+        self._entries.clear()
+        self._audio_entries.clear()
+        self._live = 0
+        self.buffered_audio_ms = 0.0
+        if not self._closed:
+            self._not_empty.clear()
+
+    def queued_by_class(self):
+        """Events waiting for delivery, per class."""
+        queued = {cls: 0 for cls in EVENT_CLASSES}
+        for entry in self._entries:
+            if entry[3]:
+                queued[entry[1]] += 1
+        return queued
+
+    def stats(self):
+        return {
+            "queued": self._live,
+            "buffered_audio_ms": round(self.buffered_audio_ms, 1),
+            "delivered": dict(self.delivered),
+            "dropped": dict(self.dropped),
+            "dropped_audio_ms": round(self.dropped_audio_ms, 1),
+            "purged_audio": self.purged_audio,
+            "purged_audio_ms": round(self.purged_audio_ms, 1),
+        }
@@ -1,5 +1,36 @@
+import base64
 import json
 
+import json_codec
+
+# Base64 never needs JSON escaping, so content made only of these characters can
+# be spliced straight into a pre-encoded event.
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_AUDIO_INPUT_SUFFIX = b'"}}}'
+
+
+def parse_audio_input_message(message):
+  """Cheaply pick an audioInput frame out of a raw WebSocket text message.
+
+  Returns ``(prompt_name, content_name, content)`` or ``None`` when the message
+  is anything else (including wrapped ``body`` payloads), so callers can fall
+  back to the general event path.
+  """
+  if '"audioInput"' not in message:
+    return None
+  try:
+    data = json_codec.loads(message)
+  except ValueError:
+    return None
+  event = data.get("event") if isinstance(data, dict) else None
+  if not isinstance(event, dict) or len(event) != 1:
+    return None
+  audio = event.get("audioInput")
+  if not isinstance(audio, dict):
+    return None
+  return audio.get("promptName"), audio.get("contentName"), audio.get("content")
+
+
 class S2sEvent:
   # Default configuration values
   DEFAULT_INFER_CONFIG = {
@@ -154,6 +185,28 @@ class S2sEvent:
         }
       }
     }
+
+  @staticmethod
+  def audio_input_prefix(prompt_name, content_name):
+    """UTF-8 bytes of an audioInput event up to (and including) the opening quote of its content."""
+    encoded = json.dumps(S2sEvent.audio_input(prompt_name, content_name, ""))
+    return encoded[:-len(_AUDIO_INPUT_SUFFIX)].encode("utf-8")
+
+  @staticmethod
+  def encode_audio_input(prefix, content):
+    """Encode an audioInput event from a cached prefix; ``None`` if content is not plain base64."""
+    try:
+      raw = content.encode("ascii")
+    except UnicodeEncodeError:
+      return None
+    if raw.translate(None, _BASE64_ALPHABET):
+      return None
+    return prefix + raw + _AUDIO_INPUT_SUFFIX
+
+  @staticmethod
+  def encode_audio_input_pcm(prefix, pcm):
+    """Encode an audioInput event from a cached prefix and raw PCM bytes."""
+    return prefix + base64.b64encode(pcm) + _AUDIO_INPUT_SUFFIX
   
   @staticmethod
   def content_start_tool(prompt_name, content_name, tool_use_id):
@@ -1,21 +1,15 @@
 import asyncio
-import json
+import base64
 import os
 import warnings
 import uuid
 import logging
-from decimal import Decimal
-from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient, InvokeModelWithBidirectionalStreamOperationInput
+from aws_sdk_bedrock_runtime.client import InvokeModelWithBidirectionalStreamOperationInput
 from aws_sdk_bedrock_runtime.models import InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart, ValidationException
-from aws_sdk_bedrock_runtime.config import Config
-from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
-import boto3
 from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
 from boto3.dynamodb.conditions import Key
 from datetime import datetime, date, timedelta, time
 from zoneinfo import ZoneInfo
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
 import sys
 from pathlib import Path
 
@@ -23,11 +17,38 @@ from tools.update_open_event_tool import update_open_event_tool
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from s2s_events import S2sEvent
+from output_buffer import OutputBuffer
 from tools.create_event_tool import create_event
 from tools.delete_event_tool import delete_event
 from tools.update_event_tool import update_event
 from tools.read_events_tool import read_events
 from tools.open_event_tool import open_event
+from tools.candidate_lookup import candidate_lookup_for_tool
+from tool_executor import tool_executor as default_tool_executor
+from data_access import (
+    CalendarRepository,
+    create_boto3_client,
+    create_opensearch_client,
+)
+from credentials_provider import credential_provider
+from bedrock_client_registry import bedrock_client_registry as default_client_registry
+from metrics import (
+    AUDIO_INPUT_DROPPED,
+    BEDROCK_EVENTS,
+    BEDROCK_FIRST_EVENT_SECONDS,
+    MEMORY_FLUSH_SECONDS,
+    TIME_TO_FIRST_AUDIO_SECONDS,
+    TOOL_CALLS,
+    TOOL_PERCEIVED_LATENCY_SECONDS,
+    TOOL_SECONDS,
+    TOOL_SPECULATION_LEAD_SECONDS,
+    TOOL_SPECULATIONS,
+    TOOL_TIMEOUT_SECONDS,
+    TOOL_TIMEOUTS,
+)
+from tool_registry import CANCEL, tool_registry as default_tool_registry
+from tracing import end_span, now_ns, span, start_span, traced_client
+import json_codec
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -36,48 +57,126 @@ warnings.filterwarnings("ignore")
 logger = logging.getLogger(__name__)
 
 
-def _json_default(value):
-    if isinstance(value, Decimal):
-        return int(value) if value == value.to_integral_value() else float(value)
-    if isinstance(value, (date, datetime)):
-        return value.isoformat()
-    if isinstance(value, set):
-        return list(value)
-    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+# Uplink audio coalescing: consecutive client chunks are merged into one Bedrock
+# audioInput event of up to this much audio (16 kHz, 16-bit mono PCM) ...
+AUDIO_COALESCE_TARGET_MS = float(os.getenv("CLARITY_AUDIO_COALESCE_TARGET_MS", "64"))
+AUDIO_COALESCE_MAX_BYTES = int(os.getenv("CLARITY_AUDIO_COALESCE_MAX_BYTES", "16000"))
+# ... but a partial batch never waits longer than this for more audio.
+AUDIO_COALESCE_MAX_WAIT_MS = float(os.getenv("CLARITY_AUDIO_COALESCE_MAX_WAIT_MS", "20"))
+INPUT_BYTES_PER_MS = 16000 * 2 / 1000
+# Tools whose read-only lookups (title embedding, OpenSearch candidate search,
+# DynamoDB reads) start when the toolUse arrives rather than at its contentEnd.
+SPECULATIVE_TOOLS = frozenset(
+    name.strip().lower()
+    for name in os.getenv("CLARITY_SPECULATIVE_TOOLS", "update_event,delete_event,open_event").split(",")
+    if name.strip()
+)
+# Slack when predicting the next client chunk from its usual cadence.
+AUDIO_CHUNK_JITTER = 0.002
+
+# Marks an audio-queue item that carries an encoded event instead of audio.
+_QUEUED_EVENT = object()
+# Tool names used as metric labels; anything else the model sends is counted as "other".
+_METRIC_TOOL_NAMES = frozenset(
+    {
+        "getdatetool",
+        "create_event",
+        "delete_event",
+        "read_events",
+        "update_event",
+        "open_event",
+        "update_open_event",
+        "close_event",
+        "end_conversation",
+    }
+)
+
+
+def _audio_byte_length(audio):
+    """PCM byte length of a queued chunk (base64 string or raw bytes)."""
+    if isinstance(audio, str):
+        return len(audio) * 3 // 4
+    return len(audio)
+
+
+def _merge_audio_chunks(chunks):
+    """Join queued chunks into one base64 string or PCM buffer."""
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(isinstance(chunk, str) for chunk in chunks) and all(
+        len(chunk) % 4 == 0 and not chunk.endswith("=") for chunk in chunks[:-1]
+    ):
+        # Unpadded base64 groups concatenate into valid base64.
+        return "".join(chunks)
+    return b"".join(
+        base64.b64decode(chunk) if isinstance(chunk, str) else chunk for chunk in chunks
+    )
+
+class PendingTool:
+    """A ``toolUse`` received from Bedrock whose tool content has not ended yet."""
+
+    __slots__ = ("tool_use_id", "tool_name", "content_id", "tool_use_content", "started_ns")
 
-ddb_client = boto3.client('dynamodb', region_name='us-east-1')
+    def __init__(self, tool_use_content, started_ns=None):
+        self.tool_use_id = tool_use_content["toolUseId"]
+        self.tool_name = tool_use_content["toolName"]
+        self.content_id = tool_use_content.get("contentId")
+        self.tool_use_content = tool_use_content
+        self.started_ns = started_ns
+
+
+# All clients resolve credentials through the shared provider, so they survive token rotation
+aws_session = credential_provider.boto3_session()
+ddb_client = create_boto3_client('dynamodb', region_name='us-east-1', session=aws_session)
 serializer = TypeSerializer()
 deserializer = TypeDeserializer()
-bedrock_client = boto3.client('bedrock-runtime', region_name='us-east-1')
-memory_client = boto3.client('bedrock-agentcore', region_name='us-east-1')
-lambda_client = boto3.client('lambda', region_name='us-east-1')
+bedrock_client = create_boto3_client('bedrock-runtime', region_name='us-east-1', session=aws_session)
+memory_client = create_boto3_client('bedrock-agentcore', region_name='us-east-1', session=aws_session)
+lambda_client = create_boto3_client('lambda', region_name='us-east-1', session=aws_session)
 
 # Initialize OpenSearch client
 os_host = "search-clarity-domain-act5b626lr54k4h722hub6uxhe.us-east-1.es.amazonaws.com"
-credentials = boto3.Session().get_credentials()
-awsauth = AWS4Auth(credentials.access_key, credentials.secret_key, 'us-east-1', 'es', session_token=credentials.token)
-opensearch_client = OpenSearch(
-    hosts = [{'host': os_host, 'port': 443}],
-    http_auth = awsauth,
-    use_ssl = True,
-    verify_certs = True,
-    connection_class = RequestsHttpConnection
-)
+awsauth = credential_provider.aws4auth('us-east-1', 'es')
+opensearch_client = create_opensearch_client(os_host, awsauth)
 
 
 class S2sSessionManager:
     """Manages bidirectional streaming with AWS Bedrock using asyncio"""
     
-    def __init__(self, region, model_id, user_id, timezone):
+    def __init__(
+        self,
+        region,
+        model_id,
+        user_id,
+        timezone,
+        tool_executor=None,
+        stream_pool=None,
+        client_registry=None,
+        tool_registry=None,
+    ):
         """Initialize the stream manager."""
         self.model_id = model_id
         self.region = region
         self.user_id = user_id
         self.timezone = timezone
+        # Blocking tool I/O runs here so it never stalls the realtime audio path
+        self.tool_executor = tool_executor or default_tool_executor
+        # Optional BedrockStreamPool that hands out pre-opened streams
+        self.stream_pool = stream_pool
+        # Process-wide Bedrock clients, shared so sessions reuse one connection
+        self.client_registry = client_registry or default_client_registry
+        # Per-tool latency budgets and what to do when one runs out
+        self.tool_registry = tool_registry or default_tool_registry
+        self._repository = None
+        self.stream_from_pool = False
+        self._stream_requested_at = None
+        self.time_to_first_event = None
+        self.time_to_first_audio = None
         
         # Audio and output queues with size limits to prevent memory issues
         self.audio_input_queue = asyncio.Queue(maxsize=100)  # Limit to 100 audio chunks (~2-3 seconds of audio)
-        self.output_queue = asyncio.Queue(maxsize=200)  # Larger output queue for responses
+        # Control/text events are always delivered; audio is capped by duration
+        self.output_queue = OutputBuffer()
         
         self.response_task = None
         self.audio_task = None
@@ -87,25 +186,53 @@ class S2sSessionManager:
         self._closing = False
         self._session_end_sent = False
         self._send_lock = asyncio.Lock()
+        self._audio_input_prefix_key = None
+        self._audio_input_prefix = None
+        self.audio_coalesce_target_bytes = int(AUDIO_COALESCE_TARGET_MS * INPUT_BYTES_PER_MS)
+        self.audio_coalesce_max_bytes = AUDIO_COALESCE_MAX_BYTES
+        self.audio_coalesce_max_wait = AUDIO_COALESCE_MAX_WAIT_MS / 1000
+        self.audio_chunks_received = 0
+        self.audio_events_sent = 0
+        self._last_audio_chunk_at = None
+        self._audio_chunk_interval = None  # Smoothed gap between client chunks (seconds)
         
         # Session information
         self.prompt_name = None  # Will be set from frontend
         self.content_name = None  # Will be set from frontend
         self.audio_content_name = None  # Will be set from frontend
-        self.toolUseContent = ""
-        self.toolUseId = ""
-        self.toolName = ""
+        # toolUse events waiting for their contentEnd, by toolUseId; several can be
+        # pending at once when the model calls tools in parallel.
+        self.pending_tools = {}
+        # Speculative lookups for pending tools, by toolUseId: (CandidateLookup, task)
+        self.speculative_tools = SPECULATIVE_TOOLS
+        self._speculations = {}
         self.end_conversation_requested = False
+        self._end_conversation_emitted = False
+        self.upstream_failed = False
+        self._assistant_audio_content_id = None  # Assistant audio currently being streamed
+        self._assistant_audio_open = False  # Between the assistant audio contentStart and contentEnd
+        self._user_audio_content_name = None  # Set between the user's audio contentStart and contentEnd
+        self._last_barge_in_content_id = None
+        self.barge_in_count = 0
+        self.barge_in_discarded_audio_ms = 0.0  # Stale audio never sent to the client
+        self._turn_span = None  # Open "voice.turn" span: end of user audio -> first audioOutput
+        self._turn_parent = None  # Most recent turn span, parent of tool spans
+        self._turn_started_at = None
+        self._user_text_content_ids = set()
         self.content_generation_stage_by_id = {}
         self.conversation_history = []  # To store conversation history for context in tools
         self._conversation_history_flushed = False
         self._memory_client_token = str(uuid.uuid4())
+        self._deferred_memory_event = None  # Memory write postponed by close(flush_memory=False)
         
         self.open_event_id = None  # To track open event for calendar tools
         self.open_event_pre_last_update = None  # Stores previous open event snapshot for one-step undo
         
         # Track active tool processing tasks
         self.tool_processing_tasks = set()
+        # Each toolResult goes out as contentStart/toolResult/contentEnd; concurrent
+        # tools take turns so their events are never interleaved.
+        self._tool_result_lock = asyncio.Lock()
 
     async def _emit_fatal_stream_error(self, message, code="BEDROCK_STREAM_FATAL"):
         """Emit a terminal stream error for websocket forwarding logic."""
@@ -126,40 +253,54 @@ class S2sSessionManager:
 
     def _initialize_client(self):
         """
-        Initialize the Bedrock client using EnvironmentCredentialsResolver.
-        
-        Credentials are managed by server.py which either:
+        Take the shared Bedrock client for this region and model.
+
+        Clients come from the process-wide registry, which recreates them when the
+        shared credential provider rotates credentials. The provider either:
         - Uses existing environment variables (local mode)
-        - Fetches and refreshes credentials from IMDS (EC2 mode)
+        - Fetches and refreshes credentials from IMDS ahead of expiry (EC2 mode)
         """
-        logger.info("Initializing Bedrock client with EnvironmentCredentialsResolver")
-        
-        config = Config(
-            endpoint_uri=f"https://bedrock-runtime.{self.region}.amazonaws.com",
-            region=self.region,
-            aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
-        )
-        self.bedrock_client = BedrockRuntimeClient(config=config)
+        self.bedrock_client = self.client_registry.get(self.region, self.model_id)
         logger.info("Bedrock client initialized successfully")
 
 
     async def initialize_stream(self):
         """Initialize the bidirectional stream with Bedrock."""
-        try:
-            if not self.bedrock_client:
-                self._initialize_client()
-        except Exception:
-            self.is_active = False
-            logger.error("Failed to initialize Bedrock client")
-            raise
+        loop = asyncio.get_running_loop()
+        self._stream_requested_at = loop.time()
+        self.time_to_first_event = None
+        self.time_to_first_audio = None
+
+        pooled = None
+        if self.stream_pool is not None:
+            pooled = await self.stream_pool.acquire(self.region, self.model_id)
+        self.stream_from_pool = pooled is not None
+
+        if pooled is None:
+            try:
+                if not self.bedrock_client:
+                    self._initialize_client()
+            except Exception:
+                self.is_active = False
+                logger.error("Failed to initialize Bedrock client")
+                raise
 
         try:
-            # Initialize the stream
-            self.stream = await self.bedrock_client.invoke_model_with_bidirectional_stream(
-                InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
-            )
+            if pooled is not None:
+                # Handshake already done by the pool; nothing on the critical path
+                self.bedrock_client = pooled.client
+                self.stream = pooled.stream
+            else:
+                # Initialize the stream
+                self.stream = await self.bedrock_client.invoke_model_with_bidirectional_stream(
+                    InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
+                )
             self.is_active = True
             self._session_end_sent = False
+            self.upstream_failed = False
+            self._end_conversation_emitted = False
+            if self.output_queue.closed:
+                self.output_queue = OutputBuffer()
             
             # Start listening for responses
             self.response_task = asyncio.create_task(self._process_responses())
@@ -167,29 +308,113 @@ class S2sSessionManager:
             # Start processing audio input
             self.audio_task = asyncio.create_task(self._process_audio_input())
             
-            # Wait a bit to ensure everything is set up
-            await asyncio.sleep(0.1)
+            if pooled is None:
+                # Wait a bit to ensure everything is set up
+                await asyncio.sleep(0.1)
             
-            logger.info("Stream initialized successfully")
+            logger.info("Stream initialized successfully (pooled=%s)", self.stream_from_pool)
             return self
         except Exception:
             self.is_active = False
             logger.error("Failed to initialize stream.")
             raise
+
+    def _record_first_audio(self):
+        """Record time from stream request to the first audioOutput event."""
+        if self.time_to_first_audio is not None or self._stream_requested_at is None:
+            return
+        self.time_to_first_audio = asyncio.get_running_loop().time() - self._stream_requested_at
+        logger.info(
+            "Time to first audio: %.0f ms (%s stream)",
+            self.time_to_first_audio * 1000, 'pooled' if self.stream_from_pool else 'fresh'
+        )
+        if self.stream_pool is not None:
+            self.stream_pool.record_time_to_first_audio(self.stream_from_pool, self.time_to_first_audio)
+        TIME_TO_FIRST_AUDIO_SECONDS.labels(str(self.stream_from_pool).lower()).observe(self.time_to_first_audio)
+
+    def _start_turn(self, trigger):
+        """Open the turn span when the user stops speaking (first signal wins)."""
+        if self._turn_span is not None:
+            return
+        self._turn_span = start_span(
+            "voice.turn",
+            {"clarity.turn_trigger": trigger, "clarity.stream_pooled": self.stream_from_pool},
+        )
+        self._turn_parent = self._turn_span
+        self._turn_started_at = asyncio.get_running_loop().time()
+
+    def _end_turn(self, completed=True):
+        """Close the turn span at the model's first audioOutput (or on teardown)."""
+        if self._turn_span is None:
+            return
+        attributes = {"clarity.turn_completed": completed}
+        if completed:
+            attributes["clarity.time_to_first_audio_ms"] = round(
+                (asyncio.get_running_loop().time() - self._turn_started_at) * 1000, 1
+            )
+        end_span(self._turn_span, attributes)
+        self._turn_span = None
+
+    def _record_first_event(self):
+        """Record Bedrock first-byte latency: stream request to the first response event."""
+        if self.time_to_first_event is not None or self._stream_requested_at is None:
+            return
+        self.time_to_first_event = asyncio.get_running_loop().time() - self._stream_requested_at
+        BEDROCK_FIRST_EVENT_SECONDS.labels(str(self.stream_from_pool).lower()).observe(self.time_to_first_event)
     
     async def send_raw_event(self, event_data):
         """Send a raw event to the Bedrock stream."""
+        try:
+            event = event_data.get("event", {})
+            event_name = next(iter(event.keys()), None)
+            payload = json_codec.dumps_bytes(event_data)
+        except Exception:
+            logger.error("Error encoding event for Bedrock")
+            return
+
+        if event_name == "contentStart":
+            content_start = event["contentStart"]
+            if content_start.get("type") == "AUDIO" and content_start.get("role", "USER") == "USER":
+                self._user_audio_content_name = content_start.get("contentName")
+        elif event_name == "contentEnd" and event["contentEnd"].get("contentName") == self._user_audio_content_name:
+            self._user_audio_content_name = None
+
+        ends_user_audio = (
+            event_name == "contentEnd"
+            and self.audio_content_name
+            and event.get("contentEnd", {}).get("contentName") == self.audio_content_name
+        )
+        if ends_user_audio:
+            self._start_turn("client_audio_end")
+
+        # Ending the audio content must not overtake audio still being coalesced,
+        # so it goes through the audio queue and flushes the pending batch. Waiting
+        # until it is sent keeps the caller's next event (promptEnd, sessionEnd)
+        # from overtaking it in turn.
+        if (
+            ends_user_audio
+            and self.is_active
+            and self.audio_task is not None
+            and not self.audio_task.done()
+        ):
+            sent = asyncio.get_running_loop().create_future()
+            await self.audio_input_queue.put((_QUEUED_EVENT, event_name, (payload, sent)))
+            await asyncio.wait({sent, self.audio_task}, return_when=asyncio.FIRST_COMPLETED)
+            if sent.done():
+                return
+            # The audio task stopped before reaching it.
+        await self.send_encoded_event(event_name, payload)
+
+    async def send_encoded_event(self, event_name, payload):
+        """Send an already JSON-encoded event (UTF-8 bytes) to the Bedrock stream."""
         try:
             if not self.stream or not self.is_active:
                 logger.warning("Stream not initialized or closed")
                 return
 
-            event = event_data.get("event", {})
-            event_name = next(iter(event.keys()), None)
-
             # Once sessionEnd is sent, drop any non-sessionEnd events.
             if self._session_end_sent and event_name != "sessionEnd":
-                logger.debug(f"Dropping {event_name} after sessionEnd")
+                logger.debug("Dropping %s after sessionEnd", event_name)
                 return
             
             async with self._send_lock:
@@ -198,11 +423,11 @@ class S2sSessionManager:
                 if self._session_end_sent and event_name != "sessionEnd":
                     return
 
-                event_json = json.dumps(event_data)
                 stream_event = InvokeModelWithBidirectionalStreamInputChunk(
-                    value=BidirectionalInputPayloadPart(bytes_=event_json.encode('utf-8'))
+                    value=BidirectionalInputPayloadPart(bytes_=payload)
                 )
                 await self.stream.input_stream.send(stream_event)
+                BEDROCK_EVENTS.labels("sent", event_name).inc()
 
                 # Mark session as ending immediately to stop any further queued input.
                 if event_name == "sessionEnd":
@@ -210,9 +435,11 @@ class S2sSessionManager:
                     self.is_active = False
                     while not self.audio_input_queue.empty():
                         try:
-                            self.audio_input_queue.get_nowait()
+                            item = self.audio_input_queue.get_nowait()
                         except asyncio.QueueEmpty:
                             break
+                        if item[0] is _QUEUED_EVENT and not item[2][1].done():
+                            item[2][1].set_result(None)
 
             # Close session
             if event_name == "sessionEnd":
@@ -220,58 +447,148 @@ class S2sSessionManager:
 
         except ValidationException as e:
             if self._closing or self._session_end_sent:
-                logger.info(f"Ignoring Bedrock ValidationException during shutdown: {e}")
+                logger.info("Ignoring Bedrock ValidationException during shutdown: %s", e)
                 return
-            logger.error(f"Bedrock validation error while sending event: {e}")
+            logger.error("Bedrock validation error while sending event: %s", e)
         except Exception:
             logger.error("Error sending event to Bedrock")
             # Don't close the stream on send errors, let Bedrock handle it
             # The response processing loop will detect if the stream is broken
+
+    def _encode_audio_input(self, prompt_name, content_name, audio):
+        """Encode an audioInput event, reusing the JSON prefix for the current audio content.
+
+        ``audio`` is either a base64 string (JSON uplink) or raw PCM bytes (binary
+        uplink), which are base64-encoded here, at the Bedrock edge.
+        """
+        key = (prompt_name, content_name)
+        if self._audio_input_prefix_key != key:
+            self._audio_input_prefix = S2sEvent.audio_input_prefix(prompt_name, content_name)
+            self._audio_input_prefix_key = key
+        if not isinstance(audio, str):
+            return S2sEvent.encode_audio_input_pcm(self._audio_input_prefix, audio)
+        audio_base64 = audio
+        payload = S2sEvent.encode_audio_input(self._audio_input_prefix, audio_base64)
+        if payload is None:
+            # Not plain base64; let the JSON encoder take care of escaping.
+            payload = json_codec.dumps_bytes(S2sEvent.audio_input(prompt_name, content_name, audio_base64))
+        return payload
     
     async def _process_audio_input(self):
-        """Process audio input from the queue and send to Bedrock."""
+        """Process audio input from the queue and send to Bedrock.
+
+        Consecutive chunks for the same audio content are coalesced into one
+        audioInput event of up to ``audio_coalesce_target_bytes`` (never more than
+        ``audio_coalesce_max_bytes``). A partial batch waits at most
+        ``audio_coalesce_max_wait`` seconds for more audio, and only when the client's
+        chunk cadence says another chunk should arrive in that window. An audio
+        contentEnd queued behind it flushes it immediately, so end of speech is not
+        delayed.
+        """
+        loop = asyncio.get_running_loop()
+        pending = None
         while self.is_active:
             try:
-                # Get audio data from the queue
-                data = await self.audio_input_queue.get()
-                
-                # Extract data from the queue item
-                prompt_name = data.get('prompt_name')
-                content_name = data.get('content_name')
-                audio_bytes = data.get('audio_bytes')
+                # Queue items are (prompt_name, content_name, audio) tuples
+                if pending is not None:
+                    item, pending = pending, None
+                else:
+                    item = await self.audio_input_queue.get()
+                prompt_name, content_name, audio = item
+
+                if prompt_name is _QUEUED_EVENT:
+                    payload, sent = audio
+                    try:
+                        await self.send_encoded_event(content_name, payload)
+                    finally:
+                        if not sent.done():
+                            sent.set_result(None)
+                    continue
                 
-                if not audio_bytes or not prompt_name or not content_name:
+                if not audio or not prompt_name or not content_name:
                     logger.warning("Missing required audio data properties")
                     continue
 
                 if self._session_end_sent:
                     break
 
-                # Create the audio input event
-                audio_event = S2sEvent.audio_input(prompt_name, content_name, audio_bytes.decode('utf-8') if isinstance(audio_bytes, bytes) else audio_bytes)
-                
-                # Send the event
-                await self.send_raw_event(audio_event)
+                chunks = [audio]
+                size = _audio_byte_length(audio)
+                deadline = loop.time() + self.audio_coalesce_max_wait
+                while size < self.audio_coalesce_target_bytes:
+                    try:
+                        item = self.audio_input_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0 or not self._next_audio_chunk_expected_by(deadline):
+                            break
+                        try:
+                            item = await asyncio.wait_for(self.audio_input_queue.get(), timeout=remaining)
+                        except asyncio.TimeoutError:
+                            break
+                    next_prompt, next_content, next_audio = item
+                    if (
+                        (next_prompt, next_content) != (prompt_name, content_name)
+                        or not next_audio
+                        or size + _audio_byte_length(next_audio) > self.audio_coalesce_max_bytes
+                    ):
+                        pending = item
+                        break
+                    chunks.append(next_audio)
+                    size += _audio_byte_length(next_audio)
+
+                self.audio_chunks_received += len(chunks)
+                self.audio_events_sent += 1
+
+                # Send the pre-encoded audio input event
+                await self.send_encoded_event(
+                    "audioInput",
+                    self._encode_audio_input(prompt_name, content_name, _merge_audio_chunks(chunks)),
+                )
                 
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.error("Error processing audio.")
+
+    def _next_audio_chunk_expected_by(self, deadline):
+        """Whether the client's chunk cadence makes another chunk likely before ``deadline``."""
+        if self._audio_chunk_interval is None or self._last_audio_chunk_at is None:
+            return True
+        return self._last_audio_chunk_at + self._audio_chunk_interval <= deadline + AUDIO_CHUNK_JITTER
+
+    def audio_input_stats(self):
+        """Client audio chunks received vs audioInput events sent to Bedrock."""
+        chunks = self.audio_chunks_received
+        events = self.audio_events_sent
+        return {
+            "chunks_received": chunks,
+            "events_sent": events,
+            "event_reduction": round(1 - events / chunks, 4) if chunks else 0.0,
+        }
     
     def add_audio_chunk(self, prompt_name, content_name, audio_data):
-        """Add an audio chunk to the queue."""
-        # The audio_data is already a base64 string from the frontend
+        """Add an audio chunk to the queue.
+
+        ``audio_data`` is a base64 string from a JSON ``audioInput`` event or raw
+        PCM bytes from a binary audio frame.
+        """
+        now = asyncio.get_running_loop().time()
+        if self._last_audio_chunk_at is not None:
+            gap = now - self._last_audio_chunk_at
+            if self._audio_chunk_interval is None:
+                self._audio_chunk_interval = gap
+            else:
+                self._audio_chunk_interval = 0.8 * self._audio_chunk_interval + 0.2 * gap
+        self._last_audio_chunk_at = now
+
         try:
-            self.audio_input_queue.put_nowait({
-                'prompt_name': prompt_name,
-                'content_name': content_name,
-                'audio_bytes': audio_data
-            })
+            self.audio_input_queue.put_nowait((prompt_name, content_name, audio_data))
         except asyncio.QueueFull:
             # Queue is full - drop this chunk to prevent backpressure
             # This is acceptable for real-time audio streaming
             logger.warning("Audio input queue full, dropping audio chunk to prevent backpressure")
-            pass
+            AUDIO_INPUT_DROPPED.inc()
     
     async def _process_responses(self):
         """Process incoming responses from Bedrock."""
@@ -295,25 +612,42 @@ class S2sSessionManager:
                     continue
                 
                 if result.value and result.value.bytes_:
-                    response_data = result.value.bytes_.decode('utf-8')
-                    logger.debug(f"Received event: {response_data}")
+                    response_data = result.value.bytes_
+                    logger.debug("Received event: %s", response_data)
                     
-                    json_data = json.loads(response_data)
+                    json_data = json_codec.loads(response_data)
                     json_data["timestamp"] = int(datetime.now().timestamp() * 1000)  # Milliseconds since epoch
                     
                     event_name = None
+                    if self.time_to_first_event is None:
+                        self._record_first_event()
                     if 'event' in json_data:
                         event_name = list(json_data["event"].keys())[0]
                         event_data = json_data["event"][event_name]
+                        BEDROCK_EVENTS.labels("received", event_name).inc()
                         
+                        if event_name == "audioOutput":
+                            if self.time_to_first_audio is None:
+                                self._record_first_audio()
+                            if self._turn_span is not None:
+                                self._end_turn()
+
+                        if self._is_interruption(event_name, event_data):
+                            self._handle_barge_in(event_name, event_data)
+
                         if event_name == "contentStart":
+                            if event_data.get("type") == "AUDIO" and event_data.get("role") == "ASSISTANT":
+                                self._assistant_audio_content_id = event_data.get("contentId")
+                                self._assistant_audio_open = True
+                            elif event_data.get("type") == "TEXT" and event_data.get("role") == "USER":
+                                self._user_text_content_ids.add(event_data.get("contentId"))
                             content_id = event_data.get("contentId")
                             if content_id:
                                 additional_model_fields = event_data.get("additionalModelFields")
                                 if isinstance(additional_model_fields, str):
                                     try:
-                                        additional_model_fields = json.loads(additional_model_fields)
-                                    except json.JSONDecodeError:
+                                        additional_model_fields = json_codec.loads(additional_model_fields)
+                                    except json_codec.JSONDecodeError:
                                         additional_model_fields = {}
                                 if not isinstance(additional_model_fields, dict):
                                     additional_model_fields = {}
@@ -325,7 +659,18 @@ class S2sSessionManager:
                             content_id = content_end_data.get("contentId")
                             if content_id:
                                 self.content_generation_stage_by_id.pop(content_id, None)
-                            logger.debug(f"Received contentEnd: type={content_end_data.get('type')}, stopReason={content_end_data.get('stopReason')}, role={content_end_data.get('role', 'N/A')}")
+                                if content_id == self._assistant_audio_content_id:
+                                    self._assistant_audio_open = False
+                                if content_id in self._user_text_content_ids:
+                                    # The model has finished transcribing the user's turn.
+                                    self._user_text_content_ids.discard(content_id)
+                                    self._start_turn("user_transcript_end")
+                            logger.debug(
+                                "Received contentEnd: type=%s, stopReason=%s, role=%s",
+                                content_end_data.get('type'),
+                                content_end_data.get('stopReason'),
+                                content_end_data.get('role', 'N/A'),
+                            )
                         
                         if event_name == "textOutput" and self.content_generation_stage_by_id.get(event_data.get("contentId")) == "FINAL":
                             print(f"👉 Transcription: ({event_data.get('role', 'N/A')}) {event_data.get('content', '')}", flush=True)
@@ -336,57 +681,46 @@ class S2sSessionManager:
                         
                         # Handle tool use detection
                         if event_name == 'toolUse':
-                            self.toolUseContent = event_data
-                            self.toolName = event_data['toolName']
-                            self.toolUseId = event_data['toolUseId']
-                            logger.info(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}")
+                            pending = PendingTool(event_data, now_ns())
+                            self.pending_tools[pending.tool_use_id] = pending
+                            logger.info("Tool use detected: %s, ID: %s", pending.tool_name, pending.tool_use_id)
+                            self._start_speculation(pending)
                         # Process tool use when content ends
                         elif event_name == 'contentEnd' and event_data.get('type') == 'TOOL':
                             prompt_name = event_data.get("promptName")
-                            logger.debug("Starting tool processing in background")
-                            # Process tool in background task to avoid blocking
-                            task = asyncio.create_task(
-                                self._handle_tool_processing(prompt_name, self.toolName, self.toolUseContent, self.toolUseId)
-                            )
-                            self.tool_processing_tasks.add(task)
-                            task.add_done_callback(self.tool_processing_tasks.discard)
+                            for pending in self._take_ended_tools(event_data.get("contentId")):
+                                self._start_tool_task(prompt_name, pending)
                     
-                    # Put the response in the output queue for forwarding to the frontend
-                    try:
-                        # Use put_nowait to avoid blocking, but handle queue full gracefully
-                        self.output_queue.put_nowait(json_data)
-                    except asyncio.QueueFull:
-                        # Queue is full - log warning but don't break the stream
-                        # This can happen during high-throughput audio responses
-                        logger.warning("Output queue full, dropping response to prevent backpressure")
-                        # Continue processing instead of breaking the stream
+                    # Put the response in the output queue for forwarding to the frontend.
+                    # Never blocks: a slow client only costs its oldest buffered audio.
+                    self.output_queue.put_nowait(json_data)
 
             except asyncio.CancelledError:
                 logger.debug("Response processing task cancelled")
                 break
             except ValidationException as e:
                 if self._closing or self._session_end_sent:
-                    logger.info(f"ValidationException during shutdown, treating as expected: {e}")
+                    logger.info("ValidationException during shutdown, treating as expected: %s", e)
                     break
-                logger.error(f"Bedrock validation error: {e}")
+                logger.error("Bedrock validation error: %s", e)
                 await self.output_queue.put({
                     "event": {"error": {"message": f"Validation error: {e}"}}
                 })
                 continue
             except AttributeError as e:
                 if self._closing or self._session_end_sent:
-                    logger.info(f"Ignoring response AttributeError during shutdown: {e}")
+                    logger.info("Ignoring response AttributeError during shutdown: %s", e)
                     break
-                logger.error(f"Unexpected response attribute error: {e}", exc_info=True)
+                logger.error("Unexpected response attribute error: %s", e, exc_info=True)
                 await self._emit_fatal_stream_error(
                     f"Unexpected response attribute error: {e}",
                     code="BEDROCK_STREAM_ATTRIBUTE_ERROR",
                 )
                 break
 
-            except json.JSONDecodeError as ex:
-                logger.error(f"JSON decode error in _process_responses: {ex}")
-                await self.output_queue.put({"raw_data": response_data})
+            except json_codec.JSONDecodeError as ex:
+                logger.error("JSON decode error in _process_responses: %s", ex)
+                await self.output_queue.put({"raw_data": response_data.decode("utf-8", errors="replace")})
                 # Don't break on JSON errors, continue processing
                 continue
             except StopAsyncIteration:
@@ -397,14 +731,14 @@ class S2sSessionManager:
                 # Handle ValidationException and other errors
                 error_str = str(e)
                 if "ValidationException" in error_str:
-                    logger.error(f"Bedrock validation error: {error_str}")
+                    logger.error("Bedrock validation error: %s", error_str)
                     # Send error to client but don't break the stream
                     await self.output_queue.put({
                         "event": {"error": {"message": f"Validation error: {error_str}"}}
                     })
                     continue
                 else:
-                    logger.error(f"Error receiving response from Bedrock: {e}", exc_info=True)
+                    logger.error("Error receiving response from Bedrock: %s", e, exc_info=True)
                     await self._emit_fatal_stream_error(
                         f"Stream error from Bedrock: {error_str}",
                     )
@@ -412,37 +746,229 @@ class S2sSessionManager:
                     break
 
         logger.info("Bedrock response processing loop ended")
+        if not self._closing and not self._session_end_sent:
+            # Upstream went away without a sessionEnd from us
+            self.upstream_failed = True
         self.is_active = False
         if not self._closing:
             await self.close()
 
-    async def _handle_tool_processing(self, prompt_name, tool_name, tool_use_content, tool_use_id):
+    @staticmethod
+    def _is_interruption(event_name, event_data):
+        """Whether a Bedrock output event signals that the user barged in."""
+        if event_name == "contentEnd":
+            return event_data.get("stopReason") == "INTERRUPTED"
+        if event_name == "textOutput":
+            content = event_data.get("content")
+            if not isinstance(content, str) or '"interrupted"' not in content:
+                return False
+            try:
+                return json_codec.loads(content).get("interrupted") is True
+            except (ValueError, AttributeError):
+                return False
+        return False
+
+    def _handle_barge_in(self, event_name, event_data):
+        """Drop queued assistant audio the user talked over and tell the client to flush playback."""
+        if event_name == "contentEnd" and event_data.get("type") == "AUDIO":
+            content_id = event_data.get("contentId")
+        else:
+            content_id = self._assistant_audio_content_id
+        discarded_ms = self.output_queue.purge_audio(content_id)
+        self.barge_in_discarded_audio_ms += discarded_ms
+
+        # The textOutput signal and the INTERRUPTED contentEnd refer to the same
+        # interruption; only tell the client once.
+        if content_id is not None and content_id == self._last_barge_in_content_id:
+            return
+        self._last_barge_in_content_id = content_id
+        self.barge_in_count += 1
+        logger.info("Barge-in detected; discarded %.0f ms of queued audio", discarded_ms)
+        self.output_queue.put_nowait(
+            {
+                "type": "barge_in",
+                "contentId": content_id,
+                "discardedAudioMs": round(discarded_ms, 1),
+                "timestamp": int(datetime.now().timestamp() * 1000),
+            }
+        )
+
+    def _take_ended_tools(self, content_id):
+        """Remove and return the pending tools finished by a TOOL ``contentEnd``.
+
+        The tool whose ``contentId`` matches is returned; when none does (or Bedrock
+        left the ids out) every pending tool has been fully received, so all are.
+        """
+        ended = [
+            pending for pending in self.pending_tools.values()
+            if content_id is not None and pending.content_id == content_id
+        ]
+        if not ended:
+            ended = list(self.pending_tools.values())
+        for pending in ended:
+            del self.pending_tools[pending.tool_use_id]
+        return ended
+
+    def _start_speculation(self, pending):
+        """Start a tool's read-only lookups while Bedrock is still finishing the tool content.
+
+        Only the lookups run early; the tool itself, and every write it makes, still
+        waits for the TOOL ``contentEnd`` and reuses whatever has finished by then.
+        """
+        tool_name = (pending.tool_name or "").lower()
+        if tool_name not in self.speculative_tools or pending.tool_use_id in self._speculations:
+            return
+        repo = self._calendar_repository()
+        lookup = candidate_lookup_for_tool(
+            tool_name,
+            repo,
+            self.user_id,
+            pending.tool_use_content.get("content"),
+            self.timezone,
+        )
+        if lookup is None:
+            return
+        task = asyncio.create_task(self._speculate(repo, lookup, tool_name))
+        self._speculations[pending.tool_use_id] = (tool_name, lookup, task, asyncio.get_running_loop().time())
+
+    async def _speculate(self, repo, lookup, tool_name):
+        """Embed the title, run both candidate searches concurrently, then read an unambiguous match."""
+        with span("tool.speculate", {"clarity.tool_name": tool_name}, parent=self._turn_parent):
+            try:
+                await lookup.query_vector()
+                await repo.gather(lookup.habits(), lookup.events())
+                await lookup.prefetch_items()
+                return True
+            except Exception as e:
+                # Whatever did not finish is simply redone by the tool.
+                logger.info("Speculative lookup for %s failed: %s", tool_name, e)
+                return False
+
+    async def _take_speculation(self, tool_use_id):
+        """The speculative lookup started for ``tool_use_id``, once its in-flight reads settle."""
+        entry = self._speculations.pop(tool_use_id, None)
+        if entry is None:
+            return None
+        tool_name, lookup, task, started = entry
+        tool_label = tool_name if tool_name in _METRIC_TOOL_NAMES else "other"
+        TOOL_SPECULATION_LEAD_SECONDS.labels(tool_label).observe(asyncio.get_running_loop().time() - started)
+        # Already in flight, so waiting for it is never slower than starting over.
+        completed = await task
+        TOOL_SPECULATIONS.labels(tool_label, "used" if completed else "failed").inc()
+        return lookup
+
+    def _discard_speculations(self):
+        """Cancel lookups for tools that will never run (the session is closing)."""
+        for tool_name, lookup, task, started in self._speculations.values():
+            task.cancel()
+            TOOL_SPECULATIONS.labels(tool_name if tool_name in _METRIC_TOOL_NAMES else "other", "discarded").inc()
+        self._speculations.clear()
+
+    def _start_tool_task(self, prompt_name, pending):
+        """Run one tool call in the background; results are sent in completion order."""
+        logger.debug("Starting tool processing in background for %s", pending.tool_use_id)
+        task = asyncio.create_task(
+            self._handle_tool_processing(
+                prompt_name,
+                pending.tool_name,
+                pending.tool_use_content,
+                pending.tool_use_id,
+                tool_use_started_ns=pending.started_ns,
+            )
+        )
+        self.tool_processing_tasks.add(task)
+        task.add_done_callback(self.tool_processing_tasks.discard)
+        return task
+
+    async def _handle_tool_processing(self, prompt_name, tool_name, tool_use_content, tool_use_id, tool_use_started_ns=None):
         """Handle tool processing in background without blocking event processing"""
+        tool_label = tool_name.lower() if tool_name and tool_name.lower() in _METRIC_TOOL_NAMES else "other"
         try:
-            logger.info(f"[Tool Processing] Starting: {tool_name} with ID: {tool_use_id}")
-            toolResult = await self.processToolUse(tool_name, tool_use_content)
-            logger.info(f"[Tool Processing] Completed: {tool_name}")
-                
+            # toolUse -> toolResult; calls the tool makes to AWS show up as child spans.
+            with span(
+                f"tool.{tool_label}",
+                {"clarity.tool_name": tool_name, "clarity.tool_use_id": tool_use_id},
+                parent=self._turn_parent,
+                start_time=tool_use_started_ns,
+            ):
+                logger.info("[Tool Processing] Starting: %s with ID: %s", tool_name, tool_use_id)
+                spec = self.tool_registry.get(tool_name)
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                waited_before = (now_ns() - tool_use_started_ns) / 1e9 if tool_use_started_ns else 0.0
+                work = asyncio.ensure_future(self.processToolUse(tool_name, tool_use_content))
+                first_response = None
+                try:
+                    if spec.progress_prompt_due():
+                        await asyncio.wait({work}, timeout=spec.progress_after_seconds)
+                        if not work.done():
+                            first_response = "progress"
+                            self._observe_perceived_latency(tool_label, first_response, waited_before + loop.time() - started)
+                            await self._send_progress_prompt(prompt_name, spec)
+                    remaining = spec.budget_seconds - (loop.time() - started)
+                    toolResult = await asyncio.wait_for(asyncio.shield(work), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "[Tool Processing] %s exceeded its %.1fs budget; sending a fallback result (%s)",
+                        tool_name, spec.budget_seconds, spec.on_timeout
+                    )
+                    TOOL_TIMEOUTS.labels(tool_label, spec.on_timeout).inc()
+                    if first_response is None:
+                        first_response = "timeout"
+                        self._observe_perceived_latency(tool_label, first_response, waited_before + loop.time() - started)
+                    if spec.on_timeout == CANCEL:
+                        # Stops waiting only: a boto3/OpenSearch call already on an executor
+                        # thread runs to completion there and holds its slot until then.
+                        work.cancel()
+                        TOOL_TIMEOUT_SECONDS.labels(tool_label).observe(loop.time() - started)
+                    await self._send_tool_result(prompt_name, tool_use_id, spec.timeout_result())
+                    if spec.on_timeout == CANCEL:
+                        return
+                    # The model has moved on; report the real outcome once it lands.
+                    toolResult = await work
+                    TOOL_TIMEOUT_SECONDS.labels(tool_label).observe(loop.time() - started)
+                    logger.info("[Tool Processing] Late result for %s after %.1fs", tool_name, loop.time() - started)
+                    await self._send_late_tool_result(prompt_name, tool_name, toolResult)
+                else:
+                    logger.info("[Tool Processing] Completed: %s", tool_name)
+                    if first_response is None:
+                        self._observe_perceived_latency(tool_label, "result", waited_before + loop.time() - started)
+                    await self._send_tool_result(prompt_name, tool_use_id, toolResult)
+                finally:
+                    # No-op once the work is done; stops it if this task is cancelled (session close).
+                    work.cancel()
+
+            if tool_name.lower() == "end_conversation" and self.end_conversation_requested:
+                await self._end_bedrock_conversation(prompt_name)
+                # Normally already emitted by close(); covers a sessionEnd that failed to send.
+                self._emit_end_conversation()
+            
+        except Exception as e:
+            logger.error("Error in tool processing: %s", e, exc_info=True)
+
+    async def _send_tool_result(self, prompt_name, tool_use_id, toolResult):
+        """Send one tool result to Bedrock (and the client) as a contentStart/toolResult/contentEnd triple."""
+        if isinstance(toolResult, str):
+            content_json_string = toolResult
+        else:
+            content_json_string = json_codec.dumps(toolResult)
+
+        async with self._tool_result_lock:
             # Send tool start event
             toolContent = str(uuid.uuid4())
             tool_start_event = S2sEvent.content_start_tool(prompt_name, toolContent, tool_use_id)
             await self.send_raw_event(tool_start_event)
-            
+
             # Also send tool start event to WebSocket client
             tool_start_event_copy = tool_start_event.copy()
             tool_start_event_copy["timestamp"] = int(datetime.now().timestamp() * 1000)
             await self.output_queue.put(tool_start_event_copy)
-            
-            # Send tool result event
-            if isinstance(toolResult, str):
-                content_json_string = toolResult
-            else:
-                content_json_string = json.dumps(toolResult, default=_json_default)
 
+            # Send tool result event
             tool_result_event = S2sEvent.text_input_tool(prompt_name, toolContent, content_json_string)
-            logger.debug(f"Tool result: {tool_result_event}")
+            logger.debug("Tool result: %s", tool_result_event)
             await self.send_raw_event(tool_result_event)
-            
+
             # Also send tool result event to WebSocket client
             tool_result_event_copy = tool_result_event.copy()
             tool_result_event_copy["timestamp"] = int(datetime.now().timestamp() * 1000)
@@ -451,24 +977,62 @@ class S2sSessionManager:
             # Send tool content end event
             tool_content_end_event = S2sEvent.content_end(prompt_name, toolContent)
             await self.send_raw_event(tool_content_end_event)
-            
+
             # Also send tool content end event to WebSocket client
             tool_content_end_event_copy = tool_content_end_event.copy()
             tool_content_end_event_copy["timestamp"] = int(datetime.now().timestamp() * 1000)
             await self.output_queue.put(tool_content_end_event_copy)
 
-            if tool_name.lower() == "end_conversation" and self.end_conversation_requested:
-                await self._end_bedrock_conversation(prompt_name)
-                await self.output_queue.put(
-                    {
-                        "type": "end_conversation",
-                        "reason": "Tool requested conversation end",
-                        "timestamp": int(datetime.now().timestamp() * 1000),
-                    }
-                )
-            
+    async def send_text_context(self, prompt_name, context_message):
+        """Send hidden user-role text to Nova Sonic (same shape as the open/closed event context)."""
+        content_name = f"tool_context_{uuid.uuid4()}"
+        async with self._tool_result_lock:
+            await self.send_raw_event(S2sEvent.content_start_user_text(prompt_name, content_name))
+            await self.send_raw_event(S2sEvent.text_input(prompt_name, content_name, context_message))
+            await self.send_raw_event(S2sEvent.content_end(prompt_name, content_name))
+
+    async def _send_progress_prompt(self, prompt_name, spec):
+        """Have the model say a short "working on it" while a slow tool is still running.
+
+        Only hidden user text is sent; the toolResult for the same toolUseId still
+        follows as usual, so the model simply answers again once it arrives.
+        """
+        logger.info("[Tool Processing] %s still running after %.1fs; prompting progress", spec.name, spec.progress_after_seconds)
+        try:
+            await self.send_text_context(prompt_name or self.prompt_name, spec.progress_context())
         except Exception as e:
-            logger.error(f"Error in tool processing: {e}", exc_info=True)
+            # Never let the courtesy prompt cost the real result.
+            logger.warning("[Tool Processing] Failed to send progress prompt for %s: %s", spec.name, e)
+
+    @staticmethod
+    def _observe_perceived_latency(tool_label, first_response, seconds):
+        """Silence the user sits through after a toolUse: until the model has a result, fallback or progress prompt."""
+        TOOL_PERCEIVED_LATENCY_SECONDS.labels(tool_label, first_response).observe(seconds)
+
+    async def _send_late_tool_result(self, prompt_name, tool_name, toolResult):
+        """Follow up on a tool that timed out with ``CONTINUE``: its toolResult slot is already used."""
+        if isinstance(toolResult, str):
+            result_text = toolResult
+        else:
+            result_text = json_codec.dumps(toolResult)
+        await self.send_text_context(
+            prompt_name or self.prompt_name,
+            f"The {tool_name} request you told me was still in progress has now finished. "
+            f"Result: {result_text} Briefly tell me the outcome.",
+        )
+
+    def _emit_end_conversation(self):
+        """Queue the end_conversation control event for the client (once)."""
+        if self._end_conversation_emitted:
+            return
+        self._end_conversation_emitted = True
+        self.output_queue.put_nowait(
+            {
+                "type": "end_conversation",
+                "reason": "Tool requested conversation end",
+                "timestamp": int(datetime.now().timestamp() * 1000),
+            }
+        )
 
     async def _end_bedrock_conversation(self, prompt_name):
         """Gracefully end the current Bedrock conversation with contentEnd, promptEnd, and sessionEnd."""
@@ -496,18 +1060,38 @@ class S2sSessionManager:
             logger.error("Failed to send graceful end events to Bedrock", exc_info=True)
             await self.close()
 
+    def _calendar_repository(self):
+        """Data-access layer over the process-wide pooled clients for this session's user, built once per session."""
+        if self._repository is None:
+            self._repository = CalendarRepository(
+                traced_client(ddb_client, "dynamodb"),
+                traced_client(lambda_client, "lambda", {"invoke": "lambda.content_generation"}),
+                traced_client(bedrock_client, "bedrock", {"invoke_model": "bedrock.embedding"}),
+                traced_client(opensearch_client, "opensearch"),
+                traced_client(memory_client, "agentcore_memory"),
+                executor=self.tool_executor,
+                user_id=self.user_id,
+            )
+        return self._repository
+
     async def processToolUse(self, toolName, toolUseContent):
         """Return the tool result"""
-        logger.debug(f"Tool Use Content: {toolUseContent}")
+        logger.debug("Tool Use Content: %s", toolUseContent)
 
         tz = ZoneInfo(self.timezone)
         toolName = toolName.lower()
         content, result = None, None
+        repo = self._calendar_repository()
+        tool_label = toolName if toolName in _METRIC_TOOL_NAMES else "other"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         try:
+            # Lookups started at toolUse time, if any (see _start_speculation)
+            lookup = await self._take_speculation(toolUseContent.get("toolUseId"))
             if toolUseContent.get("content"):
                 # Parse the JSON string in the content field
                 content = toolUseContent.get("content")  # Pass the JSON string directly to the agent
-                logger.debug(f"Extracted query: {content}")
+                logger.debug("Extracted query: %s", content)
             
             # Simple toolUse to get system time in UTC
             if toolName == "getdatetool":
@@ -518,20 +1102,19 @@ class S2sSessionManager:
                     + f" in {self.timezone}"
                 )}
             if toolName == "create_event":
-                result = create_event(ddb_client, lambda_client, self.user_id, content, self.timezone)
+                result = await create_event(repo, self.user_id, content, self.timezone)
             elif toolName == "delete_event":
-                result = delete_event(ddb_client, bedrock_client, opensearch_client, self.user_id, content, self.timezone)
+                result = await delete_event(repo, self.user_id, content, self.timezone, lookup)
             elif toolName == "read_events":
-                result = read_events(ddb_client, self.user_id, content, self.timezone)
+                result = await read_events(repo, self.user_id, content, self.timezone)
             elif toolName == "update_event":
-                result = update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, self.user_id, content, self.timezone)
+                result = await update_event(repo, self.user_id, content, self.timezone, lookup)
             elif toolName == "open_event":
                 self.open_event_pre_last_update = None
-                result = open_event(ddb_client, bedrock_client, opensearch_client, self.user_id, content, self.timezone)
+                result = await open_event(repo, self.user_id, content, self.timezone, lookup)
             elif toolName == "update_open_event":
-                result = update_open_event_tool(
-                    ddb_client,
-                    lambda_client,
+                result = await update_open_event_tool(
+                    repo,
                     self.user_id,
                     content,
                     self.timezone,
@@ -568,9 +1151,13 @@ class S2sSessionManager:
             if not result:
                 result = {"result": "no result found"}
 
+            TOOL_SECONDS.labels(tool_label).observe(loop.time() - started)
+            TOOL_CALLS.labels(tool_label, "ok").inc()
             return result
         except Exception as ex:
-            logger.error(f"[Tool Error] Exception in processToolUse for {toolName}: {ex}", exc_info=True)
+            logger.error("[Tool Error] Exception in processToolUse for %s: %s", toolName, ex, exc_info=True)
+            TOOL_SECONDS.labels(tool_label).observe(loop.time() - started)
+            TOOL_CALLS.labels(tool_label, "error").inc()
             return {"result": "An error occurred while attempting to retrieve information related to the toolUse event."}
 
     def _build_memory_payload_from_history(self):
@@ -614,50 +1201,87 @@ class S2sSessionManager:
 
         return payload if has_user_turn else []
 
-    async def _flush_conversation_history_to_memory(self):
-        """Persist final conversation transcript to AgentCore Memory on a best-effort basis."""
+    def _take_memory_event(self):
+        """Return the AgentCore ``create_event`` arguments for this conversation, once."""
         if self._conversation_history_flushed:
             logger.debug("Conversation history already flushed to AgentCore memory")
-            return
+            return None
 
         memory_id = os.environ.get("BEDROCK_AGENTCORE_MEMORY_ID")
         if not memory_id:
             logger.info("Skipping AgentCore memory persistence: BEDROCK_AGENTCORE_MEMORY_ID is not set")
-            return
+            return None
 
         payload = self._build_memory_payload_from_history()
         if not payload:
             logger.info("Skipping AgentCore memory persistence: no user/assistant transcript turns to persist")
-            return
+            return None
 
         self._conversation_history_flushed = True
-        memory_session_id = self.prompt_name or f"voice_{uuid.uuid4().hex}"
+        return {
+            "memoryId": memory_id,
+            "actorId": self.user_id,
+            "sessionId": self.prompt_name or f"voice_{uuid.uuid4().hex}",
+            "eventTimestamp": datetime.now(ZoneInfo("UTC")),
+            "payload": payload,
+            "clientToken": self._memory_client_token,
+        }
 
+    async def _write_memory_event(self, memory_event):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        outcome = "error"
         try:
             await asyncio.wait_for(
-                asyncio.to_thread(
-                    memory_client.create_event,
-                    memoryId=memory_id,
-                    actorId=self.user_id,
-                    sessionId=memory_session_id,
-                    eventTimestamp=datetime.now(ZoneInfo("UTC")),
-                    payload=payload,
-                    clientToken=self._memory_client_token
-                ),
+                self._calendar_repository().create_memory_event(**memory_event),
                 timeout=3.0,
             )
+            outcome = "ok"
             logger.info(
                 "👉 Persisted %s conversation turns to AgentCore memory session %s",
-                len(payload),
-                memory_session_id,
+                len(memory_event["payload"]),
+                memory_event["sessionId"],
             )
+            return True
         except asyncio.TimeoutError:
+            outcome = "timeout"
             logger.error("Timed out while persisting conversation history to AgentCore memory", exc_info=True)
         except Exception:
             logger.error("Failed to persist conversation history to AgentCore memory", exc_info=True)
+        finally:
+            MEMORY_FLUSH_SECONDS.labels(outcome).observe(loop.time() - started)
+        return False
+
+    async def _flush_conversation_history_to_memory(self):
+        """Persist final conversation transcript to AgentCore Memory on a best-effort basis."""
+        memory_event = self._take_memory_event()
+        if memory_event is not None:
+            await self._write_memory_event(memory_event)
+
+    async def flush_deferred_memory(self):
+        """Write the memory event held back by ``close(flush_memory=False)``; True if one was written."""
+        memory_event, self._deferred_memory_event = self._deferred_memory_event, None
+        if memory_event is None:
+            return False
+        return await self._write_memory_event(memory_event)
+
+    def is_idle(self):
+        """True between turns: the user is not mid-utterance, no tool call is running and no assistant audio is streaming or queued."""
+        return (
+            self._user_audio_content_name is None
+            and not self.tool_processing_tasks
+            and not self.pending_tools
+            and not self._assistant_audio_open
+            and self.output_queue.empty()
+        )
     
-    async def close(self):
-        """Close the stream properly."""
+    async def close(self, flush_memory=True):
+        """Close the stream properly.
+
+        With ``flush_memory=False`` the conversation is captured but not written to
+        AgentCore memory; ``flush_deferred_memory`` writes it later (used to flush
+        many sessions together while draining).
+        """
         if self._closing:
             logger.debug("Close already in progress, skipping duplicate call")
             return
@@ -669,6 +1293,7 @@ class S2sSessionManager:
             and (self.audio_task is None or self.audio_task.done())
         ):
             logger.debug("Stream already closed, skipping cleanup")
+            self.output_queue.close()
             return
 
         self._closing = True
@@ -677,9 +1302,16 @@ class S2sSessionManager:
         try:
             self.is_active = False
             self._session_end_sent = True
+
+            # Terminal signal for the forwarder: it delivers what is already queued
+            # (including end_conversation, if a tool asked for it) and then stops.
+            if self.end_conversation_requested:
+                self._emit_end_conversation()
+            self.output_queue.close()
             current_task = asyncio.current_task()
         
             # Cancel any ongoing tool processing tasks except the current task.
+            # This also withdraws their calls from the tool executor if they have not started yet.
             other_tool_tasks = [
                 task for task in self.tool_processing_tasks if task is not current_task
             ]
@@ -702,7 +1334,7 @@ class S2sSessionManager:
                 if self.stream:
                     await self.stream.input_stream.close()
             except Exception as e:
-                logger.debug(f"Error closing stream input: {e}")
+                logger.debug("Error closing stream input: %s", e)
 
             # Give response task a short chance to exit naturally; cancel only as fallback
             if self.response_task and not self.response_task.done() and self.response_task is not current_task:
@@ -713,7 +1345,17 @@ class S2sSessionManager:
                     self.response_task.cancel()
                     await asyncio.gather(self.response_task, return_exceptions=True)
 
-            await self._flush_conversation_history_to_memory()
+            if flush_memory:
+                await self._flush_conversation_history_to_memory()
+            else:
+                self._deferred_memory_event = self._take_memory_event()
+
+            if self.audio_chunks_received:
+                stats = self.audio_input_stats()
+                logger.info(
+                    "Audio uplink coalesced %s chunks into %s events (%.0f%% fewer)",
+                    stats['chunks_received'], stats['events_sent'], 100 * stats['event_reduction']
+                )
         
             # Clear audio queue to prevent processing old audio data
             while not self.audio_input_queue.empty():
@@ -722,23 +1364,34 @@ class S2sSessionManager:
                 except asyncio.QueueEmpty:
                     break
         
-            # Clear output queue
-            while not self.output_queue.empty():
-                try:
-                    self.output_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+            if self.barge_in_count:
+                logger.info(
+                    "Barge-in: %s interruptions, %.0f ms of stale audio discarded",
+                    self.barge_in_count, self.barge_in_discarded_audio_ms
+                )
+            output_stats = self.output_queue.stats()
+            if any(output_stats["dropped"].values()):
+                logger.info(
+                    "Output buffer dropped %s events (%s ms of audio) for a slow client",
+                    output_stats['dropped'], output_stats['dropped_audio_ms']
+                )
         
             # Reset tool use state
-            self.toolUseContent = ""
-            self.toolUseId = ""
-            self.toolName = ""
+            self.pending_tools.clear()
+            self._discard_speculations()
             self.end_conversation_requested = False
         
+            self._end_turn(completed=False)
+            self._turn_parent = None
+            self._user_text_content_ids.clear()
+
             # Reset session information
             self.prompt_name = None
             self.content_name = None
             self.audio_content_name = None
+            self._assistant_audio_content_id = None
+            self._assistant_audio_open = False
+            self._user_audio_content_name = None
             
             self.content_generation_stage_by_id.clear()
             self.conversation_history.clear()
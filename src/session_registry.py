@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# How long a detached session waits for its client to reconnect.
+DEFAULT_GRACE_SECONDS = float(os.getenv("CLARITY_RESUME_GRACE_SECONDS", "30"))
+# Upper bound on detached sessions; the oldest is closed to make room.
+DEFAULT_MAX_PARKED = int(os.getenv("CLARITY_RESUME_MAX_PARKED", "100"))
+
+
+class ParkedSession:
+    """A detached session plus the per-connection state needed to reattach it."""
+
+    __slots__ = (
+        "session",
+        "user_id",
+        "timezone",
+        "audio_input_format",
+        "audio_output_format",
+        "pending_open_event_context",
+        "permit",
+        "parked_at",
+        "expiry_task",
+    )
+
+    def __init__(
+        self,
+        session,
+        user_id,
+        timezone,
+        audio_input_format,
+        audio_output_format,
+        pending_open_event_context=None,
+        permit=None,
+    ):
+        self.session = session
+        self.user_id = user_id
+        self.timezone = timezone
+        self.audio_input_format = audio_input_format
+        self.audio_output_format = audio_output_format
+        self.pending_open_event_context = pending_open_event_context
+        # Admission slot held while parked, released when the session closes
+        self.permit = permit
+        self.parked_at = None
+        self.expiry_task = None
+
+
+class SessionRegistry:
+    """
+    Keeps sessions alive across WebSocket reconnects.
+
+    A client that asks for a resumable session at ``init`` gets a resume token.
+    If its WebSocket drops while the Bedrock stream is still active, the handler
+    parks the session here instead of closing it; the Bedrock stream, tool state,
+    open event and conversation history stay in memory. A reconnect that presents
+    the token within ``grace_seconds`` takes the session back, otherwise it is
+    closed. At most ``max_parked`` sessions are held; each one's outbound events
+    wait in its ``OutputBuffer``, which already bounds buffered audio.
+
+    Tokens are single use: every successful resume issues a new one.
+    """
+
+    def __init__(self, grace_seconds=DEFAULT_GRACE_SECONDS, max_parked=DEFAULT_MAX_PARKED):
+        self.grace_seconds = grace_seconds
+        self.max_parked = max_parked
+        self._parked = OrderedDict()
+        self._close_tasks = set()
+        self.parked_total = 0
+        self.resumed = 0
+        self.expired = 0
+        self.evicted = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self):
+        return self.grace_seconds > 0 and self.max_parked > 0
+
+    @staticmethod
+    def issue_token():
+        return secrets.token_urlsafe(24)
+
+    def __len__(self):
+        return len(self._parked)
+
+    def park(self, token, parked):
+        """Hold ``parked`` under ``token`` until it is resumed or the grace period ends."""
+        if not self.enabled:
+            return False
+        while len(self._parked) >= self.max_parked:
+            _, oldest = self._parked.popitem(last=False)
+            self.evicted += 1
+            logger.warning(f"Too many parked sessions; closing the oldest (user {oldest.user_id})")
+            self._discard(oldest)
+        parked.parked_at = time.monotonic()
+        parked.expiry_task = asyncio.create_task(self._expire_after(token, self.grace_seconds))
+        self._parked[token] = parked
+        self.parked_total += 1
+        logger.info(f"Parked session for user {parked.user_id} for up to {self.grace_seconds:.0f}s")
+        return True
+
+    def resume(self, token, user_id):
+        """Return the ``ParkedSession`` for ``token`` or ``None`` if it cannot be resumed."""
+        parked = self._parked.get(token) if token else None
+        if parked is None or parked.user_id != user_id:
+            self.rejected += 1
+            return None
+        del self._parked[token]
+        if parked.expiry_task is not None:
+            parked.expiry_task.cancel()
+            parked.expiry_task = None
+        if not parked.session.is_active:
+            # The Bedrock stream ended while the client was away.
+            self.rejected += 1
+            self._discard(parked)
+            return None
+        self.resumed += 1
+        logger.info(
+            f"Resumed session for user {user_id} after {time.monotonic() - parked.parked_at:.1f}s"
+        )
+        return parked
+
+    async def _expire_after(self, token, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        parked = self._parked.pop(token, None)
+        if parked is None:
+            return
+        self.expired += 1
+        logger.info(f"Parked session for user {parked.user_id} was not resumed in time; closing")
+        parked.expiry_task = None
+        await self._close_session(parked)
+
+    def _discard(self, parked):
+        if parked.expiry_task is not None:
+            parked.expiry_task.cancel()
+            parked.expiry_task = None
+        task = asyncio.create_task(self._close_session(parked))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_finished)
+
+    def _close_finished(self, task):
+        self._close_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error closing discarded parked session", exc_info=task.exception())
+
+    @staticmethod
+    async def _close_session(parked):
+        try:
+            await parked.session.close()
+        except Exception:
+            logger.error("Error closing parked session", exc_info=True)
+        finally:
+            if parked.permit is not None:
+                parked.permit.release()
+
+    async def close_all(self):
+        """Close every parked session (used on shutdown)."""
+        parked = list(self._parked.values())
+        self._parked.clear()
+        for entry in parked:
+            if entry.expiry_task is not None:
+                entry.expiry_task.cancel()
+                entry.expiry_task = None
+        await asyncio.gather(*(self._close_session(entry) for entry in parked), *self._close_tasks)
+
+    def stats(self):
+        return {
+            "parked": len(self._parked),
+            "max_parked": self.max_parked,
+            "grace_seconds": self.grace_seconds,
+            "parked_total": self.parked_total,
+            "resumed": self.resumed,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "rejected": self.rejected,
+        }
+
+
+session_registry = SessionRegistry()
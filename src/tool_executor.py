@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = int(os.getenv("CLARITY_TOOL_MAX_WORKERS", "16"))
+DEFAULT_MAX_PER_USER = int(os.getenv("CLARITY_TOOL_MAX_PER_USER", "2"))
+
+
+class ToolExecutor:
+    """Runs blocking calendar tool calls on a bounded thread pool, off the event loop.
+
+    The pool is shared by every session in the process (``max_workers``), and each
+    user may only occupy ``max_per_user`` of its threads at a time so one chatty
+    session cannot starve the others. Cancelling the awaiting task cancels the
+    call if it has not started yet; a call already running in a thread finishes
+    in the background, still counted as running and still holding its user's
+    slot, and its result is discarded.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_per_user=DEFAULT_MAX_PER_USER):
+        self.max_workers = max(1, int(max_workers))
+        self.max_per_user = max(1, int(max_per_user))
+        self._executor = None
+        self._user_semaphores = {}
+        self._user_refs = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.waiting = 0  # waiting on the per-user limit
+        self.submitted = 0  # handed to the pool, queued or running
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.max_queue_depth = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="clarity-tool"
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self):
+        """Calls accepted but not yet running (per-user wait + pool backlog)."""
+        with self._lock:
+            return self.waiting + (self.submitted - self.running)
+
+    def _acquire_user_semaphore(self, user_id):
+        semaphore = self._user_semaphores.get(user_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_user)
+            self._user_semaphores[user_id] = semaphore
+        self._user_refs[user_id] = self._user_refs.get(user_id, 0) + 1
+        return semaphore
+
+    def _release_user_semaphore(self, user_id):
+        refs = self._user_refs.get(user_id, 0) - 1
+        if refs <= 0:
+            self._user_refs.pop(user_id, None)
+            self._user_semaphores.pop(user_id, None)
+        else:
+            self._user_refs[user_id] = refs
+
+    def _track_queue_depth(self):
+        depth = self.waiting + (self.submitted - self.running)
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def _invoke(self, func, args, kwargs):
+        with self._lock:
+            self.running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.submitted -= 1
+
+    def _release_slot(self, semaphore, user_id):
+        semaphore.release()
+        self._release_user_semaphore(user_id)
+
+    def _release_slot_threadsafe(self, loop, semaphore, user_id):
+        try:
+            loop.call_soon_threadsafe(self._release_slot, semaphore, user_id)
+        except RuntimeError:
+            # The loop is closed, so nothing is left waiting on this user's slot.
+            pass
+
+    async def run(self, user_id, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the pool on behalf of ``user_id``."""
+        semaphore = self._acquire_user_semaphore(user_id)
+        with self._lock:
+            self.waiting += 1
+            self._track_queue_depth()
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            with self._lock:
+                self.waiting -= 1
+            self.cancelled += 1
+            self._release_user_semaphore(user_id)
+            raise
+        with self._lock:
+            self.waiting -= 1
+            self.submitted += 1
+            self._track_queue_depth()
+
+        loop = asyncio.get_running_loop()
+        # Keep contextvars (e.g. tracing context) visible inside the worker thread.
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._invoke, func, args, kwargs)
+        future = None
+        release_now = True
+        try:
+            future = self._get_executor().submit(call)
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if future.cancel():
+                # Never reached a worker thread, so _invoke will not decrement.
+                with self._lock:
+                    self.submitted -= 1
+            else:
+                # Already running: the thread keeps the user's slot until it returns,
+                # so cancelled calls cannot push a user past max_per_user.
+                release_now = False
+                future.add_done_callback(lambda _: self._release_slot_threadsafe(loop, semaphore, user_id))
+            raise
+        except Exception:
+            if future is None:
+                with self._lock:
+                    self.submitted -= 1
+            self.failed += 1
+            raise
+        finally:
+            if release_now:
+                self._release_slot(semaphore, user_id)
+        self.completed += 1
+        return result
+
+    def stats(self):
+        """Return a snapshot of executor counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_per_user": self.max_per_user,
+                "queue_depth": self.waiting + (self.submitted - self.running),
+                "waiting_on_user_limit": self.waiting,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "max_queue_depth": self.max_queue_depth,
+                "active_users": len(self._user_semaphores),
+            }
+
+    def shutdown(self):
+        """Stop accepting work and drop calls that have not started yet."""
+        if self._executor is not None:
+            logger.info(f"Shutting down tool executor: {self.stats()}")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Process-wide executor shared by all sessions
+tool_executor = ToolExecutor()
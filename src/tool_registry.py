@@ -0,0 +1,138 @@
+import logging
+import os
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# What happens to a tool call that outlives its budget.
+# Stop waiting for it; the model tells the user and offers to retry. A call
+# already running on a ToolExecutor thread still finishes there, keeping its
+# pool and per-user slot (and showing as running) until it returns.
+CANCEL = "cancel"
+CONTINUE = "continue"  # let it finish and report the outcome in a follow-up context message
+
+# Budget for tools the registry does not know.
+DEFAULT_BUDGET_SECONDS = float(os.getenv("CLARITY_TOOL_DEFAULT_BUDGET_SECONDS", "6"))
+# How long the slow editing tools run before the model is prompted to say it's
+# working on it; 0 turns the progress prompt off.
+PROGRESS_PROMPT_SECONDS = float(os.getenv("CLARITY_TOOL_PROGRESS_SECONDS", "1.5")) or None
+
+
+class ToolSpec:
+    """Latency budget and timeout policy for one tool."""
+
+    __slots__ = ("name", "budget_seconds", "on_timeout", "progress_after_seconds")
+
+    def __init__(self, name, budget_seconds, on_timeout=CANCEL, progress_after_seconds=None):
+        if on_timeout not in (CANCEL, CONTINUE):
+            raise ValueError(f"on_timeout must be {CANCEL!r} or {CONTINUE!r}")
+        self.name = name
+        self.budget_seconds = budget_seconds
+        self.on_timeout = on_timeout
+        self.progress_after_seconds = progress_after_seconds
+
+    def progress_prompt_due(self):
+        """True when the model should fill the silence before the budget runs out."""
+        return self.progress_after_seconds is not None and self.progress_after_seconds < self.budget_seconds
+
+    def progress_context(self):
+        """Hidden user-text context asking the model to acknowledge a slow tool call."""
+        return (
+            f"The {self.name} request is taking a moment. Briefly tell me you're working on it, in a few words, "
+            "then wait. Do not call any tool again for it; its result will arrive as the tool result."
+        )
+
+    def timeout_result(self):
+        """Tool result sent in place of the real one when the budget runs out."""
+        if self.on_timeout == CONTINUE:
+            return {
+                "status": "IN_PROGRESS",
+                "tool_name": self.name,
+                "result": (
+                    "This is taking longer than usual but is still being processed. "
+                    "Briefly tell the user you're still working on it; the outcome will follow shortly. "
+                    "Do not call this tool again for the same request."
+                ),
+            }
+        return {
+            "status": "TIMED_OUT",
+            "tool_name": self.name,
+            "retryable": True,
+            "result": (
+                "This request timed out and nothing was changed. "
+                "Briefly tell the user it is taking too long right now and offer to try again."
+            ),
+        }
+
+
+# Writes run to completion (the DynamoDB/Lambda work cannot be rolled back
+# half-way); lookups are safe to abandon. Budgets cover embedding + OpenSearch +
+# DynamoDB round trips, and the content-generation Lambda for the editing tools,
+# which is also why those get a progress prompt.
+DEFAULT_TOOL_SPECS = (
+    ToolSpec("getdatetool", 1.0),
+    ToolSpec("read_events", 4.0),
+    ToolSpec("open_event", 5.0),
+    ToolSpec("close_event", 1.0),
+    ToolSpec("end_conversation", 1.0),
+    ToolSpec("delete_event", 5.0, CONTINUE),
+    ToolSpec("create_event", 6.0, CONTINUE, PROGRESS_PROMPT_SECONDS),
+    ToolSpec("update_event", 6.0, CONTINUE, PROGRESS_PROMPT_SECONDS),
+    ToolSpec("update_open_event", 6.0, CONTINUE, PROGRESS_PROMPT_SECONDS),
+)
+
+
+def parse_budget_overrides(spec):
+    """Parse ``"update_event=8,read_events=2.5"`` into ``{name: seconds}``; bad entries are ignored."""
+    budgets = {}
+    for entry in (spec or "").split(","):
+        name, _, seconds = entry.strip().partition("=")
+        try:
+            budgets[name.strip().lower()] = float(seconds)
+        except ValueError:
+            continue
+    return {name: seconds for name, seconds in budgets.items() if name and seconds > 0}
+
+
+class ToolRegistry:
+    """
+    Per-tool latency budgets for the voice session.
+
+    ``S2sSessionManager`` gives every tool call ``budget_seconds`` before it sends
+    the model ``ToolSpec.timeout_result()`` so the conversation never sits silent
+    on a slow OpenSearch query or a cold Lambda; tools with
+    ``progress_after_seconds`` also get a "working on it" prompt part-way there.
+    Budgets can be overridden with ``CLARITY_TOOL_BUDGETS`` (``name=seconds`` pairs).
+    """
+
+    def __init__(self, specs=DEFAULT_TOOL_SPECS, default_budget=DEFAULT_BUDGET_SECONDS, overrides=None):
+        self.default_budget = default_budget
+        self._specs = {}
+        for spec in specs:
+            self.register(spec)
+        if overrides is None:
+            overrides = parse_budget_overrides(os.getenv("CLARITY_TOOL_BUDGETS", ""))
+        for name, seconds in overrides.items():
+            existing = self._specs.get(name)
+            if existing:
+                self.register(ToolSpec(name, seconds, existing.on_timeout, existing.progress_after_seconds))
+            else:
+                self.register(ToolSpec(name, seconds))
+
+    def register(self, spec):
+        self._specs[spec.name.lower()] = spec
+        return spec
+
+    def get(self, name):
+        """Spec for ``name``; unknown tools get the default budget and are cancelled on timeout."""
+        key = (name or "").lower()
+        spec = self._specs.get(key)
+        if spec is None:
+            spec = ToolSpec(key or "unknown", self.default_budget)
+        return spec
+
+    def budgets(self):
+        return {name: (spec.budget_seconds, spec.on_timeout, spec.progress_after_seconds) for name, spec in self._specs.items()}
+
+
+tool_registry = ToolRegistry()
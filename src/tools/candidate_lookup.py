@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import utils
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# OpenSearch hits below this score are not considered matches.
+MIN_MATCH_SCORE = 0.8
+
+# Per tool: the payload fields that identify the existing event (title, start
+# date, start time), whether a missing date means today, and the DynamoDB tables
+# the tool reads a matched record from.
+TOOL_QUERY_FIELDS = {
+    "delete_event": ("title", "start_date", "start_time", False, ()),
+    "open_event": ("current_title", "current_start_date", "current_start_time", False, ("Habits",)),
+    "update_event": ("current_title", "current_start_date", "current_start_time", True, ("Habits", "Events")),
+}
+
+
+def relevant_hits(response):
+    return [hit for hit in response['hits']['hits'] if hit['_score'] >= MIN_MATCH_SCORE]
+
+
+class CandidateLookup:
+    """
+    Read-only lookups the event-matching tools make before they change anything.
+
+    ``delete_event``, ``open_event`` and ``update_event`` all embed the spoken
+    title, search the ``habits`` and ``calendar-events`` indexes for it and read
+    the matched record from DynamoDB. Each lookup here runs once and is shared
+    (in flight or finished), so the session manager can start them when the
+    ``toolUse`` arrives and the tool reuses the results when it runs at
+    ``contentEnd``. A lookup that failed or was cancelled is simply redone.
+    Nothing here writes.
+    """
+
+    def __init__(self, repo, user_id, title, start_date, start_time, timezone, prefetch_tables=()):
+        self.repo = repo
+        self.user_id = user_id
+        self.title = title
+        self.start_date = start_date
+        self.start_time = start_time
+        self.timezone = timezone
+        self.prefetch_tables = prefetch_tables
+        self._lookups = {}
+
+    def matches(self, user_id, title, start_date, start_time, timezone):
+        return (self.user_id, self.title, self.start_date, self.start_time, self.timezone) == (
+            user_id, title, start_date, start_time, timezone
+        )
+
+    async def _once(self, key, make):
+        task = self._lookups.get(key)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = self._lookups[key] = asyncio.ensure_future(make())
+        # Shielded so one caller giving up (a cancelled speculation) does not cancel it for the other.
+        return await asyncio.shield(task)
+
+    async def query_vector(self):
+        return await self._once("query_vector", self._embed_title)
+
+    async def _embed_title(self):
+        vector = await self.repo.embed_text(self.title)
+        logger.info("Generated embedding for event title: %s", self.title)
+        return vector
+
+    async def _search(self, index, filters):
+        search_body = {
+            "size": 5,
+            "track_total_hits": True,
+            "query": {
+                "bool": {
+                    "filter": filters,
+                    "must": [
+                        {"knn": {"title_vector": {"vector": await self.query_vector(), "k": 5}}},
+                    ]
+                }
+            }
+        }
+        return await self.repo.search(index, search_body)
+
+    async def habits(self):
+        """``habits`` search response for the title."""
+        return await self._once("habits", lambda: self._search("habits", [{"term": {"userId": self.user_id}}]))
+
+    async def events(self):
+        """``calendar-events`` search response for the title, narrowed by the start date/time when given."""
+        return await self._once("events", lambda: self._search("calendar-events", self._event_filters()))
+
+    def _event_filters(self):
+        tz = ZoneInfo(self.timezone)
+        filters = [{"term": {"userId": self.user_id}}]
+        start_date, start_time = self.start_date, self.start_time
+        if start_date and start_time:
+            start_datetime = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
+            filters.append({"term": {"startDate": utils.to_utc_iso_z(start_datetime)}})
+            logger.info("Added startDate term filter for search: %s", utils.to_utc_iso_z(start_datetime))
+        elif start_date:
+            start_range, end_range = utils.get_utc_day_bounds(start_date, self.timezone)
+            filters.append({"range": {"startDate": {"gte": utils.to_utc_iso_z(start_range), "lte": utils.to_utc_iso_z(end_range)}}})
+            logger.info("Added startDate range filter for search: gte %s lte %s", utils.to_utc_iso_z(start_range), utils.to_utc_iso_z(end_range))
+        elif start_time:
+            # search for today's date with the provided time
+            today_date = datetime.now(tz).date()
+            search_datetime = datetime.fromisoformat(f"{today_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
+            filters.append({"term": {"startDate": utils.to_utc_iso_z(search_datetime)}})
+            logger.info("Added startDate term filter for search: %s", utils.to_utc_iso_z(search_datetime))
+        return filters
+
+    async def get_item(self, table_name, key):
+        """DynamoDB ``get_item`` response, read at most once per table/key."""
+        cache_key = ("get_item", table_name, json.dumps(key, sort_keys=True))
+        return await self._once(cache_key, lambda: self.repo.get_item(table_name, key))
+
+    async def prefetch_items(self):
+        """Read the DynamoDB records (in ``prefetch_tables``) behind an unambiguous habit or event match."""
+        habit_hits = relevant_hits(await self.habits()) if "Habits" in self.prefetch_tables else []
+        if len(habit_hits) == 1 and habit_hits[0]['_source'].get('habitId'):
+            source = habit_hits[0]['_source']
+            await self.get_item('Habits', {'userId': {'S': source['userId']}, 'id': {'S': source['habitId']}})
+        event_hits = relevant_hits(await self.events()) if "Events" in self.prefetch_tables else []
+        if len(event_hits) == 1:
+            source = event_hits[0]['_source']
+            event_id = source.get('eventId') or source.get('id')
+            if event_id:
+                await self.get_item('Events', {'userId': {'S': self.user_id}, 'id': {'S': event_id}})
+
+
+def parse_query(tool_name, content, timezone):
+    """``(title, start_date, start_time)`` a tool will search for, or ``None`` when there is nothing to look up."""
+    fields = TOOL_QUERY_FIELDS.get((tool_name or "").lower())
+    if fields is None or not content:
+        return None
+    title_key, date_key, time_key, default_today, _ = fields
+    try:
+        details = json.loads(content)
+        title = details.get(title_key)
+        if not title:
+            return None
+        start_date = date.fromisoformat(details[date_key]) if details.get(date_key) else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if start_date is None and default_today:
+        start_date = datetime.now(ZoneInfo(timezone)).date()
+    return title, start_date, details.get(time_key)
+
+
+def candidate_lookup_for_tool(tool_name, repo, user_id, content, timezone):
+    """A ``CandidateLookup`` for a ``toolUse`` payload, or ``None`` if the tool does not search for an event."""
+    query = parse_query(tool_name, content, timezone)
+    if query is None:
+        return None
+    prefetch_tables = TOOL_QUERY_FIELDS[tool_name.lower()][4]
+    return CandidateLookup(repo, user_id, *query, timezone, prefetch_tables)
+
+
+def candidate_lookup(prefetched, repo, user_id, title, start_date, start_time, timezone):
+    """Reuse a speculative lookup when it was made for the same query; otherwise start a fresh one."""
+    if prefetched is not None and prefetched.matches(user_id, title, start_date, start_time, timezone):
+        return prefetched
+    return CandidateLookup(repo, user_id, title, start_date, start_time, timezone)
@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 serializer = TypeSerializer()
 deserializer = TypeDeserializer()
 
-def create_event(ddb_client, lambda_client, user_id, content, timezone):
+async def create_event(repo, user_id, content, timezone):
   try:
     tz = ZoneInfo(timezone)
     event_details = json.loads(content)
@@ -54,7 +54,7 @@ def create_event(ddb_client, lambda_client, user_id, content, timezone):
         "id": str(uuid.uuid4()),
         "userId": user_id,
         "name": event_title,
-        "content": utils.generate_update_content(lambda_client, user_id, event_details.get("tasks_content_prompt"), None) if event_details.get("tasks_content_prompt") else None,
+        "content": await repo.generate_content(event_details.get("tasks_content_prompt"), None) if event_details.get("tasks_content_prompt") else None,
         "creationDate": datetime.now(tz).strftime('%Y-%m-%d'), # YYYY-MM-DD in user's timezone
         "type": event_details.get("type", "personal"),
         "priority": event_details.get("priority", None),
@@ -74,8 +74,8 @@ def create_event(ddb_client, lambda_client, user_id, content, timezone):
         "length": event_details.get("length_minutes", 15),
       }
       ddb_habit_item= {k: serializer.serialize(v) for k, v in new_habit.items()}
-      ddb_client.put_item(TableName='Habits', Item=ddb_habit_item)
-      logger.info(f"DynamoDB put_item succeeded for habit: {new_habit}")
+      await repo.put_item(table_name='Habits', item=ddb_habit_item)
+      logger.info("DynamoDB put_item succeeded for habit: %s", new_habit)
       result = {
         "result": f"Tell the user the repeating event '{event_title}' has been created.",
         "new_repeating_event_config": new_habit
@@ -93,7 +93,7 @@ def create_event(ddb_client, lambda_client, user_id, content, timezone):
         "type": event_details.get("type", "personal"),
         "fixed": event_details.get("fixed", False),
         "priority": event_details.get("priority", None),
-        "content": utils.generate_update_content(lambda_client, user_id, event_details.get("tasks_content_prompt"), None) if event_details.get("tasks_content_prompt") else None,
+        "content": await repo.generate_content(event_details.get("tasks_content_prompt"), None) if event_details.get("tasks_content_prompt") else None,
         "startDate": utils.to_utc_iso_z(start_datetime),
         "endDate": utils.to_utc_iso_z(end_datetime),
         "notifications": notifications
@@ -104,8 +104,8 @@ def create_event(ddb_client, lambda_client, user_id, content, timezone):
         if isinstance(new_event.get(date_key), datetime):
           new_event[date_key] = utils.to_utc_iso_z(new_event[date_key])
       ddb_event_item= {k: serializer.serialize(v) for k, v in new_event.items()}
-      ddb_client.put_item(TableName='Events', Item=ddb_event_item)
-      logger.info(f"DynamoDB put_item succeeded for event: {new_event}")
+      await repo.put_item(table_name='Events', item=ddb_event_item)
+      logger.info("DynamoDB put_item succeeded for event: %s", new_event)
       result = {
         "result": f"Tell the user the event '{event_title}' has been created.",
         "new_event": new_event
@@ -113,6 +113,6 @@ def create_event(ddb_client, lambda_client, user_id, content, timezone):
       logger.info(result)
       return result
   except Exception as e:
-    logger.error(f"Error creating event: {e}", exc_info=True)
+    logger.error("Error creating event: %s", e, exc_info=True)
     result = {"result": f"Failed to create event: {str(e)}"}
     return result
\ No newline at end of file
@@ -9,6 +9,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from models.repeating_event_config_model import HabitIndexModel
 from models.event_model import EventIndexModel
 import utils
+from tools.candidate_lookup import candidate_lookup
 
 
 # Configure logging
@@ -16,11 +17,11 @@ logger = logging.getLogger(__name__)
 serializer = TypeSerializer()
 deserializer = TypeDeserializer()
 
-def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content, timezone):
+async def delete_event(repo, user_id, content, timezone, lookup=None):
   try:
       tz = ZoneInfo(timezone)
-      logger.info(f"Processing delete_event with content: {content}")
       event_details = json.loads(content)
+      logger.info("Processing delete_event with details: %s", event_details)
       event_title = event_details.get("title")
       
       start_date = date.fromisoformat(event_details.get("start_date", None)) if event_details.get("start_date", None) else None
@@ -29,45 +30,22 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
       #naive_start_datetime = event_details.get("start_datetime")
       #start_datetime = None
       
-      logger.info(f"Searching for event to delete: title='{event_title}', start_date='{start_date}', start_time='{start_time}'")
+      logger.info("Searching for event to delete: title='%s', start_date='%s', start_time='%s'", event_title, start_date, start_time)
       # 1. Vectorize and Hybrid Search to find candidate events
-      embed_response = bedrock_client.invoke_model(
-          body=json.dumps({"inputText": event_title}),
-          modelId="amazon.titan-embed-text-v1"
-      )
-      query_vector = json.loads(embed_response['body'].read())['embedding']
-      logger.info(f"Generated embedding for event title: {event_title}")
-      filters = [{"term": {"userId": user_id}}]
-      #if naive_start_datetime:
-      #    start_datetime = datetime.fromisoformat(naive_start_datetime).replace(tzinfo=tz)
-      
-      search_body ={
-          "size": 5,
-          "track_total_hits": True,
-          "query": {
-              "bool": {
-                  "filter": filters,
-                  "must": [
-                      {"knn": {"title_vector": {"vector": query_vector, "k": 5}}},
-                  ]
-              }
-          }
-      }
-      opensearch_habits_response = opensearch_client.search(
-          index="habits",
-          body=search_body
-      )
+      # Reuses the lookups started when the toolUse arrived, if the session made them
+      lookup = candidate_lookup(lookup, repo, user_id, event_title, start_date, start_time, timezone)
+      opensearch_habits_response = await lookup.habits()
       matching_habit_names_found = opensearch_habits_response['hits']['total']['value']
-      logger.info(f"Found {matching_habit_names_found} matching habits:")
+      logger.info("Found %s matching habits:", matching_habit_names_found)
       unfiltered_habit_hits = opensearch_habits_response['hits']['hits']
       habit_hits = []
       for hit in unfiltered_habit_hits:
           if hit['_score'] >= 0.8:  # filter out low relevance matches
               habit_hits.append(hit)
-          logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']}")
+          logger.info("score: %s, title: %s", hit['_score'], hit['_source']['title'])
       
       if len(habit_hits) > 0:
-          logger.info(f"Found {len(habit_hits)} matching habits with title '{event_title}'")
+          logger.info("Found %s matching habits with title '%s'", len(habit_hits), event_title)
           if start_date:
               matches = []
               for habit_hit in habit_hits:
@@ -79,20 +57,20 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
                           start_datetime_obj = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=new_tz)
                           if new_dt == start_datetime_obj:
                               matches.append(habit_hit)
-                              logger.info(f"Found a repeating event config that matches the title and time and repeats on the target date {start_date}")
+                              logger.info("Found a repeating event config that matches the title and time and repeats on the target date %s", start_date)
                       else:
                           matches.append(habit_hit)
-                          logger.info(f"Found a repeating event config that matches the title and repeats on the target date {start_date}")
+                          logger.info("Found a repeating event config that matches the title and repeats on the target date %s", start_date)
               if len(matches) == 1:
                   if event_details.get("this_event_only", False):
-                      logger.info(f"Deleting only this occurrence on {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'")
+                      logger.info("Deleting only this occurrence on %s for recurring event '%s'", utils.pprint_date(start_date, start_time), matches[0]['_source']['title'])
                       new_exception_dates = cfg.exceptionDates or []
                       new_exception_dates.append(start_date)
                       update_expression = "SET exceptionDates = :ed"
                       expression_attribute_values = {":ed": serializer.serialize(utils._to_dynamodb_compatible(new_exception_dates))}
-                      ddb_client.update_item(
-                          TableName='Habits',
-                          Key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
+                      await repo.update_item(
+                          table_name='Habits',
+                          key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
                           UpdateExpression=update_expression,
                           ExpressionAttributeValues=expression_attribute_values
                       )
@@ -102,16 +80,16 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
                       #     body={"doc": {"exceptionDates": [d.isoformat() for d in new_exception_dates]}},
                       #     refresh=True
                       # )
-                      logger.info(f"Deleted only this occurrence on {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'")
+                      logger.info("Deleted only this occurrence on %s for recurring event '%s'", utils.pprint_date(start_date, start_time), matches[0]['_source']['title'])
                       return {"result": f"Successfully deleted only the occurrence on {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'."}
                   elif event_details.get("this_and_future_events", False):
-                      logger.info(f"Deleting this and future occurrences from {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'")
+                      logger.info("Deleting this and future occurrences from %s for recurring event '%s'", utils.pprint_date(start_date, start_time), matches[0]['_source']['title'])
                       new_stop_date = start_date
                       update_expression = "SET stopDate = :sd"
                       expression_attribute_values = {":sd": serializer.serialize(utils._to_dynamodb_compatible(new_stop_date))}
-                      ddb_client.update_item(
-                          TableName='Habits',
-                          Key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
+                      await repo.update_item(
+                          table_name='Habits',
+                          key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
                           UpdateExpression=update_expression,
                           ExpressionAttributeValues=expression_attribute_values
                       )
@@ -121,47 +99,27 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
                       #     body={"doc": {"stopDate": new_stop_date.isoformat()}},
                       #     refresh=True
                       # )
-                      logger.info(f"Deleted this and future occurrences from {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'")
+                      logger.info("Deleted this and future occurrences from %s for recurring event '%s'", utils.pprint_date(start_date, start_time), matches[0]['_source']['title'])
                       return {"result": f"Successfully deleted this and future occurrences from {utils.pprint_date(start_date, start_time)} for recurring event '{matches[0]['_source']['title']}'."}
                   else:
                       return {"result": f"Do you want to delete only the occurrence on {utils.pprint_date(start_date, start_time)}? Or do you want to delete this event and all future occurrences?"}
               elif len(matches) > 1:
                   return {"result": f"Unable to delete because I found {len(matches)} recurring events with title '{event_title}' matching the provided start date and time."}
               else:
-                  logger.info(f"No matching occurrences found on {utils.pprint_date(start_date, start_time)} for recurring event '{event_title}'. This is probably due to exception dates.")
+                  logger.info("No matching occurrences found on %s for recurring event '%s'. This is probably due to exception dates.", utils.pprint_date(start_date, start_time), event_title)
           else:
               return {"result": f"Cannot delete event '{event_title}' without a start date and time because it is a recurring event. Please provide the start date and time to identify the specific occurrence to delete."}
       # if naive_start_datetime:
       #     filters.append({"term": {"startDate": start_datetime.isoformat()}})
       #     logger.info(f"Added startDate filter for search: {start_datetime.isoformat()}")
-      if start_date and start_time:
-          start_datetime = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-          filters.append({"term": {"startDate": utils.to_utc_iso_z(start_datetime)}})
-          logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(start_datetime)}")
-      elif start_date:
-          start_range, end_range = utils.get_utc_day_bounds(start_date, timezone)
-          filters.append({"range": {"startDate": {"gte": utils.to_utc_iso_z(start_range), "lte": utils.to_utc_iso_z(end_range)}}})
-          logger.info(f"Added startDate range filter for search: gte {utils.to_utc_iso_z(start_range)} lte {utils.to_utc_iso_z(end_range)}")
-      elif start_time:
-          # search for today's date with the provided time
-          today_date = datetime.now(tz).date()
-          search_datetime = datetime.fromisoformat(f"{today_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-          filters.append({"term": {"startDate": utils.to_utc_iso_z(search_datetime)}})
-          logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(search_datetime)}")
-      
-      
-      search_body["query"]["bool"]["filter"] = filters
-      opensearch_response = opensearch_client.search(
-          index="calendar-events",
-          body=search_body
-      )
+      opensearch_response = await lookup.events()
       unfiltered_hits = opensearch_response['hits']['hits']
-      logger.info(f"OpenSearch returned {len(unfiltered_hits)} hits for event delete search")
+      logger.info("OpenSearch returned %s hits for event delete search", len(unfiltered_hits))
       hits = []
       for hit in unfiltered_hits:
           if hit['_score'] >= 0.8:  # filter out low relevance matches
               hits.append(hit)
-          logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']} startDate: {hit['_source']['startDate']}")
+          logger.info("score: %s, title: %s startDate: %s", hit['_score'], hit['_source']['title'], hit['_source']['startDate'])
       total_found = len(hits)
               
       if total_found == 0:
@@ -178,14 +136,14 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
       if total_found == 1:
           # exact match
           target_doc = hits[0]
-          logger.info(f"Single matching event found for deletion: {target_doc}")
+          logger.info("Single matching event found for deletion: %s", target_doc)
       elif start_date and start_time:
           # filter by start date if provided
           search_dt = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
           for hit in hits:
               if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                   target_doc = hit
-                  logger.info(f"Matching event found for deletion with start date: {target_doc}")
+                  logger.info("Matching event found for deletion with start date: %s", target_doc)
                   break
           if not target_doc:
               return {"result": f"found multiple events with title '{event_title}' but none match the provided start date {utils.to_utc_iso_z(search_dt)}."}
@@ -198,7 +156,7 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
           for hit in hits:
               if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                   target_doc = hit
-                  logger.info(f"Matching event found for deletion with start datetime: {target_doc}")
+                  logger.info("Matching event found for deletion with start datetime: %s", target_doc)
                   break
           if not target_doc:
               return {"result": f"found multiple events with title '{event_title}' but none match the provided start time {start_time} on today's date."}
@@ -214,9 +172,9 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
           if habitId:
               if event_details.get("this_event_only", False):
                   #opensearch_client.delete(index="calendar-events", id=os_id)
-                  ddb_client.delete_item(
-                      TableName='Events',
-                      Key={'userId': {'S': user_id}, 'id': {'S': eventId}}
+                  await repo.delete_item(
+                      table_name='Events',
+                      key={'userId': {'S': user_id}, 'id': {'S': eventId}}
                   )
                   return {"result": f"Successfully deleted only the occurrence on {datetime.fromisoformat(target_doc['_source']['startDate']).astimezone(tz).strftime('%m/%d/%y %I:%M %p')} for recurring event '{event_title}'."}
               elif event_details.get("this_and_future_events", False):
@@ -224,9 +182,9 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
                   # update the habit to set stopDate in DynamoDB and OpenSearch
                   update_expression = "SET stopDate = :sd"
                   expression_attribute_values = {":sd": serializer.serialize(utils._to_dynamodb_compatible(new_stop_date))}
-                  ddb_client.update_item(
-                      TableName='Habits',
-                      Key={'userId': {'S': user_id}, 'id': {'S': habitId}},
+                  await repo.update_item(
+                      table_name='Habits',
+                      key={'userId': {'S': user_id}, 'id': {'S': habitId}},
                       UpdateExpression=update_expression,
                       ExpressionAttributeValues=expression_attribute_values
                   )
@@ -238,21 +196,21 @@ def delete_event(ddb_client, bedrock_client, opensearch_client, user_id, content
                   # )
                   # delete the event occurrence
                   # opensearch_client.delete(index="calendar-events", id=os_id)
-                  ddb_client.delete_item(
-                      TableName='Events',
-                      Key={'userId': {'S': user_id}, 'id': {'S': eventId}}
+                  await repo.delete_item(
+                      table_name='Events',
+                      key={'userId': {'S': user_id}, 'id': {'S': eventId}}
                   )
                   return {"result": f"Successfully deleted this and future occurrences from {datetime.fromisoformat(target_doc['_source']['startDate']).astimezone(tz).strftime('%m/%d/%y %I:%M %p')} for recurring event '{event_title}'."}
               else:
                   return {"result": f"Do you want to delete only the occurrence on {datetime.fromisoformat(target_doc['_source']['startDate']).astimezone(tz).strftime('%m/%d/%y %I:%M %p')}? Or do you want to delete this event and all future occurrences?"}
           # opensearch_client.delete(index="calendar-events", id=os_id)
-          ddb_client.delete_item(
-              TableName='Events',
-              Key={'userId': {'S': user_id}, 'id': {'S': eventId}}
+          await repo.delete_item(
+              table_name='Events',
+              key={'userId': {'S': user_id}, 'id': {'S': eventId}}
           )
           return {"result": f"Successfully deleted the event '{event_title}'."}
       else:
           return {"result": "No matching event found to delete."}
   except Exception as e:
-      logger.error(f"Error during event deletion: {e}", exc_info=True)
+      logger.error("Error during event deletion: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that delete request."}
\ No newline at end of file
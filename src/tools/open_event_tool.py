@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from models.repeating_event_config_model import HabitIndexModel, RepeatingEventConfigModel
 from models.event_model import EventIndexModel, EventModel
 import utils
+from tools.candidate_lookup import candidate_lookup
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,55 +19,32 @@ deserializer = TypeDeserializer()
 
 
 
-def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content, timezone):
+async def open_event(repo, user_id, content, timezone, lookup=None):
   try:
     tz = ZoneInfo(timezone)
-    logger.info(f"Processing open_event with content: {content}")
     event_details = json.loads(content)
-    logger.info(f"Parsed event details for open_event: {event_details}")
+    logger.info("Parsed event details for open_event: %s", event_details)
     event_title = event_details.get("current_title")
     
     start_date = date.fromisoformat(event_details.get("current_start_date", None)) if event_details.get("current_start_date", None) else None
     start_time = event_details.get("current_start_time", None)
 
-    logger.info(f"Searching for event to open: title='{event_title}', start_date='{start_date}', start_time='{start_time}'")
+    logger.info("Searching for event to open: title='%s', start_date='%s', start_time='%s'", event_title, start_date, start_time)
     # Vectorize and Hybrid Search to find candidate events
-    embed_response = bedrock_client.invoke_model(
-        body=json.dumps({"inputText": event_title}),
-        modelId="amazon.titan-embed-text-v1"
-    )
-    query_vector = json.loads(embed_response['body'].read())['embedding']
-    logger.info(f"Generated embedding for event title: {event_title}")
-    filters = [{"term": {"userId": user_id}}]
-        
-    # Search OpenSearch habits index for matching title 
-    search_body ={
-        "size": 5,
-        "track_total_hits": True,
-        "query": {
-            "bool": {
-                "filter": filters,
-                "must": [
-                    {"knn": {"title_vector": {"vector": query_vector, "k": 5}}},
-                ]
-            }
-        }
-    }
-    opensearch_habits_response = opensearch_client.search(
-        index="habits",
-        body=search_body
-    )
+    # Reuses the lookups started when the toolUse arrived, if the session made them
+    lookup = candidate_lookup(lookup, repo, user_id, event_title, start_date, start_time, timezone)
+    opensearch_habits_response = await lookup.habits()
     matching_habit_names_found = opensearch_habits_response['hits']['total']['value']
-    logger.info(f"Found {matching_habit_names_found} matching habits: ")
+    logger.info("Found %s matching habits: ", matching_habit_names_found)
     unfiltered_habit_hits = opensearch_habits_response['hits']['hits']
     habit_hits = []
     for hit in unfiltered_habit_hits:
         if hit['_score'] >= 0.8:  # filter out low relevance matches
             habit_hits.append(hit)
-        logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']}")
+        logger.info("score: %s, title: %s", hit['_score'], hit['_source']['title'])
         
     if len(habit_hits) > 0:
-        logger.info(f"Found {len(habit_hits)} matching habits with title '{event_title}'")
+        logger.info("Found %s matching habits with title '%s'", len(habit_hits), event_title)
         if start_date:
             matches = []
             # Find the habit configs that repeat on the target date and time
@@ -79,24 +57,21 @@ def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content,
                         start_datetime_obj = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=new_tz)
                         if new_dt == start_datetime_obj:
                             matches.append(habit_hit)
-                            logger.info(f"Found a repeating event config that matches the title and time and repeats on the target date {start_date}")
+                            logger.info("Found a repeating event config that matches the title and time and repeats on the target date %s", start_date)
                     else:
                         matches.append(habit_hit)
-                        logger.info(f"Found a repeating event config that matches the title and repeats on the target date {start_date}")
+                        logger.info("Found a repeating event config that matches the title and repeats on the target date %s", start_date)
             
             # If we have exactly one match, proceed to open
             if len(matches) == 1:
                 # get the habit data from DynamoDB
                 habitId = matches[0]['_source']['habitId']
-                ddb_habit_item = ddb_client.get_item(
-                    TableName='Habits',
-                    Key={'userId': {'S': cfg.userId}, 'id': {'S': habitId}}
-                )
+                ddb_habit_item = await lookup.get_item('Habits', {'userId': {'S': cfg.userId}, 'id': {'S': habitId}})
                 if not ddb_habit_item.get('Item'):
                     return {"result": f"Could not find the recurring event config in the database for title '{event_title}'."}
                 habit_item = {k: deserializer.deserialize(v) for k, v in ddb_habit_item['Item'].items()}
                 cfg = RepeatingEventConfigModel.model_validate(habit_item)
-                logger.info(f"Fetched recurring event config from DynamoDB: {habit_item}")
+                logger.info("Fetched recurring event config from DynamoDB: %s", habit_item)
                 start_datetime = datetime.combine(start_date, time(cfg.startTime.hour, cfg.startTime.minute)).replace(tzinfo=ZoneInfo(cfg.startTime.timezone))
                 end_datetime = start_datetime + timedelta(minutes=cfg.length)
                 return {
@@ -117,39 +92,20 @@ def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content,
                 else:
                     return {"result": f"Unable to open because I found {len(matches)} recurring events with title '{event_title}' matching the provided start date. Please provide the start time as well to identify the specific occurrence."}
             else:
-                logger.info(f"No matching occurrences found on {utils.pprint_date(start_date, start_time)} for recurring event '{event_title}'. This is probably due to exception dates.")
+                logger.info("No matching occurrences found on %s for recurring event '%s'. This is probably due to exception dates.", utils.pprint_date(start_date, start_time), event_title)
         else:
             return {"result": f"Cannot open event '{event_title}' without a start date and time because it is a recurring event. Please provide the start date and time to identify the specific occurrence to open."}
     else:
         logger.info("No matching habits that will autogenerate the event found on the specified date is found. Checking saved events now.")
     
-    if start_date and start_time:
-        start_datetime = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-        filters.append({"term": {"startDate": utils.to_utc_iso_z(start_datetime)}})
-        logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(start_datetime)}")
-    elif start_date:
-        start_range, end_range = utils.get_utc_day_bounds(start_date, timezone)
-        filters.append({"range": {"startDate": {"gte": utils.to_utc_iso_z(start_range), "lte": utils.to_utc_iso_z(end_range)}}})
-        logger.info(f"Added startDate range filter for search: gte {utils.to_utc_iso_z(start_range)} lte {utils.to_utc_iso_z(end_range)}")
-    elif start_time:
-        # search for today's date with the provided time
-        today_date = datetime.now(tz).date()
-        search_datetime = datetime.fromisoformat(f"{today_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-        filters.append({"term": {"startDate": utils.to_utc_iso_z(search_datetime)}})
-        logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(search_datetime)}")
-    
-    search_body["query"]["bool"]["filter"] = filters
-    opensearch_response = opensearch_client.search(
-        index="calendar-events",
-        body=search_body
-    )
+    opensearch_response = await lookup.events()
     unfiltered_hits = opensearch_response['hits']['hits']
-    logger.info(f"OpenSearch returned {len(unfiltered_hits)} hits for event open search")
+    logger.info("OpenSearch returned %s hits for event open search", len(unfiltered_hits))
     hits = []
     for hit in unfiltered_hits:
         if hit['_score'] >= 0.8:  # filter out low relevance matches
             hits.append(hit)
-        logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']} startDate: {hit['_source']['startDate']}")
+        logger.info("score: %s, title: %s startDate: %s", hit['_score'], hit['_source']['title'], hit['_source']['startDate'])
     total_found = len(hits)
     
     if total_found == 0:
@@ -166,14 +122,14 @@ def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content,
     if total_found == 1:
         # exact match
         target_doc = hits[0]
-        logger.info(f"Single matching event found for open: {target_doc['_source']['title']}")
+        logger.info("Single matching event found for open: %s", target_doc['_source']['title'])
     elif start_date and start_time:
         # filter by start date if provided
         search_dt = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
         for hit in hits:
             if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                 target_doc = hit
-                logger.info(f"Matching event found for open with start datetime: {target_doc['_source']['title']}")
+                logger.info("Matching event found for open with start datetime: %s", target_doc['_source']['title'])
                 break
         if not target_doc:
             return {"result": f"found multiple events with title '{event_title}' but none match the provided start date and time {utils.to_utc_iso_z(search_dt)}."}
@@ -188,7 +144,7 @@ def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content,
         for hit in hits:
             if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                 target_doc = hit
-                logger.info(f"Matching event found for open with start datetime: {target_doc['_source']['title']}")
+                logger.info("Matching event found for open with start datetime: %s", target_doc['_source']['title'])
                 break
         if not target_doc:
             return {"result": f"found multiple events with title '{event_title}' but none match the provided start time {start_time} on today's date."}
@@ -214,5 +170,5 @@ def open_event(ddb_client, bedrock_client, opensearch_client, user_id, content,
     else:
         return {"result": "No matching event found to open."}
   except Exception as e:
-      logger.error(f"Error during event open: {e}", exc_info=True)
+      logger.error("Error during event open: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that open request."}
\ No newline at end of file
@@ -25,10 +25,10 @@ def serialize_content_to_html(content):
         fragment = serializer.serialize_fragment(doc.content)
         return str(fragment)
     except Exception as e:
-        logger.error(f"Error serializing content to HTML: {e}", exc_info=True)
+        logger.error("Error serializing content to HTML: %s", e, exc_info=True)
         return ""
 
-def read_events(ddb_client, user_id, content, timezone):
+async def read_events(repo, user_id, content, timezone):
   try:
     tz = ZoneInfo(timezone)
     display_datetime_format = "%m/%d/%y %I:%M %p"
@@ -42,8 +42,8 @@ def read_events(ddb_client, user_id, content, timezone):
     def to_display_datetime(value: str) -> str:
         return to_local_datetime(value).strftime(display_datetime_format)
 
-    logger.info(f"Processing read_events with content: {content}")
     event_details = json.loads(content)
+    logger.info("Processing read_events with details: %s", event_details)
 
     start_date = date.fromisoformat(event_details.get("start_date")) if event_details.get("start_date") else None
     end_date = date.fromisoformat(event_details.get("end_date")) if event_details.get("end_date") else None
@@ -97,10 +97,10 @@ def read_events(ddb_client, user_id, content, timezone):
     results = []
     user_id_attr = serializer.serialize(user_id)
 
-    logger.info(f"Querying events for user {user_id} between {window_start_utc} and {window_end_utc}")
-    logger.info(f"Serialized user_id: {user_id_attr}, window_start: {serializer.serialize(window_start_utc)}, window_end: {serializer.serialize(window_end_utc)}")
-    events_response = ddb_client.query(
-        TableName='Events',
+    logger.info("Querying events for user %s between %s and %s", user_id, window_start_utc, window_end_utc)
+    logger.info("Serialized user_id: %s, window_start: %s, window_end: %s", user_id_attr, serializer.serialize(window_start_utc), serializer.serialize(window_end_utc))
+    events_response = await repo.query(
+        table_name='Events',
         IndexName='userId-startDate-index',
         KeyConditionExpression='userId = :user_id AND startDate BETWEEN :window_start AND :window_end',
         ExpressionAttributeValues={
@@ -115,7 +115,7 @@ def read_events(ddb_client, user_id, content, timezone):
         try:
             event = EventModel.model_validate(event_item)
         except Exception as e:
-            logger.warning(f"Skipping event due to validation error: {e}")
+            logger.warning("Skipping event due to validation error: %s", e)
             continue
         start_date_str = event.startDate.isoformat()
         end_date_str = event.endDate.isoformat()
@@ -130,8 +130,8 @@ def read_events(ddb_client, user_id, content, timezone):
             "done": event.done
         })
 
-    habits_response = ddb_client.query(
-        TableName='Habits',
+    habits_response = await repo.query(
+        table_name='Habits',
         KeyConditionExpression='userId = :user_id',
         ExpressionAttributeValues={':user_id': user_id_attr}
     )
@@ -141,7 +141,7 @@ def read_events(ddb_client, user_id, content, timezone):
         try:
             cfg = RepeatingEventConfigModel.model_validate(habit_item)
         except Exception as e:
-            logger.warning(f"Skipping habit due to validation error: {e}")
+            logger.warning("Skipping habit due to validation error: %s", e)
             continue
 
         current_date = start_date
@@ -179,5 +179,5 @@ def read_events(ddb_client, user_id, content, timezone):
 
     return {"result": f"Found {len(results)} events.", "events": results}
   except Exception as e:
-      logger.error(f"Error during read_events: {e}", exc_info=True)
+      logger.error("Error during read_events: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that read request."}
\ No newline at end of file
@@ -19,7 +19,7 @@ deserializer = TypeDeserializer()
 
 
 
-def update_event_content(ddb_client, lambda_client, user_id, update_request, timezone, open_event_id=None):
+async def update_event_content(repo, user_id, update_request, timezone, open_event_id=None):
   try:
     # If there is no open event, we can't update content, so we should return an appropriate message
     if not open_event_id:
@@ -27,7 +27,7 @@ def update_event_content(ddb_client, lambda_client, user_id, update_request, tim
 
     tz = ZoneInfo(timezone)
     request_details = json.loads(update_request)
-    logger.info(f"Parsed event details for update_event_content: {request_details}")
+    logger.info("Parsed event details for update_event_content: %s", request_details)
     
     action = request_details.get("action", None)
     if action == "undo":
@@ -49,16 +49,16 @@ def update_event_content(ddb_client, lambda_client, user_id, update_request, tim
       if request_details.get("change_instructions") is None:
         return {"result": "No change instructions provided. Please include change instructions to update the event content."}
       # get the event from DynamoDB
-      ddb_event_item = ddb_client.get_item(
-            TableName='Events',
-            Key={'userId': {'S': user_id}, 'id': {'S': open_event_id}}
+      ddb_event_item = await repo.get_item(
+            table_name='Events',
+            key={'userId': {'S': user_id}, 'id': {'S': open_event_id}}
         )
       if not ddb_event_item.get('Item'):
         return {"result": f"Could not find the event in the database for that eventId."}
-      logger.info(f"Fetched event item from DynamoDB for update: {ddb_event_item}")
+      logger.info("Fetched event item from DynamoDB for update: %s", ddb_event_item)
       event_item = {k: deserializer.deserialize(v) for k, v in ddb_event_item['Item'].items()}
       event_content = event_item.get("content")  
-      updated_doc = utils.generate_update_content(lambda_client, user_id, request_details["change_instructions"], event_content)
+      updated_doc = await repo.generate_content(request_details["change_instructions"], event_content)
       
       return {
         "result": "Updated the event content.",
@@ -71,5 +71,5 @@ def update_event_content(ddb_client, lambda_client, user_id, update_request, tim
       }
       
   except Exception as e:
-      logger.error(f"Error during event content update: {e}", exc_info=True)
+      logger.error("Error during event content update: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that update request."}
\ No newline at end of file
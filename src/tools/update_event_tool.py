@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 from models.repeating_event_config_model import HabitIndexModel, RepeatingEventConfigModel
 from models.event_model import EventIndexModel, EventModel
 import utils
+from tools.candidate_lookup import candidate_lookup
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -26,12 +27,11 @@ def _normalize_event_dump(event_dict):
 
     
 
-def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, user_id, content, timezone):
+async def update_event(repo, user_id, content, timezone, lookup=None):
   try:
     tz = ZoneInfo(timezone)
-    logger.info(f"Processing update_event with content: {content}")
     event_details = json.loads(content)
-    logger.info(f"Parsed event details for update: {event_details}")
+    logger.info("Parsed event details for update: %s", event_details)
     to_update_fields = {k: v for k, v in event_details.items() if k not in ["current_title", "current_start_date", "current_start_time", "this_event_only", "this_and_future_events"] and v is not None}
     event_title = event_details.get("current_title")
     
@@ -45,45 +45,23 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
     # logger.info(f"The new_start_datetime to update to is: {new_start_datetime}")
     
     # return {"result": "The update_event tool is under development and not yet implemented."}
-    logger.info(f"Searching for event to update: title='{event_title}', start_date='{start_date}', start_time='{start_time}'")
+    logger.info("Searching for event to update: title='%s', start_date='%s', start_time='%s'", event_title, start_date, start_time)
 
     # Vectorize and Hybrid Search to find candidate events
-    embed_response = bedrock_client.invoke_model(
-        body=json.dumps({"inputText": event_title}),
-        modelId="amazon.titan-embed-text-v1"
-    )
-    query_vector = json.loads(embed_response['body'].read())['embedding']
-    logger.info(f"Generated embedding for event title: {event_title}")
-    filters = [{"term": {"userId": user_id}}]
-        
-    # Search OpenSearch habits index for matching title 
-    search_body ={
-        "size": 5,
-        "track_total_hits": True,
-        "query": {
-            "bool": {
-                "filter": filters,
-                "must": [
-                    {"knn": {"title_vector": {"vector": query_vector, "k": 5}}},
-                ],
-            }
-        }
-    }
-    opensearch_habits_response = opensearch_client.search(
-        index="habits",
-        body=search_body
-    )
+    # Reuses the lookups started when the toolUse arrived, if the session made them
+    lookup = candidate_lookup(lookup, repo, user_id, event_title, start_date, start_time, timezone)
+    opensearch_habits_response = await lookup.habits()
     matching_habit_names_found = opensearch_habits_response['hits']['total']['value']
-    logger.info(f"Found {matching_habit_names_found} matching habits: ")
+    logger.info("Found %s matching habits: ", matching_habit_names_found)
     unfiltered_habit_hits = opensearch_habits_response['hits']['hits']
     habit_hits = []
     for hit in unfiltered_habit_hits:
         if hit['_score'] >= 0.8:  # filter out low relevance matches
             habit_hits.append(hit)
-        logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']}")
+        logger.info("score: %s, title: %s", hit['_score'], hit['_source']['title'])
         
     if len(habit_hits) > 0:
-        logger.info(f"Found {len(habit_hits)} matching habits with title '{event_title}'")
+        logger.info("Found %s matching habits with title '%s'", len(habit_hits), event_title)
         if start_date:
             matches = []
             # Find the habit configs that repeat on the target date and time
@@ -96,30 +74,27 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                         start_datetime_obj = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=new_tz)
                         if new_dt == start_datetime_obj:
                             matches.append(habit_hit)
-                            logger.info(f"Found a repeating event config that matches the title and time and repeats on the target date {start_date}")
+                            logger.info("Found a repeating event config that matches the title and time and repeats on the target date %s", start_date)
                     else:
                         matches.append(habit_hit)
-                        logger.info(f"Found a repeating event config that matches the title and repeats on the target date {start_date}")
+                        logger.info("Found a repeating event config that matches the title and repeats on the target date %s", start_date)
             
             # If we have exactly one match, proceed to update
             if len(matches) == 1:
                 # get the habit data from DynamoDB
                 habitId = matches[0]['_source']['habitId']
-                ddb_habit_item = ddb_client.get_item(
-                    TableName='Habits',
-                    Key={'userId': {'S': cfg.userId}, 'id': {'S': habitId}}
-                )
+                ddb_habit_item = await lookup.get_item('Habits', {'userId': {'S': cfg.userId}, 'id': {'S': habitId}})
                 if not ddb_habit_item.get('Item'):
                     return {"result": f"Could not find the recurring event config in the database for title '{event_title}'."}
                 habit_item = {k: deserializer.deserialize(v) for k, v in ddb_habit_item['Item'].items()}
                 cfg = RepeatingEventConfigModel.model_validate(habit_item)
-                logger.info(f"Fetched recurring event config from DynamoDB: {habit_item}")
+                logger.info("Fetched recurring event config from DynamoDB: %s", habit_item)
                 start_datetime = datetime.combine(start_date, time(cfg.startTime.hour, cfg.startTime.minute)).replace(tzinfo=ZoneInfo(cfg.startTime.timezone))
                 end_datetime = start_datetime + timedelta(minutes=cfg.length)
                 try:
                     allDay_value = utils.get_new_all_day(cfg.allDay, to_update_fields)
                 except Exception as e:
-                    logger.error(f"Error determining allDay value for update: {e}", exc_info=True)
+                    logger.error("Error determining allDay value for update: %s", e, exc_info=True)
                     return {"result": f"Error {e}"}
                 new_start_datetime = utils.get_new_start_datetime(start_datetime, new_start_date, new_start_time)
                 new_end_datetime = utils.get_new_end_datetime(
@@ -136,14 +111,14 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                     return {"result": "Unable to determine new end datetime for the updated event occurrence."}
                 
                 if event_details.get("this_event_only", False):
-                    logger.info(f"Updating only this occurrence on {start_datetime} for recurring event '{matches[0]['_source']['title']}'")
+                    logger.info("Updating only this occurrence on %s for recurring event '%s'", start_datetime, matches[0]['_source']['title'])
                     new_exception_dates = cfg.exceptionDates or []
                     new_exception_dates.append(start_datetime.date())
                     update_expression = "SET exceptionDates = :ed"
                     expression_attribute_values = {":ed": serializer.serialize(utils._to_dynamodb_compatible(new_exception_dates))}
-                    ddb_client.update_item(
-                        TableName='Habits',
-                        Key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
+                    await repo.update_item(
+                        table_name='Habits',
+                        key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
                         UpdateExpression=update_expression,
                         ExpressionAttributeValues=expression_attribute_values
                     )
@@ -154,7 +129,7 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                     #     refresh=True
                     # )
                     
-                    logger.info(f"Added {start_datetime} to the repeating event config's exception dates")
+                    logger.info("Added %s to the repeating event config's exception dates", start_datetime)
                     new_event = {
                         "id": str(uuid.uuid4()),
                         "userId": cfg.userId,
@@ -165,7 +140,7 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                         "type": to_update_fields.get("type", cfg.eventType),
                         "fixed": to_update_fields.get("fixed", cfg.fixed),
                         "priority": to_update_fields.get("priority", cfg.priority),
-                        "content": utils.generate_update_content(lambda_client, user_id, to_update_fields["body_update_prompt"], cfg.content) if to_update_fields.get("body_update_prompt") else cfg.content,
+                        "content": await repo.generate_content(to_update_fields["body_update_prompt"], cfg.content) if to_update_fields.get("body_update_prompt") else cfg.content,
                         "startDate": utils.to_utc_iso_z(new_start_datetime),
                         "endDate": utils.to_utc_iso_z(new_end_datetime),
                         "notifications": utils.add_ids_to_notifications(to_update_fields.get("notifications")) if to_update_fields.get("notifications") else cfg.notifications,
@@ -176,24 +151,24 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                     )
                     # save to DynamoDB
                     ddb_event_item= {k: serializer.serialize(v) for k, v in new_event.items()}
-                    ddb_client.put_item(TableName='Events', Item=ddb_event_item)
-                    logger.info(f"Updated single event occurrence in DynamoDB: {new_event}")   
+                    await repo.put_item(table_name='Events', item=ddb_event_item)
+                    logger.info("Updated single event occurrence in DynamoDB: %s", new_event)
                     return {
                         "result": f"Successfully updated only the occurrence on {start_datetime.strftime('%m/%d/%Y %I:%M %p')} for recurring event '{matches[0]['_source']['title']}'.",
                         "new_event": new_event,
                         "new_exception_dates": new_exception_dates
                     }
                 elif event_details.get("this_and_future_events", False):
-                    logger.info(f"Updating this and future occurrences from {start_datetime} for recurring event '{matches[0]['_source']['title']}'")
+                    logger.info("Updating this and future occurrences from %s for recurring event '%s'", start_datetime, matches[0]['_source']['title'])
                     
                     # stop the current repeating event config
                     new_stop_date = start_datetime.date()
                     cfg.stopDate = new_stop_date
                     update_expression = "SET stopDate = :sd"
                     expression_attribute_values = {":sd": serializer.serialize(utils._to_dynamodb_compatible(new_stop_date))}
-                    ddb_client.update_item(
-                        TableName='Habits',
-                        Key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
+                    await repo.update_item(
+                        table_name='Habits',
+                        key={'userId': {'S': cfg.userId}, 'id': {'S': cfg.id}},
                         UpdateExpression=update_expression,
                         ExpressionAttributeValues=expression_attribute_values
                     )
@@ -210,12 +185,12 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                     #     body={"doc": {"stopDate": new_stop_date.isoformat()}},
                     #     refresh=True
                     # )
-                    logger.info(f"Set the stop date of the current repeating event config to {new_stop_date}")
+                    logger.info("Set the stop date of the current repeating event config to %s", new_stop_date)
                     new_repeat_config = {
                         "id": str(uuid.uuid4()),
                         "userId": cfg.userId,
                         "name": to_update_fields.get("new_title", cfg.name),
-                        "content": utils.generate_update_content(lambda_client, user_id, to_update_fields["body_update_prompt"], cfg.content) if to_update_fields.get("body_update_prompt") else cfg.content,
+                        "content": await repo.generate_content(to_update_fields["body_update_prompt"], cfg.content) if to_update_fields.get("body_update_prompt") else cfg.content,
                         "creationDate": new_start_datetime.date().strftime('%Y-%m-%d'),
                         "type": to_update_fields.get("type", cfg.eventType),
                         "priority": to_update_fields.get("priority", cfg.priority),
@@ -235,11 +210,11 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                         "length": to_update_fields.get("new_length_minutes", cfg.length),
                     }
                     ddb_habit_item= {k: serializer.serialize(utils._to_dynamodb_compatible(v)) for k, v in new_repeat_config.items()}
-                    ddb_client.put_item(TableName='Habits', Item=ddb_habit_item)
-                    logger.info(f"Created new repeating event config in DynamoDB: {new_repeat_config}")
+                    await repo.put_item(table_name='Habits', item=ddb_habit_item)
+                    logger.info("Created new repeating event config in DynamoDB: %s", new_repeat_config)
                     
                     
-                    logger.info(f"Updated this and future occurrences from {start_datetime} for recurring event '{matches[0]['_source']['title']}'")
+                    logger.info("Updated this and future occurrences from %s for recurring event '%s'", start_datetime, matches[0]['_source']['title'])
                     return {"result": f"Successfully updated this and future occurrences from {start_datetime.strftime('%m/%d/%Y %I:%M %p')} for recurring event '{matches[0]['_source']['title']}'.",
                             "new_repeat_config": new_repeat_config,
                             "updated_repeat_config": updated_repeat_config
@@ -252,39 +227,20 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 else:
                     return {"result": f"Unable to update because I found {len(matches)} recurring events with title '{event_title}' matching the provided start date. Please provide the start time as well to identify the specific occurrence."}
             else:
-                logger.info(f"No matching occurrences found on {utils.pprint_date(start_date, start_time)} for recurring event '{event_title}'. This is probably due to exception dates.")
+                logger.info("No matching occurrences found on %s for recurring event '%s'. This is probably due to exception dates.", utils.pprint_date(start_date, start_time), event_title)
         else:
             return {"result": f"Cannot update event '{event_title}' without a start date and time because it is a recurring event. Please provide the start date and time to identify the specific occurrence to update."}
     else:
         logger.info("No matching habits that will autogenerate the event found on the specified date is found. Checking saved events now.")
     
-    if start_date and start_time:
-        start_datetime = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-        filters.append({"term": {"startDate": utils.to_utc_iso_z(start_datetime)}})
-        logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(start_datetime)}")
-    elif start_date:
-        start_range, end_range = utils.get_utc_day_bounds(start_date, timezone)
-        filters.append({"range": {"startDate": {"gte": utils.to_utc_iso_z(start_range), "lte": utils.to_utc_iso_z(end_range)}}})
-        logger.info(f"Added startDate range filter for search: gte {utils.to_utc_iso_z(start_range)} lte {utils.to_utc_iso_z(end_range)}")
-    elif start_time:
-        # search for today's date with the provided time
-        today_date = datetime.now(tz).date()
-        search_datetime = datetime.fromisoformat(f"{today_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
-        filters.append({"term": {"startDate": utils.to_utc_iso_z(search_datetime)}})
-        logger.info(f"Added startDate term filter for search: {utils.to_utc_iso_z(search_datetime)}")
-    
-    search_body["query"]["bool"]["filter"] = filters
-    opensearch_response = opensearch_client.search(
-        index="calendar-events",
-        body=search_body
-    )
+    opensearch_response = await lookup.events()
     unfiltered_hits = opensearch_response['hits']['hits']
-    logger.info(f"OpenSearch returned {len(unfiltered_hits)} hits for event update search")
+    logger.info("OpenSearch returned %s hits for event update search", len(unfiltered_hits))
     hits = []
     for hit in unfiltered_hits:
         if hit['_score'] >= 0.8:  # filter out low relevance matches
             hits.append(hit)
-        logger.info(f"score: {hit['_score']}, title: {hit['_source']['title']} startDate: {hit['_source']['startDate']}")
+        logger.info("score: %s, title: %s startDate: %s", hit['_score'], hit['_source']['title'], hit['_source']['startDate'])
     total_found = len(hits)
     
     if total_found == 0:
@@ -301,14 +257,14 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
     if total_found == 1:
         # exact match
         target_doc = hits[0]
-        logger.info(f"Single matching event found for update: {target_doc['_source']['title']}")
+        logger.info("Single matching event found for update: %s", target_doc['_source']['title'])
     elif start_date and start_time:
         # filter by start date if provided
         search_dt = datetime.fromisoformat(f"{start_date.isoformat()}T{start_time}:00").replace(tzinfo=tz)
         for hit in hits:
             if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                 target_doc = hit
-                logger.info(f"Matching event found for update with start datetime: {target_doc}")
+                logger.info("Matching event found for update with start datetime: %s", target_doc)
                 break
         if not target_doc:
             return {"result": f"found multiple events with title '{event_title}' but none match the provided start date and time {utils.to_utc_iso_z(search_dt)}."}
@@ -322,7 +278,7 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
         for hit in hits:
             if hit['_source']['startDate'] == utils.to_utc_iso_z(search_dt):
                 target_doc = hit
-                logger.info(f"Matching event found for update with start datetime: {target_doc}")
+                logger.info("Matching event found for update with start datetime: %s", target_doc)
                 break
         if not target_doc:
             return {"result": f"found multiple events with title '{event_title}' but none match the provided start time {start_time} on today's date."}
@@ -340,13 +296,10 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
         habitId = target_doc['_source'].get('habitId', None)
         
         # get the event from DynamoDB
-        ddb_event_item = ddb_client.get_item(
-            TableName='Events',
-            Key={'userId': {'S': user_id}, 'id': {'S': eventId}}
-        )
+        ddb_event_item = await lookup.get_item('Events', {'userId': {'S': user_id}, 'id': {'S': eventId}})
         if not ddb_event_item.get('Item'):
             return {"result": f"Could not find the event in the database for title '{event_title}'."}
-        logger.info(f"Fetched event item from DynamoDB for update: {ddb_event_item}")
+        logger.info("Fetched event item from DynamoDB for update: %s", ddb_event_item)
         event_item = {k: deserializer.deserialize(v) for k, v in ddb_event_item['Item'].items()}
         validated_existing_event = EventModel.model_validate(event_item)
         event_item = _normalize_event_dump(
@@ -356,13 +309,13 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
         # calculate the new start and end datetimes based on the provided update fields and current datetimes (and the allDay value)
         current_start_datetime = datetime.fromisoformat(event_item['startDate']).astimezone(tz)
         current_end_datetime = datetime.fromisoformat(event_item['endDate']).astimezone(tz)
-        logger.info(f"Current start datetime of the event occurrence to update: {current_start_datetime.strftime('%m/%d/%y %I:%M %p')}")
-        logger.info(f"Current end datetime of the event occurrence to update: {current_end_datetime.strftime('%m/%d/%y %I:%M %p')}")
+        logger.info("Current start datetime of the event occurrence to update: %s", current_start_datetime.strftime('%m/%d/%y %I:%M %p'))
+        logger.info("Current end datetime of the event occurrence to update: %s", current_end_datetime.strftime('%m/%d/%y %I:%M %p'))
         current_length = int((current_end_datetime - current_start_datetime).total_seconds() / 60)
         try:
             allDay_value = utils.get_new_all_day(event_item.get("allDay", False), to_update_fields)
         except Exception as e:
-            logger.error(f"Error determining allDay value for update: {e}", exc_info=True)
+            logger.error("Error determining allDay value for update: %s", e, exc_info=True)
             return {"result": f"Error {e}"}
         new_start_datetime = utils.get_new_start_datetime(current_start_datetime, new_start_date, new_start_time)
         new_end_datetime = utils.get_new_end_datetime(
@@ -375,8 +328,8 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 new_end_time_str= to_update_fields.get("new_end_time", None),
                 new_length_minutes= int(to_update_fields.get("new_length_minutes", None)) if to_update_fields.get("new_length_minutes", None) else None
         )
-        logger.info(f"Calculated new start datetime for the event occurrence: {new_start_datetime.strftime('%m/%d/%y %I:%M %p')}")
-        logger.info(f"Calculated new end datetime for the event occurrence: {new_end_datetime.strftime('%m/%d/%y %I:%M %p')}")
+        logger.info("Calculated new start datetime for the event occurrence: %s", new_start_datetime.strftime('%m/%d/%y %I:%M %p'))
+        logger.info("Calculated new end datetime for the event occurrence: %s", new_end_datetime.strftime('%m/%d/%y %I:%M %p'))
         
         if new_end_datetime is None:
             return {"result": "Unable to determine new end datetime for the updated event occurrence."}
@@ -390,7 +343,7 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                         "type": to_update_fields.get("type", event_item.get("type", "personal")),
                         "fixed": to_update_fields.get("fixed", event_item.get("fixed", False)),
                         "priority": to_update_fields.get("priority", event_item.get("priority", None)),
-                        "content": utils.generate_update_content(lambda_client, user_id, to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None),
+                        "content": await repo.generate_content(to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None),
                         "startDate": utils.to_utc_iso_z(new_start_datetime),
                         "endDate": utils.to_utc_iso_z(new_end_datetime),
                         "notifications": utils.add_ids_to_notifications(to_update_fields.get("notifications")) if to_update_fields.get("notifications") else event_item.get("notifications", [])
@@ -402,28 +355,28 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 )
                 # save to DynamoDB
                 ddb_event_item= {k: serializer.serialize(v) for k, v in updated_event.items()}
-                ddb_client.put_item(TableName='Events', Item=ddb_event_item)
-                logger.info(f"Updated single event occurrence in DynamoDB: {updated_event}")
+                await repo.put_item(table_name='Events', item=ddb_event_item)
+                logger.info("Updated single event occurrence in DynamoDB: %s", updated_event)
                 return {"result": f"Successfully updated only the occurrence on {datetime.fromisoformat(target_doc['_source']['startDate']).astimezone(tz).strftime('%m/%d/%y %I:%M %p')} for recurring event '{event_title}'.",
                         "updated_event": updated_event}
             elif event_details.get("this_and_future_events", False):
                 # get the repeat config data from DynamoDB
-                ddb_config_item = ddb_client.get_item(
-                    TableName='Habits',
-                    Key={'userId': {'S': user_id}, 'id': {'S': habitId}}
+                ddb_config_item = await repo.get_item(
+                    table_name='Habits',
+                    key={'userId': {'S': user_id}, 'id': {'S': habitId}}
                 )
                 if not ddb_config_item.get('Item'):
                     return {"result": f"Could not find the recurring event config in the database for title '{event_title}'."}
                 
                 # Update the current repeat config to set stopDate
                 config_item = {k: deserializer.deserialize(v) for k, v in ddb_config_item['Item'].items()}
-                logger.info(f"Fetched recurring event config from DynamoDB: {config_item}")
+                logger.info("Fetched recurring event config from DynamoDB: %s", config_item)
                 cfg = RepeatingEventConfigModel.model_validate(config_item)
                 new_stop_date = current_start_datetime.date()
                 cfg.stopDate = new_stop_date
                 
                 # content value to be used for the updated event occurrence and the new repeat config
-                content_value = utils.generate_update_content(lambda_client, user_id, to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None)
+                content_value = await repo.generate_content(to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None)
                 
                 # used for unit test
                 updated_repeat_config = {k: serializer.serialize(utils._to_dynamodb_compatible(v))
@@ -434,9 +387,9 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 # update the current config to set stopDate in DynamoDB (and OpenSearch)
                 update_expression = "SET stopDate = :sd"
                 expression_attribute_values = {":sd": serializer.serialize(utils._to_dynamodb_compatible(new_stop_date))}
-                ddb_client.update_item(
-                    TableName='Habits',
-                    Key={'userId': {'S': user_id}, 'id': {'S': cfg.id}},
+                await repo.update_item(
+                    table_name='Habits',
+                    key={'userId': {'S': user_id}, 'id': {'S': cfg.id}},
                     UpdateExpression=update_expression,
                     ExpressionAttributeValues=expression_attribute_values
                 )
@@ -467,8 +420,8 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 }
                 # save new repeat config to DynamoDB
                 new_ddb_config_item= {k: serializer.serialize(utils._to_dynamodb_compatible(v)) for k, v in new_repeat_config.items()}
-                ddb_client.put_item(TableName='Habits', Item=new_ddb_config_item)
-                logger.info(f"Created new repeating event config in DynamoDB: {new_repeat_config}")
+                await repo.put_item(table_name='Habits', item=new_ddb_config_item)
+                logger.info("Created new repeating event config in DynamoDB: %s", new_repeat_config)
                 
                 # Now update the event occurrence
                 updated_fields = {
@@ -490,8 +443,8 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                 )
                 # save to DynamoDB
                 ddb_event_item= {k: serializer.serialize(v) for k, v in updated_event.items()}
-                ddb_client.put_item(TableName='Events', Item=ddb_event_item)
-                logger.info(f"Updated single event occurrence in DynamoDB: {updated_event}")
+                await repo.put_item(table_name='Events', item=ddb_event_item)
+                logger.info("Updated single event occurrence in DynamoDB: %s", updated_event)
                 
                 return {"result": f"Successfully updated this and future occurrences from {datetime.fromisoformat(target_doc['_source']['startDate']).astimezone(tz).strftime('%m/%d/%y %I:%M %p')} for recurring event '{event_title}'." ,
                         "updated_repeat_config": updated_repeat_config,
@@ -508,7 +461,7 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
                     "type": to_update_fields.get("type", event_item.get("type", "personal")),
                     "fixed": to_update_fields.get("fixed", event_item.get("fixed", False)),
                     "priority": to_update_fields.get("priority", event_item.get("priority", None)),
-                    "content": utils.generate_update_content(lambda_client, user_id, to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None),
+                    "content": await repo.generate_content(to_update_fields["body_update_prompt"], event_item.get("content", None)) if to_update_fields.get("body_update_prompt") else event_item.get("content", None),
                     "startDate": utils.to_utc_iso_z(new_start_datetime),
                     "endDate": utils.to_utc_iso_z(new_end_datetime),
                     "notifications": utils.add_ids_to_notifications(to_update_fields.get("notifications")) if to_update_fields.get("notifications") else event_item.get("notifications", [])
@@ -520,13 +473,13 @@ def update_event(ddb_client, lambda_client, bedrock_client, opensearch_client, u
             )
             # save to DynamoDB
             ddb_event_item= {k: serializer.serialize(v) for k, v in updated_event.items()}
-            ddb_client.put_item(TableName='Events', Item=ddb_event_item)
-            logger.info(f"Updated nonrepeating event in DynamoDB: {updated_event}")  
+            await repo.put_item(table_name='Events', item=ddb_event_item)
+            logger.info("Updated nonrepeating event in DynamoDB: %s", updated_event)
         
         return {"result": f"Successfully updated the event '{event_title}'.",
                 "updated_event": updated_event}
     else:
         return {"result": "No matching event found to update."}
   except Exception as e:
-      logger.error(f"Error during event update: {e}", exc_info=True)
+      logger.error("Error during event update: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that update request."}
\ No newline at end of file
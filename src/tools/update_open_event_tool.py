@@ -20,7 +20,7 @@ deserializer = TypeDeserializer()
 
 
 
-def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, timezone, open_event_id=None, open_event_pre_last_update=None):
+async def update_open_event_tool(repo, user_id, update_request, timezone, open_event_id=None, open_event_pre_last_update=None):
   try:
     # If there is no open event, we can't update content, so we should return an appropriate message
     if not open_event_id:
@@ -28,7 +28,7 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
 
     tz = ZoneInfo(timezone)
     request_details = json.loads(update_request)
-    logger.info(f"Parsed event details for update_open_event: {request_details}")
+    logger.info("Parsed event details for update_open_event: %s", request_details)
     
     action = request_details.get("action", None)
     if action == "undo":
@@ -60,14 +60,14 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
 
       try:
         ddb_snapshot_item = {k: serializer.serialize(v) for k, v in snapshot_event_data.items()}
-        logger.info(f"Restoring prior event snapshot in DynamoDB for eventId {open_event_id} and userId {user_id}. Snapshot data: {snapshot_event_data}")
-        ddb_client.put_item(
-          TableName='Events',
-          Item=ddb_snapshot_item
+        logger.info("Restoring prior event snapshot in DynamoDB for eventId %s and userId %s. Snapshot data: %s", open_event_id, user_id, snapshot_event_data)
+        await repo.put_item(
+          table_name='Events',
+          item=ddb_snapshot_item
         )
-        logger.info(f"Successfully restored prior event snapshot for eventId {open_event_id} and userId {user_id}")
+        logger.info("Successfully restored prior event snapshot for eventId %s and userId %s", open_event_id, user_id)
       except Exception as e:
-        logger.error(f"Error undoing event update in DynamoDB: {e}", exc_info=True)
+        logger.error("Error undoing event update in DynamoDB: %s", e, exc_info=True)
         return {"result": "Sorry, I couldn't undo the event update in the database."}
 
       return {
@@ -101,13 +101,13 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
         return frequency_str
 
       # get the event from DynamoDB
-      ddb_event_item = ddb_client.get_item(
-            TableName='Events',
-            Key={'userId': {'S': user_id}, 'id': {'S': open_event_id}}
+      ddb_event_item = await repo.get_item(
+            table_name='Events',
+            key={'userId': {'S': user_id}, 'id': {'S': open_event_id}}
         )
       if not ddb_event_item.get('Item'):
         return {"result": f"Could not find the event in the database for that eventId."}
-      logger.info(f"Fetched event item from DynamoDB for update: {ddb_event_item}")
+      logger.info("Fetched event item from DynamoDB for update: %s", ddb_event_item)
       event_item = {k: deserializer.deserialize(v) for k, v in ddb_event_item['Item'].items()}
       current_start_datetime = datetime.fromisoformat(event_item["startDate"]).replace(tzinfo=tz)
       current_end_datetime = datetime.fromisoformat(event_item["endDate"]).replace(tzinfo=tz)
@@ -127,7 +127,7 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
         elif key == "notifications":
           updated_fields["notifications"] = utils.add_ids_to_notifications(value)
         elif key == "tasks_content_prompt":
-          updated_fields["content"] = utils.generate_update_content(lambda_client, user_id, value, event_item.get("content", None))
+          updated_fields["content"] = await repo.generate_content(value, event_item.get("content", None))
         elif key == "start_date":
           new_start_date = date.fromisoformat(value)
           new_start_datetime = utils.get_new_start_datetime(
@@ -195,9 +195,9 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
         # stop_date is currently accepted but intentionally ignored for new config creation.
         if event_item.get("habitId"):
           old_habit_id = event_item["habitId"]
-          ddb_config_item = ddb_client.get_item(
-            TableName='Habits',
-            Key={'userId': {'S': user_id}, 'id': {'S': old_habit_id}}
+          ddb_config_item = await repo.get_item(
+            table_name='Habits',
+            key={'userId': {'S': user_id}, 'id': {'S': old_habit_id}}
           )
           if not ddb_config_item.get('Item'):
             return {"result": "Could not find the recurring event config in the database for the open event."}
@@ -206,9 +206,9 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
           cfg = RepeatingEventConfigModel.model_validate(config_item)
 
           new_stop_date = current_start_datetime.date()
-          ddb_client.update_item(
-            TableName='Habits',
-            Key={'userId': {'S': user_id}, 'id': {'S': cfg.id}},
+          await repo.update_item(
+            table_name='Habits',
+            key={'userId': {'S': user_id}, 'id': {'S': cfg.id}},
             UpdateExpression="SET stopDate = :sd",
             ExpressionAttributeValues={":sd": serializer.serialize(utils._to_dynamodb_compatible(new_stop_date))}
           )
@@ -242,7 +242,7 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
             k: serializer.serialize(utils._to_dynamodb_compatible(v))
             for k, v in normalized_repeat.items()
           }
-          ddb_client.put_item(TableName='Habits', Item=ddb_habit_item)
+          await repo.put_item(table_name='Habits', item=ddb_habit_item)
           updated_fields["habitId"] = normalized_repeat["id"]
         else:
           new_repeat_config = {
@@ -274,20 +274,20 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
             k: serializer.serialize(utils._to_dynamodb_compatible(v))
             for k, v in normalized_repeat.items()
           }
-          ddb_client.put_item(TableName='Habits', Item=ddb_habit_item)
+          await repo.put_item(table_name='Habits', item=ddb_habit_item)
           updated_fields["habitId"] = normalized_repeat["id"]
       
       
       updated_event = {**event_item, **updated_fields}
       try:
         ddb_event_item= {k: serializer.serialize(v) for k, v in updated_event.items()}
-        ddb_client.put_item(
-          TableName='Events',
-          Item=ddb_event_item
+        await repo.put_item(
+          table_name='Events',
+          item=ddb_event_item
         )
-        logger.info(f"Successfully updated event in DynamoDB with eventId {open_event_id} for userId {user_id}. Updated fields: {updated_fields.keys()}")
+        logger.info("Successfully updated event in DynamoDB with eventId %s for userId %s. Updated fields: %s", open_event_id, user_id, updated_fields.keys())
       except Exception as e:
-        logger.error(f"Error updating event in DynamoDB: {e}", exc_info=True)
+        logger.error("Error updating event in DynamoDB: %s", e, exc_info=True)
         return {"result": "Sorry, I couldn't update the event in the database."}
       
       return {
@@ -300,5 +300,5 @@ def update_open_event_tool(ddb_client, lambda_client, user_id, update_request, t
       }
       
   except Exception as e:
-      logger.error(f"Error during event content update: {e}", exc_info=True)
+      logger.error("Error during event content update: %s", e, exc_info=True)
       return {"result": "Sorry, I couldn't process that update request."}
\ No newline at end of file
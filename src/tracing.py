@@ -0,0 +1,138 @@
+"""OpenTelemetry spans for voice turns and tool calls.
+
+The container runs under ``opentelemetry-instrument``, which installs the
+tracer provider, sampler and exporter (``OTEL_TRACES_SAMPLER`` and friends).
+This module only uses the OpenTelemetry API, so it produces nothing unless a
+provider is configured, and every helper degrades to a no-op when the
+``opentelemetry`` package is not installed at all.
+
+For local runs without the instrument wrapper, ``configure_local_tracing()``
+sets up a sampled SDK provider that exports to the collector stand-in named by
+``CLARITY_TRACE_COLLECTOR``: ``console`` prints finished spans, anything else
+is treated as an OTLP/HTTP traces endpoint (e.g. a local Jaeger or
+otel-collector at ``http://localhost:4318/v1/traces``).
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # tracing is optional
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "clarity-agent"
+# Fraction of new traces kept by the local provider; the container uses OTEL_TRACES_SAMPLER_ARG.
+DEFAULT_SAMPLE_RATIO = float(os.getenv("CLARITY_TRACE_SAMPLE_RATIO", "0.1"))
+
+_tracer = trace.get_tracer(TRACER_NAME) if trace is not None else None
+
+
+def enabled():
+    return _tracer is not None
+
+
+def now_ns():
+    """Wall-clock timestamp in the form span start/end times expect."""
+    return time.time_ns()
+
+
+@contextmanager
+def span(name, attributes=None, parent=None, start_time=None):
+    """Run the block inside a span that is current (visible to child spans and worker threads)."""
+    if _tracer is None:
+        yield None
+        return
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    with _tracer.start_as_current_span(name, context=context, attributes=attributes, start_time=start_time) as current:
+        yield current
+
+
+def start_span(name, attributes=None, parent=None, start_time=None):
+    """Start a span that outlives the current task (ended later with ``end_span``)."""
+    if _tracer is None:
+        return None
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    return _tracer.start_span(name, context=context, attributes=attributes, start_time=start_time)
+
+
+def end_span(current, attributes=None, error=None):
+    if current is None:
+        return
+    if attributes:
+        current.set_attributes(attributes)
+    if error is not None:
+        current.record_exception(error)
+        current.set_status(Status(StatusCode.ERROR, str(error)))
+    current.end()
+
+
+class TracedClient:
+    """Proxy that wraps every method call of an AWS/OpenSearch client in a child span.
+
+    Tool functions run in executor threads with the tool span's context copied
+    in, so these spans nest under the tool call that made them.
+    """
+
+    def __init__(self, client, service, span_names=None):
+        self._client = client
+        self._service = service
+        self._span_names = span_names or {}
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+        span_name = self._span_names.get(name, f"{self._service}.{name}")
+        service = self._service
+
+        def traced(*args, **kwargs):
+            with span(span_name, {"clarity.service": service, "clarity.operation": name}):
+                return attribute(*args, **kwargs)
+
+        return traced
+
+
+def traced_client(client, service, span_names=None):
+    """Return ``client`` wrapped in a ``TracedClient`` when tracing is available."""
+    if _tracer is None or client is None:
+        return client
+    return TracedClient(client, service, span_names)
+
+
+def configure_local_tracing():
+    """Install a sampled SDK provider for ``CLARITY_TRACE_COLLECTOR`` unless one is already set up."""
+    collector = os.getenv("CLARITY_TRACE_COLLECTOR")
+    if not collector or trace is None:
+        return False
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        logger.info("Tracer provider already configured (opentelemetry-instrument); leaving it in place")
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+        if collector == "console":
+            exporter = ConsoleSpanExporter()
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            exporter = OTLPSpanExporter(endpoint=collector)
+    except ImportError as e:
+        logger.warning(f"CLARITY_TRACE_COLLECTOR is set but the OpenTelemetry SDK/exporter is missing: {e}")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TRACER_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(DEFAULT_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing {DEFAULT_SAMPLE_RATIO:.0%} of turns to {collector}")
+    return True
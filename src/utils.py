@@ -554,7 +554,7 @@ def generate_update_content(lambda_client, user_id, prompt, event_content):
         "prompt": prompt,
         "content": event_content
     }
-    logger.info(f"Payload for content update Lambda: {payload}")
+    logger.info("Payload for content update Lambda: %s", payload)
     response = lambda_client.invoke(
         FunctionName='clarityGenerateEditorContentService',
         InvocationType='RequestResponse',
@@ -583,7 +583,7 @@ def generate_update_content(lambda_client, user_id, prompt, event_content):
     elif result_body is None:
         result_body = {}
 
-    logger.info(f"Lambda result for content update: {lambda_result}")
+    logger.info("Lambda result for content update: %s", lambda_result)
     return result_body.get("doc", empty_doc)
 
 
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from embedding_cache import embedding_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_embedding_cache():
+    # Tests stub Bedrock with different vectors for the same titles.
+    embedding_cache.clear()
+    yield
+    embedding_cache.clear()
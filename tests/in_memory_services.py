@@ -0,0 +1,143 @@
+"""In-memory stand-ins for the AWS services used by the calendar tools.
+
+They implement just enough of the boto3 / opensearch-py client surface for the
+repository and tool code paths exercised in tests.
+"""
+import hashlib
+import json
+import math
+import re
+from io import BytesIO
+
+
+class InMemoryDynamoDB:
+    """Items keyed by table, then by (userId, id), stored in DynamoDB attribute-value form."""
+
+    def __init__(self):
+        self.tables = {}
+        self.calls = []
+
+    def _table(self, name):
+        return self.tables.setdefault(name, {})
+
+    @staticmethod
+    def _key(key):
+        return tuple(sorted((k, json.dumps(v, sort_keys=True)) for k, v in key.items()))
+
+    def put_item(self, TableName, Item, **kwargs):
+        self.calls.append(("put_item", TableName))
+        self._table(TableName)[self._key({"userId": Item["userId"], "id": Item["id"]})] = Item
+        return {}
+
+    def get_item(self, TableName, Key, **kwargs):
+        self.calls.append(("get_item", TableName))
+        item = self._table(TableName).get(self._key(Key))
+        return {"Item": item} if item is not None else {}
+
+    def delete_item(self, TableName, Key, **kwargs):
+        self.calls.append(("delete_item", TableName))
+        self._table(TableName).pop(self._key(Key), None)
+        return {}
+
+    def update_item(self, TableName, Key, UpdateExpression, ExpressionAttributeValues, **kwargs):
+        self.calls.append(("update_item", TableName))
+        item = self._table(TableName).get(self._key(Key))
+        if item is None:
+            item = dict(Key)
+            self._table(TableName)[self._key(Key)] = item
+        match = re.fullmatch(r"SET (.+)", UpdateExpression.strip())
+        if not match:
+            raise NotImplementedError(UpdateExpression)
+        for assignment in match.group(1).split(","):
+            name, placeholder = (part.strip() for part in assignment.split("="))
+            item[name] = ExpressionAttributeValues[placeholder]
+        return {}
+
+    def query(self, TableName, KeyConditionExpression, ExpressionAttributeValues, **kwargs):
+        self.calls.append(("query", TableName))
+        user_id = ExpressionAttributeValues[":user_id"]
+        window_start = ExpressionAttributeValues.get(":window_start", {}).get("S")
+        window_end = ExpressionAttributeValues.get(":window_end", {}).get("S")
+        items = []
+        for item in self._table(TableName).values():
+            if item.get("userId") != user_id:
+                continue
+            if window_start is not None:
+                start = item.get("startDate", {}).get("S", "")
+                if not window_start <= start <= window_end:
+                    continue
+            items.append(item)
+        return {"Items": items}
+
+
+class InMemoryLambda:
+    """Dispatches ``invoke`` to a Python handler per function name."""
+
+    def __init__(self, handlers=None):
+        self.handlers = handlers or {}
+        self.invocations = []
+
+    def invoke(self, FunctionName, Payload, **kwargs):
+        payload = json.loads(Payload)
+        self.invocations.append((FunctionName, payload))
+        result = self.handlers[FunctionName](payload)
+        return {"StatusCode": 200, "Payload": BytesIO(json.dumps(result).encode("utf-8"))}
+
+
+def text_embedding(text, dimensions=16):
+    """Deterministic unit vector for ``text`` (same text -> same vector)."""
+    digest = hashlib.sha256(text.strip().lower().encode("utf-8")).digest()
+    vector = [(b - 128) / 128 for b in digest[:dimensions]]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class InMemoryBedrock:
+    """Titan-style ``invoke_model`` that returns deterministic embeddings."""
+
+    def __init__(self, dimensions=16):
+        self.dimensions = dimensions
+        self.invocations = []
+
+    def invoke_model(self, body, modelId, **kwargs):
+        text = json.loads(body)["inputText"]
+        self.invocations.append((modelId, text))
+        embedding = text_embedding(text, self.dimensions)
+        return {"body": BytesIO(json.dumps({"embedding": embedding}).encode("utf-8"))}
+
+
+class InMemoryOpenSearch:
+    """Indexes documents and answers the bool/filter + knn queries the tools issue."""
+
+    def __init__(self):
+        self.indices = {}
+        self.searches = []
+
+    def index(self, index, id, body):
+        self.indices.setdefault(index, {})[id] = body
+
+    @staticmethod
+    def _matches_filter(source, clause):
+        if "term" in clause:
+            field, value = next(iter(clause["term"].items()))
+            return source.get(field) == value
+        if "range" in clause:
+            field, bounds = next(iter(clause["range"].items()))
+            value = source.get(field)
+            return value is not None and bounds.get("gte", value) <= value <= bounds.get("lte", value)
+        raise NotImplementedError(clause)
+
+    def search(self, index, body, **kwargs):
+        self.searches.append((index, body))
+        query = body["query"]["bool"]
+        knn = next(clause["knn"] for clause in query.get("must", []) if "knn" in clause)
+        field, knn_params = next(iter(knn.items()))
+        hits = []
+        for doc_id, source in self.indices.get(index, {}).items():
+            if not all(self._matches_filter(source, clause) for clause in query.get("filter", [])):
+                continue
+            score = sum(a * b for a, b in zip(knn_params["vector"], source[field]))
+            hits.append({"_id": doc_id, "_score": score, "_source": source})
+        hits.sort(key=lambda hit: hit["_score"], reverse=True)
+        hits = hits[: min(body.get("size", 10), knn_params.get("k", 10))]
+        return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
@@ -0,0 +1,111 @@
+import sys
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import agent
+from admission import SERVER_AT_CAPACITY, SERVER_DRAINING, TOOLS_SATURATED, AdmissionController
+from output_buffer import OutputBuffer
+
+
+class RecordingStreamManager:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.is_active = False
+        self._session_end_sent = False
+        self.output_queue = OutputBuffer()
+        RecordingStreamManager.instances.append(self)
+
+    async def initialize_stream(self):
+        self.is_active = True
+
+    async def send_raw_event(self, event):
+        pass
+
+    async def close(self):
+        self.is_active = False
+        self._session_end_sent = True
+        self.output_queue.close()
+
+
+@pytest.fixture
+def tools():
+    return SimpleNamespace(queue_depth=0)
+
+
+@pytest.fixture
+def client(monkeypatch, tools):
+    RecordingStreamManager.instances = []
+    monkeypatch.setattr(agent, "S2sSessionManager", RecordingStreamManager)
+    monkeypatch.setattr(
+        agent, "admission_controller", AdmissionController(max_sessions=1, max_tool_backlog=4, tool_executor=tools)
+    )
+    return TestClient(agent.app)
+
+
+def _start_session(ws):
+    ws.send_text(json.dumps({"type": "init", "userId": "u1", "timezone": "UTC"}))
+    ws.send_text(json.dumps({"event": {"sessionStart": {}}}))
+
+
+def test_session_over_the_limit_is_rejected_and_health_reports_capacity(client):
+    with client.websocket_connect("/ws") as first:
+        _start_session(first)
+        first.send_text(json.dumps({"event": {"promptStart": {"promptName": "p1"}}}))
+        saturated = client.get("/health")
+        root = client.get("/")
+
+        with client.websocket_connect("/ws") as second:
+            _start_session(second)
+            rejection = second.receive_json()
+            with pytest.raises(WebSocketDisconnect) as closed:
+                second.receive_json()
+
+    assert rejection["type"] == "error"
+    assert rejection["code"] == SERVER_AT_CAPACITY
+    assert closed.value.code == 1013
+    assert len(RecordingStreamManager.instances) == 1
+    assert saturated.status_code == 503
+    assert saturated.json()["capacity"]["remaining_sessions"] == 0
+    assert root.status_code == 200
+    assert root.json()["status"] == "saturated"
+
+    healthy = client.get("/health")
+    assert healthy.status_code == 200
+    assert healthy.json()["capacity"]["remaining_sessions"] == 1
+
+
+def test_tool_backlog_blocks_new_sessions(tools):
+    controller = AdmissionController(max_sessions=10, max_tool_backlog=4, tool_executor=tools)
+    permit, _ = controller.try_admit()
+
+    tools.queue_depth = 4
+    refused, reason = controller.try_admit()
+    permit.release()
+    permit.release()
+
+    assert refused is None
+    assert reason == TOOLS_SATURATED
+    assert controller.capacity()["active_sessions"] == 0
+    assert controller.capacity()["rejected"][TOOLS_SATURATED] == 1
+
+
+def test_rejection_message_says_why(tools):
+    controller = AdmissionController(max_sessions=10, tool_executor=tools)
+    controller.draining = True
+
+    _, reason = controller.try_admit()
+    draining = controller.rejection_event(reason)
+    at_capacity = controller.rejection_event(SERVER_AT_CAPACITY)
+
+    assert draining["code"] == SERVER_DRAINING
+    assert "restarting" in draining["message"]
+    assert "capacity" in at_capacity["message"]
+    assert controller.close_reason(SERVER_DRAINING) != controller.close_reason(SERVER_AT_CAPACITY)
@@ -1,6 +1,7 @@
 import sys
 import json
 import asyncio
+import base64
 import pytest
 from pathlib import Path
 from starlette.websockets import WebSocketState
@@ -8,6 +9,7 @@ from starlette.websockets import WebSocketState
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 import agent
+from output_buffer import OutputBuffer
 
 
 class FakeWebSocket:
@@ -23,6 +25,11 @@ class FakeWebSocket:
             raise RuntimeError("WebSocket closed")
         self.sent_messages.append(text)
 
+    async def send_bytes(self, data):
+        if self.client_state == WebSocketState.DISCONNECTED:
+            raise RuntimeError("WebSocket closed")
+        self.sent_messages.append(data)
+
     async def close(self, code=1000, reason=None):
         self.close_code = code
         self.close_reason = reason
@@ -32,7 +39,7 @@ class FakeWebSocket:
 
 class FakeStreamManager:
     def __init__(self, *, is_active, session_end_sent):
-        self.output_queue = asyncio.Queue()
+        self.output_queue = OutputBuffer()
         self.is_active = is_active
         self._session_end_sent = session_end_sent
 
@@ -71,33 +78,30 @@ async def test_forward_responses_closes_on_fatal_error_event():
 
 
 @pytest.mark.asyncio
-async def test_forward_responses_closes_on_unexpected_inactive_stream_timeout(monkeypatch):
+async def test_forward_responses_closes_when_stream_ends_unexpectedly():
     ws = FakeWebSocket()
-    stream_manager = FakeStreamManager(is_active=False, session_end_sent=False)
-
-    async def fake_wait_for(*args, **kwargs):
-        raise asyncio.TimeoutError()
+    stream_manager = FakeStreamManager(is_active=True, session_end_sent=False)
+    forward_task = asyncio.create_task(agent.forward_responses(ws, stream_manager))
+    await asyncio.sleep(0)
 
-    monkeypatch.setattr(agent.asyncio, "wait_for", fake_wait_for)
-
-    await agent.forward_responses(ws, stream_manager)
+    stream_manager.is_active = False
+    stream_manager.output_queue.close()
+    await asyncio.wait_for(forward_task, timeout=0.1)
 
     assert ws.close_code == 1011
     assert ws.close_reason == "Upstream stream failed"
 
 
 @pytest.mark.asyncio
-async def test_forward_responses_does_not_close_after_normal_session_end_timeout(monkeypatch):
+async def test_forward_responses_drains_and_does_not_close_after_normal_session_end():
     ws = FakeWebSocket()
     stream_manager = FakeStreamManager(is_active=False, session_end_sent=True)
-
-    async def fake_wait_for(*args, **kwargs):
-        raise asyncio.TimeoutError()
-
-    monkeypatch.setattr(agent.asyncio, "wait_for", fake_wait_for)
+    await stream_manager.output_queue.put({"event": {"textOutput": {"content": "bye"}}})
+    stream_manager.output_queue.close()
 
     await agent.forward_responses(ws, stream_manager)
 
+    assert [json.loads(m)["event"]["textOutput"]["content"] for m in ws.sent_messages] == ["bye"]
     assert ws.close_code is None
 
 
@@ -118,6 +122,36 @@ async def test_forward_responses_closes_on_end_conversation_control_event():
     assert ws.close_reason == "Conversation ended"
 
 
+@pytest.mark.asyncio
+async def test_forward_responses_binary_mode_sends_audio_as_pcm_frames():
+    ws = FakeWebSocket()
+    stream_manager = FakeStreamManager(is_active=True, session_end_sent=False)
+    pcm = bytes(range(256)) * 80
+    await stream_manager.output_queue.put(
+        {
+            "event": {
+                "audioOutput": {
+                    "promptName": "p1",
+                    "contentId": "c1",
+                    "content": base64.b64encode(pcm).decode("ascii"),
+                }
+            }
+        }
+    )
+    await stream_manager.output_queue.put({"event": {"textOutput": {"content": "hi"}}})
+    await stream_manager.output_queue.put({"type": "end_conversation"})
+
+    await agent.forward_responses(ws, stream_manager, audio_output_format="binary")
+
+    frames = [m for m in ws.sent_messages if isinstance(m, bytes)]
+    decoded = [agent.decode_audio_frame(frame) for frame in frames]
+    assert len(frames) == 3
+    assert all(len(frame) <= 10000 for frame in frames)
+    assert {(t, p, c) for t, p, c, _ in decoded} == {(agent.AUDIO_OUTPUT, "p1", "c1")}
+    assert b"".join(chunk for *_, chunk in decoded) == pcm
+    assert json.loads(ws.sent_messages[-1]) == {"event": {"textOutput": {"content": "hi"}}}
+
+
 @pytest.mark.asyncio
 async def test_send_open_event_context_sends_three_events():
     stream_manager = FakeContextStreamManager(prompt_name="prompt-1")
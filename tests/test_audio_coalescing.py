@@ -0,0 +1,118 @@
+import sys
+import json
+import base64
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from s2s_events import S2sEvent
+from s2s_session_manager import S2sSessionManager
+
+
+class FakeInputStream:
+    def __init__(self):
+        self.payloads = []
+
+    async def send(self, chunk):
+        self.payloads.append(json.loads(chunk.value.bytes_))
+
+
+class FakeStream:
+    def __init__(self):
+        self.input_stream = FakeInputStream()
+
+
+def _session(max_wait=0.02):
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+    s.stream = FakeStream()
+    s.is_active = True
+    s.audio_content_name = "a1"
+    s.audio_coalesce_max_wait = max_wait
+    s.audio_task = asyncio.create_task(s._process_audio_input())
+    return s
+
+
+def _sent_audio(s):
+    return [
+        base64.b64decode(p["event"]["audioInput"]["content"])
+        for p in s.stream.input_stream.payloads
+        if "audioInput" in p["event"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_small_chunks_are_coalesced_up_to_the_target():
+    s = _session()
+    chunks = [bytes([i]) * 640 for i in range(4)]  # 20 ms each
+
+    for chunk in chunks:
+        s.add_audio_chunk("p1", "a1", chunk)
+    await asyncio.sleep(0.05)
+    s.audio_task.cancel()
+
+    assert _sent_audio(s) == [b"".join(chunks)]
+    assert s.audio_input_stats() == {"chunks_received": 4, "events_sent": 1, "event_reduction": 0.75}
+
+
+@pytest.mark.asyncio
+async def test_padded_base64_chunks_are_re_encoded_when_merged():
+    s = _session()
+    pcm = [b"\x01\x02\x03\x04", b"\x05\x06"]
+
+    for chunk in pcm:
+        s.add_audio_chunk("p1", "a1", base64.b64encode(chunk).decode("ascii"))
+    await asyncio.sleep(0.05)
+    s.audio_task.cancel()
+
+    assert _sent_audio(s) == [b"".join(pcm)]
+
+
+@pytest.mark.asyncio
+async def test_audio_content_end_flushes_a_partial_batch():
+    s = _session(max_wait=10.0)
+
+    s.add_audio_chunk("p1", "a1", b"\x01\x00" * 100)
+    await asyncio.sleep(0)
+    await s.send_raw_event(S2sEvent.content_end("p1", "a1"))
+    await asyncio.sleep(0.01)
+    s.audio_task.cancel()
+
+    events = [next(iter(p["event"])) for p in s.stream.input_stream.payloads]
+    assert events == ["audioInput", "contentEnd"]
+    assert _sent_audio(s) == [b"\x01\x00" * 100]
+
+
+@pytest.mark.asyncio
+async def test_ending_the_conversation_sends_pending_audio_and_content_end_first(monkeypatch):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    s = _session(max_wait=10.0)
+    s.prompt_name = "p1"
+    input_stream = s.stream.input_stream
+
+    s.add_audio_chunk("p1", "a1", b"\x01\x00" * 100)
+    await asyncio.sleep(0)
+    await asyncio.wait_for(s._end_bedrock_conversation("p1"), timeout=2)
+
+    events = [next(iter(p["event"])) for p in input_stream.payloads]
+    assert events == ["audioInput", "contentEnd", "promptEnd", "sessionEnd"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_end_waits_for_a_queued_content_end_behind_a_slow_send():
+    s = _session(max_wait=10.0)
+
+    s.add_audio_chunk("p1", "a1", b"\x01\x00" * 100)
+    await asyncio.sleep(0)
+    async with s._send_lock:
+        content_end = asyncio.create_task(s.send_raw_event(S2sEvent.content_end("p1", "a1")))
+        await asyncio.sleep(0.01)
+        assert not content_end.done()
+    await asyncio.wait_for(content_end, timeout=2)
+    await s.send_raw_event(S2sEvent.prompt_end("p1"))
+    s.audio_task.cancel()
+
+    events = [next(iter(p["event"])) for p in s.stream.input_stream.payloads]
+    assert events == ["audioInput", "contentEnd", "promptEnd"]
@@ -0,0 +1,61 @@
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from s2s_events import S2sEvent, parse_audio_input_message
+from s2s_session_manager import S2sSessionManager
+
+
+class FakeInputStream:
+    def __init__(self):
+        self.payloads = []
+
+    async def send(self, chunk):
+        self.payloads.append(chunk.value.bytes_)
+
+
+class FakeStream:
+    def __init__(self):
+        self.input_stream = FakeInputStream()
+
+
+def test_parse_audio_input_message_only_matches_plain_audio_frames():
+    frame = json.dumps(S2sEvent.audio_input("p1", "a1", "AAEC"))
+
+    assert parse_audio_input_message(frame) == ("p1", "a1", "AAEC")
+    assert parse_audio_input_message(json.dumps(S2sEvent.content_end("p1", "a1"))) is None
+    assert parse_audio_input_message(json.dumps({"body": frame})) is None
+    assert parse_audio_input_message('{"event": {"audioInput": ') is None
+
+
+def test_encoded_audio_input_matches_json_dumps():
+    prefix = S2sEvent.audio_input_prefix("p1", 'audio "1"')
+    encoded = S2sEvent.encode_audio_input(prefix, "AAECAw==")
+
+    assert json.loads(encoded) == S2sEvent.audio_input("p1", 'audio "1"', "AAECAw==")
+    assert S2sEvent.encode_audio_input(prefix, 'AA"\\') is None
+
+
+@pytest.mark.asyncio
+async def test_audio_queue_sends_pre_encoded_events():
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+    s.stream = FakeStream()
+    s.is_active = True
+    s.audio_coalesce_target_bytes = 0
+    task = asyncio.create_task(s._process_audio_input())
+
+    s.add_audio_chunk("p1", "a1", "AAEC")
+    s.add_audio_chunk("p1", "a1", "not\nbase64")
+    for _ in range(10):
+        await asyncio.sleep(0)
+    task.cancel()
+
+    assert [json.loads(p) for p in s.stream.input_stream.payloads] == [
+        S2sEvent.audio_input("p1", "a1", "AAEC"),
+        S2sEvent.audio_input("p1", "a1", "not\nbase64"),
+    ]
@@ -0,0 +1,74 @@
+import sys
+import json
+import base64
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from output_buffer import OutputBufferClosed
+from s2s_session_manager import S2sSessionManager
+
+
+class ScriptedReceiver:
+    def __init__(self, events):
+        self.events = list(events)
+
+    async def receive(self):
+        if not self.events:
+            raise StopAsyncIteration
+        payload = json.dumps(self.events.pop(0)).encode("utf-8")
+        return SimpleNamespace(value=SimpleNamespace(bytes_=payload))
+
+
+class ScriptedStream:
+    def __init__(self, events):
+        self.receiver = ScriptedReceiver(events)
+        self.input_stream = SimpleNamespace(close=self._close)
+
+    async def _close(self):
+        pass
+
+    async def await_output(self):
+        return None, self.receiver
+
+
+def _audio(content_id, ms=100):
+    pcm = bytes(int(ms * 48))
+    return {"event": {"audioOutput": {"contentId": content_id, "content": base64.b64encode(pcm).decode("ascii")}}}
+
+
+@pytest.mark.asyncio
+async def test_interruption_purges_queued_audio_and_notifies_client(monkeypatch):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+    s.stream = ScriptedStream(
+        [
+            {"event": {"contentStart": {"contentId": "a1", "type": "AUDIO", "role": "ASSISTANT"}}},
+            _audio("a1"),
+            _audio("a1"),
+            _audio("a1"),
+            {"event": {"textOutput": {"contentId": "t1", "role": "ASSISTANT", "content": '{ "interrupted" : true }'}}},
+            {"event": {"contentEnd": {"contentId": "a1", "type": "AUDIO", "stopReason": "INTERRUPTED"}}},
+            {"event": {"contentStart": {"contentId": "a2", "type": "AUDIO", "role": "ASSISTANT"}}},
+            _audio("a2"),
+        ]
+    )
+    s.is_active = True
+
+    await s._process_responses()
+
+    delivered = []
+    with pytest.raises(OutputBufferClosed):
+        while True:
+            delivered.append(await s.output_queue.get())
+    kinds = [e.get("type") or next(iter(e["event"])) for e in delivered]
+    assert kinds == ["contentStart", "barge_in", "textOutput", "contentEnd", "contentStart", "audioOutput"]
+    barge_in = delivered[1]
+    assert barge_in["contentId"] == "a1"
+    assert barge_in["discardedAudioMs"] == pytest.approx(300)
+    assert s.barge_in_count == 1
+    assert s.barge_in_discarded_audio_ms == pytest.approx(300)
+    assert delivered[-1]["event"]["audioOutput"]["contentId"] == "a2"
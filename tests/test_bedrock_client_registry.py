@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bedrock_client_registry import BedrockClientRegistry
+from s2s_session_manager import S2sSessionManager
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+
+    def is_open(self):
+        return self.open
+
+
+class FakeTransport:
+    def __init__(self):
+        self._connections = {"bedrock": FakeConnection()}
+
+
+class FakeConfig:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+
+class FakeClient:
+    def __init__(self):
+        self._config = FakeConfig()
+
+
+class CountingFactory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self, region):
+        client = FakeClient()
+        self.created.append((region, client))
+        return client
+
+
+def test_sessions_share_one_client_per_region_and_model():
+    factory = CountingFactory()
+    registry = BedrockClientRegistry(factory=factory)
+    sessions = [
+        S2sSessionManager(region="us-east-1", model_id="nova", user_id=f"u{i}", timezone="UTC", client_registry=registry)
+        for i in range(5)
+    ]
+
+    for session in sessions:
+        session._initialize_client()
+    other_model = registry.get("us-east-1", "other")
+
+    assert len({id(session.bedrock_client) for session in sessions}) == 1
+    assert other_model is not sessions[0].bedrock_client
+    assert len(factory.created) == 2
+    stats = registry.stats()
+    assert stats["clients"] == 2
+    assert stats["created"] == 2
+    assert stats["reused"] == 4
+
+
+def test_cleared_clients_are_pruned_once_their_connections_close():
+    factory = CountingFactory()
+    registry = BedrockClientRegistry(factory=factory)
+    before = registry.get("us-east-1", "nova")
+
+    registry.clear()
+    after = registry.get("us-east-1", "nova")
+    assert after is not before
+    assert registry.connection_count() == 2
+
+    before._config.transport._connections["bedrock"].open = False
+    registry.get("us-east-1", "nova")
+
+    assert registry._retired == []
+    assert registry.stats()["open_connections"] == 1
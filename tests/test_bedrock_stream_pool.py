@@ -0,0 +1,114 @@
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bedrock_stream_pool import BedrockStreamPool
+from s2s_session_manager import S2sSessionManager
+
+
+class IdleInputStream:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class IdleStream:
+    def __init__(self, name):
+        self.name = name
+        self.input_stream = IdleInputStream()
+        self._never = asyncio.Event()
+
+    async def await_output(self):
+        await self._never.wait()
+
+
+class CountingOpener:
+    def __init__(self):
+        self.opened = []
+
+    async def __call__(self, region, model_id):
+        stream = IdleStream(f"{model_id}-{len(self.opened)}")
+        self.opened.append(stream)
+        return object(), stream
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_hands_out_ready_streams_and_refills():
+    opener = CountingOpener()
+    pool = BedrockStreamPool(size=2, idle_ttl=60, opener=opener)
+
+    pool.warm("us-east-1", "nova")
+    await _settle()
+    first = await pool.acquire("us-east-1", "nova")
+    await _settle()
+
+    assert first.stream is opener.opened[0]
+    assert len(opener.opened) == 3
+    assert pool.stats()["ready"] == {"us-east-1/nova": 2}
+    assert await pool.acquire("us-east-1", "other-model") is None
+    assert (pool.hits, pool.misses) == (1, 1)
+    await pool.stop()
+    assert all(stream.input_stream.closed for stream in opener.opened[1:])
+
+
+@pytest.mark.asyncio
+async def test_idle_streams_expire_instead_of_being_handed_out():
+    opener = CountingOpener()
+    pool = BedrockStreamPool(size=1, idle_ttl=0, opener=opener)
+    pool.warm("us-east-1", "nova")
+    await _settle()
+
+    assert await pool.acquire("us-east-1", "nova") is None
+    await _settle()
+
+    assert pool.expired == 1
+    assert opener.opened[0].input_stream.closed
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_expired_streams_to_close():
+    opener = CountingOpener()
+    pool = BedrockStreamPool(size=1, idle_ttl=0, opener=opener)
+    pool.warm("us-east-1", "nova")
+    await _settle()
+
+    assert await pool.acquire("us-east-1", "nova") is None
+    assert len(pool._close_tasks) == 1
+    await pool.stop()
+
+    assert opener.opened[0].input_stream.closed
+    assert not pool._close_tasks
+
+
+@pytest.mark.asyncio
+async def test_session_uses_pooled_stream_without_setup_delay():
+    opener = CountingOpener()
+    pool = BedrockStreamPool(size=1, idle_ttl=60, opener=opener)
+    pool.warm("us-east-1", "nova")
+    await _settle()
+    s = S2sSessionManager(region="us-east-1", model_id="nova", user_id="u", timezone="UTC", stream_pool=pool)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await s.initialize_stream()
+    elapsed = loop.time() - started
+
+    assert s.stream is opener.opened[0]
+    assert s.stream_from_pool is True
+    assert elapsed < 0.05
+    s.response_task.cancel()
+    s.audio_task.cancel()
+    await asyncio.gather(s.response_task, s.audio_task, return_exceptions=True)
+    await pool.stop()
@@ -0,0 +1,91 @@
+import sys
+import json
+import base64
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import agent
+from audio_frames import AUDIO_INPUT, AudioFrameError, decode_audio_frame, encode_audio_frame
+from output_buffer import OutputBuffer
+from s2s_events import S2sEvent
+
+
+class RecordingStreamManager:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.is_active = False
+        self._session_end_sent = False
+        self.output_queue = OutputBuffer()
+        self.events = []
+        self.audio_chunks = []
+        RecordingStreamManager.instances.append(self)
+
+    async def initialize_stream(self):
+        self.is_active = True
+
+    async def send_raw_event(self, event):
+        self.events.append(event)
+
+    def add_audio_chunk(self, prompt_name, content_name, audio):
+        self.audio_chunks.append((prompt_name, content_name, audio))
+
+    async def close(self):
+        self.is_active = False
+        self._session_end_sent = True
+        self.output_queue.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    RecordingStreamManager.instances = []
+    monkeypatch.setattr(agent, "S2sSessionManager", RecordingStreamManager)
+    return TestClient(agent.app)
+
+
+def test_audio_frame_round_trip_and_validation():
+    frame = encode_audio_frame(AUDIO_INPUT, "prompt-1", "audio-ü", b"\x01\x00\x02\x00")
+
+    assert decode_audio_frame(frame) == (AUDIO_INPUT, "prompt-1", "audio-ü", b"\x01\x00\x02\x00")
+    with pytest.raises(AudioFrameError):
+        decode_audio_frame(frame[:5])
+    with pytest.raises(AudioFrameError):
+        decode_audio_frame(frame + b"\x00")
+
+
+def test_pcm_audio_input_is_base64_encoded_at_the_bedrock_edge():
+    prefix = S2sEvent.audio_input_prefix("p1", "a1")
+
+    encoded = S2sEvent.encode_audio_input_pcm(prefix, b"\x01\x00\x02\x00")
+
+    assert json.loads(encoded) == S2sEvent.audio_input("p1", "a1", base64.b64encode(b"\x01\x00\x02\x00").decode())
+
+
+def test_binary_uplink_is_negotiated_in_init(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_text(json.dumps({"type": "init", "userId": "u1", "timezone": "UTC", "audioInputFormat": "binary"}))
+        assert ws.receive_json() == {"type": "init_ack", "audioInputFormat": "binary", "audioOutputFormat": "json"}
+        ws.send_text(json.dumps({"event": {"sessionStart": {}}}))
+        ws.send_bytes(encode_audio_frame(AUDIO_INPUT, "p1", "a1", b"\x01\x00\x02\x00"))
+        ws.send_text(json.dumps(S2sEvent.audio_input("p1", "a1", "AAEC")))
+        ws.send_text(json.dumps(S2sEvent.prompt_end("p1")))
+
+    manager = RecordingStreamManager.instances[0]
+    assert manager.audio_chunks == [("p1", "a1", b"\x01\x00\x02\x00"), ("p1", "a1", "AAEC")]
+    assert manager.events[-1] == S2sEvent.prompt_end("p1")
+
+
+def test_binary_frames_are_rejected_without_negotiation(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_text(json.dumps({"type": "init", "userId": "u1", "timezone": "UTC"}))
+        ws.send_text(json.dumps({"event": {"sessionStart": {}}}))
+        ws.send_bytes(encode_audio_frame(AUDIO_INPUT, "p1", "a1", b"\x01\x00"))
+        error = ws.receive_json()
+
+    assert error["type"] == "error"
+    assert "audioInputFormat" in error["message"]
+    assert RecordingStreamManager.instances[0].audio_chunks == []
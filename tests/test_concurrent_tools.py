@@ -0,0 +1,184 @@
+import sys
+import json
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from s2s_session_manager import S2sSessionManager
+
+
+class ScriptedReceiver:
+    def __init__(self, events):
+        self.events = list(events)
+        self.drained = asyncio.Event()
+
+    async def receive(self):
+        if not self.events:
+            # Keep the stream open so in-flight tool tasks are not cancelled by close()
+            self.drained.set()
+            await asyncio.Event().wait()
+        payload = json.dumps(self.events.pop(0)).encode("utf-8")
+        return SimpleNamespace(value=SimpleNamespace(bytes_=payload))
+
+
+class ScriptedStream:
+    def __init__(self, events):
+        self.receiver = ScriptedReceiver(events)
+        self.input_stream = SimpleNamespace(close=self._close)
+
+    async def _close(self):
+        pass
+
+    async def await_output(self):
+        return None, self.receiver
+
+
+def tool_use(tool_use_id, tool_name, content_id):
+    content = json.dumps({"title": tool_use_id})
+    return {"event": {"toolUse": {"toolUseId": tool_use_id, "toolName": tool_name, "contentId": content_id, "content": content}}}
+
+
+def tool_end(content_id):
+    return {"event": {"contentEnd": {"promptName": "p1", "contentId": content_id, "type": "TOOL"}}}
+
+
+def make_session(monkeypatch, events):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+    s.stream = ScriptedStream(events)
+    s.is_active = True
+    sent = []
+
+    async def record(event):
+        sent.append(event)
+
+    s.send_raw_event = record
+    return s, sent
+
+
+async def run_until_tools_finish(s):
+    """Replay the script and wait for the tools it started; returns the still-running response task."""
+    processing = asyncio.create_task(s._process_responses())
+    await asyncio.wait_for(s.stream.receiver.drained.wait(), timeout=5)
+
+    async def tools_done():
+        # Yield until every task's done callback has removed it from the set.
+        while s.tool_processing_tasks:
+            await asyncio.sleep(0)
+
+    await asyncio.wait_for(tools_done(), timeout=5)
+    return processing
+
+
+async def stop(processing):
+    processing.cancel()
+    await asyncio.gather(processing, return_exceptions=True)
+
+
+def result_triples(sent):
+    """Group sent events into (toolUseId, result content) per contentStart/toolResult/contentEnd triple."""
+    names = [next(iter(event["event"])) for event in sent]
+    assert names == ["contentStart", "toolResult", "contentEnd"] * (len(sent) // 3)
+    triples = []
+    for start, result, end in zip(sent[0::3], sent[1::3], sent[2::3]):
+        content_name = start["event"]["contentStart"]["contentName"]
+        assert result["event"]["toolResult"]["contentName"] == content_name
+        assert end["event"]["contentEnd"]["contentName"] == content_name
+        triples.append(
+            (start["event"]["contentStart"]["toolResultInputConfiguration"]["toolUseId"],
+             json.loads(result["event"]["toolResult"]["content"]))
+        )
+    return triples
+
+
+@pytest.mark.asyncio
+async def test_interleaved_tool_uses_run_concurrently_and_reply_in_completion_order(monkeypatch):
+    s, sent = make_session(
+        monkeypatch,
+        [
+            tool_use("slow", "read_events", "c-slow"),
+            tool_use("fast", "open_event", "c-fast"),
+            tool_end("c-slow"),
+            tool_end("c-fast"),
+        ],
+    )
+    running = set()
+    overlapped = asyncio.Event()
+    release_slow = asyncio.Event()
+
+    async def fake_tool(tool_name, tool_use_content):
+        tool_id = json.loads(tool_use_content["content"])["title"]
+        running.add(tool_id)
+        if running == {"slow", "fast"}:
+            overlapped.set()
+        if tool_id == "slow":
+            await release_slow.wait()
+        else:
+            await overlapped.wait()
+            release_slow.set()
+        return {"tool": tool_name, "id": tool_id}
+
+    s.processToolUse = fake_tool
+
+    await stop(await run_until_tools_finish(s))
+
+    assert overlapped.is_set()
+    assert result_triples(sent) == [
+        ("fast", {"tool": "open_event", "id": "fast"}),
+        ("slow", {"tool": "read_events", "id": "slow"}),
+    ]
+    assert s.pending_tools == {}
+
+
+@pytest.mark.asyncio
+async def test_second_tool_use_does_not_overwrite_the_first(monkeypatch):
+    # No contentIds to match on: the contentEnd releases every tool received so far.
+    s, sent = make_session(
+        monkeypatch,
+        [
+            {"event": {"toolUse": {"toolUseId": "a", "toolName": "read_events", "content": "{}"}}},
+            {"event": {"toolUse": {"toolUseId": "b", "toolName": "delete_event", "content": "{}"}}},
+            {"event": {"contentEnd": {"promptName": "p1", "type": "TOOL"}}},
+        ],
+    )
+    calls = []
+
+    async def fake_tool(tool_name, tool_use_content):
+        calls.append(tool_name)
+        return {"tool": tool_name}
+
+    s.processToolUse = fake_tool
+
+    await stop(await run_until_tools_finish(s))
+
+    assert sorted(calls) == ["delete_event", "read_events"]
+    assert sorted(result_triples(sent)) == [("a", {"tool": "read_events"}), ("b", {"tool": "delete_event"})]
+
+
+@pytest.mark.asyncio
+async def test_tool_waits_for_its_own_content_end(monkeypatch):
+    s, sent = make_session(
+        monkeypatch,
+        [
+            tool_use("first", "read_events", "c-1"),
+            tool_use("second", "read_events", "c-2"),
+            tool_end("c-1"),
+        ],
+    )
+
+    async def fake_tool(tool_name, tool_use_content):
+        return {"result": "done"}
+
+    s.processToolUse = fake_tool
+
+    processing = await run_until_tools_finish(s)
+
+    assert result_triples(sent) == [("first", {"result": "done"})]
+    assert list(s.pending_tools) == ["second"]
+    assert not s.is_idle()
+    await stop(processing)
+    assert s.pending_tools == {}
@@ -0,0 +1,118 @@
+import sys
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from credentials_provider import CredentialProvider
+
+
+def _imds_client_factory(issued, expires_in=timedelta(hours=6), delay=0.0):
+    """Fake IMDS that issues a new key pair (AKIA1, AKIA2, ...) on every credential fetch."""
+
+    async def handler(request):
+        path = request.url.path
+        if path == "/latest/api/token":
+            return httpx.Response(200, text="imds-token")
+        if path == "/latest/meta-data/iam/security-credentials/":
+            return httpx.Response(200, text="clarity-role\n")
+        if path == "/latest/meta-data/iam/security-credentials/clarity-role":
+            await asyncio.sleep(delay)
+            issued.append(request.headers.get("X-aws-ec2-metadata-token"))
+            expiration = datetime.now(timezone.utc) + expires_in
+            return httpx.Response(
+                200,
+                text=json.dumps(
+                    {
+                        "AccessKeyId": f"AKIA{len(issued)}",
+                        "SecretAccessKey": "secret",
+                        "Token": f"token-{len(issued)}",
+                        "Expiration": expiration.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    }
+                ),
+            )
+        return httpx.Response(404)
+
+    return lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture(autouse=True)
+def _no_environment_credentials(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_a_single_imds_refresh():
+    issued = []
+    provider = CredentialProvider(imds_client_factory=_imds_client_factory(issued, delay=0.05))
+    provider.mode = "imds"
+
+    results = await asyncio.gather(*(provider.get_credentials() for _ in range(10)))
+
+    assert len(issued) == 1
+    assert issued[0] == "imds-token"
+    assert {creds["AccessKeyId"] for creds in results} == {"AKIA1"}
+
+
+@pytest.mark.asyncio
+async def test_credentials_near_expiry_are_served_from_cache_while_refreshing():
+    issued = []
+    provider = CredentialProvider(
+        refresh_margin_seconds=600,
+        imds_client_factory=_imds_client_factory(issued, expires_in=timedelta(minutes=5)),
+    )
+    provider.mode = "imds"
+    first = await provider.refresh()
+
+    second = await provider.get_credentials()
+    await asyncio.sleep(0.01)
+
+    assert second is first
+    assert len(issued) == 2
+    assert provider.current()["AccessKeyId"] == "AKIA2"
+
+
+@pytest.mark.asyncio
+async def test_start_in_local_mode_uses_environment(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIALOCAL")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "local-secret")
+    issued = []
+    provider = CredentialProvider(imds_client_factory=_imds_client_factory(issued))
+
+    await provider.start()
+
+    assert provider.status()["mode"] == "local"
+    assert (await provider.get_credentials())["AccessKeyId"] == "AKIALOCAL"
+    assert issued == []
+    await provider.stop()
+
+
+@pytest.mark.asyncio
+async def test_client_hooks_follow_token_rotation():
+    issued = []
+    provider = CredentialProvider(imds_client_factory=_imds_client_factory(issued))
+    provider.mode = "imds"
+    rotations = []
+    provider.add_listener(lambda creds: rotations.append(creds["AccessKeyId"]))
+    await provider.refresh()
+
+    signer = provider.aws4auth("us-east-1", "es")
+    resolver = provider.smithy_resolver()
+    boto_credentials = provider.boto3_session().get_credentials()
+
+    assert (await resolver.get_identity(properties={})).access_key_id == "AKIA1"
+    assert boto_credentials.get_frozen_credentials().access_key == "AKIA1"
+
+    await provider.refresh()
+    signer.refresh_credentials()
+
+    assert rotations == ["AKIA1", "AKIA2"]
+    assert (await resolver.get_identity(properties={})).access_key_id == "AKIA2"
+    assert signer.access_id == "AKIA2"
+    assert signer.session_token == "token-2"
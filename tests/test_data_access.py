@@ -0,0 +1,133 @@
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import s2s_session_manager
+from s2s_session_manager import S2sSessionManager
+from data_access import CalendarRepository, TITAN_EMBED_MODEL_ID
+from tool_executor import ToolExecutor
+from in_memory_services import (
+    InMemoryBedrock,
+    InMemoryDynamoDB,
+    InMemoryLambda,
+    InMemoryOpenSearch,
+    text_embedding,
+)
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(max_workers=4, max_per_user=4)
+    yield executor
+    executor.shutdown()
+
+
+def _repository(executor, **overrides):
+    services = {
+        "ddb_client": InMemoryDynamoDB(),
+        "lambda_client": InMemoryLambda(),
+        "bedrock_client": InMemoryBedrock(),
+        "opensearch_client": InMemoryOpenSearch(),
+    }
+    services.update(overrides)
+    return CalendarRepository(**services, executor=executor, user_id="user-1")
+
+
+@pytest.mark.asyncio
+async def test_repository_runs_independent_calls_concurrently(executor):
+    repo = _repository(executor)
+    await repo.put_item("Events", {"userId": {"S": "user-1"}, "id": {"S": "evt-1"}})
+
+    embedding, response = await repo.gather(
+        repo.embed_text("Team standup"),
+        repo.get_item("Events", {"userId": {"S": "user-1"}, "id": {"S": "evt-1"}}),
+    )
+
+    assert embedding == pytest.approx(text_embedding("Team standup"), abs=1e-6)
+    assert response["Item"]["id"] == {"S": "evt-1"}
+    assert repo.bedrock_client.invocations == [(TITAN_EMBED_MODEL_ID, "Team standup")]
+    assert executor.stats()["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_repository_search_and_content_generation_round_trip(executor):
+    opensearch = InMemoryOpenSearch()
+    opensearch.index("habits", "h1", {"userId": "user-1", "title_vector": text_embedding("Gym")})
+    opensearch.index("habits", "h2", {"userId": "user-2", "title_vector": text_embedding("Gym")})
+    doc = {"type": "doc", "content": [{"type": "paragraph", "text": "Stretch"}]}
+    lambda_client = InMemoryLambda({"clarityGenerateEditorContentService": lambda payload: {"statusCode": 200, "body": {"doc": doc}}})
+    repo = _repository(executor, opensearch_client=opensearch, lambda_client=lambda_client)
+
+    response = await repo.search(
+        "habits",
+        {
+            "size": 5,
+            "query": {
+                "bool": {
+                    "filter": [{"term": {"userId": "user-1"}}],
+                    "must": [{"knn": {"title_vector": {"vector": text_embedding("gym"), "k": 5}}}],
+                }
+            },
+        },
+    )
+    generated = await repo.generate_content("Add a stretching reminder", None)
+
+    assert [hit["_id"] for hit in response["hits"]["hits"]] == ["h1"]
+    assert response["hits"]["hits"][0]["_score"] == pytest.approx(1.0)
+    assert generated == doc
+    assert lambda_client.invocations[0][1]["userId"] == "user-1"
+
+
+@pytest.mark.asyncio
+async def test_create_and_read_events_run_against_in_memory_services(monkeypatch, executor):
+    ddb = InMemoryDynamoDB()
+    doc = {"type": "doc", "content": [{"type": "paragraph", "text": "Bring insurance card"}]}
+    lambda_client = InMemoryLambda({"clarityGenerateEditorContentService": lambda payload: {"statusCode": 200, "body": {"doc": doc}}})
+    monkeypatch.setattr(s2s_session_manager, "ddb_client", ddb)
+    monkeypatch.setattr(s2s_session_manager, "lambda_client", lambda_client)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor)
+
+    created = await s.processToolUse("create_event", {"content": json.dumps({
+        "title": "Dentist", "start_datetime": "2026-03-02T15:00:00", "length_minutes": 60,
+        "tasks_content_prompt": "Remind me to bring my insurance card",
+    })})
+    read = await s.processToolUse("read_events", {"content": json.dumps({"start_date": "2026-03-02", "end_date": "2026-03-02"})})
+
+    assert created["new_event"]["content"] == doc
+    assert ddb.calls[0] == ("put_item", "Events")
+    assert "Dentist" in json.dumps(read)
+
+
+@pytest.mark.asyncio
+async def test_open_event_tool_runs_against_in_memory_services(monkeypatch, executor):
+    opensearch = InMemoryOpenSearch()
+    opensearch.index(
+        "calendar-events",
+        "doc-1",
+        {
+            "eventId": "evt-42",
+            "userId": "test-user",
+            "title": "Dentist",
+            "startDate": "2026-03-02T15:00:00.000Z",
+            "endDate": "2026-03-02T16:00:00.000Z",
+            "title_vector": text_embedding("Dentist"),
+        },
+    )
+    monkeypatch.setattr(s2s_session_manager, "ddb_client", InMemoryDynamoDB())
+    monkeypatch.setattr(s2s_session_manager, "bedrock_client", InMemoryBedrock())
+    monkeypatch.setattr(s2s_session_manager, "opensearch_client", opensearch)
+
+    s = S2sSessionManager(
+        region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor
+    )
+    payload = {"current_title": "dentist", "current_start_date": "2026-03-02", "current_start_time": "15:00"}
+    res = await s.processToolUse("open_event", {"content": json.dumps(payload)})
+
+    assert res["tool_name"] == "open_event"
+    assert res["event_details"] == {"eventId": "evt-42"}
+    assert [index for index, _ in opensearch.searches] == ["habits", "calendar-events"]
+    assert s._calendar_repository() is s._calendar_repository()
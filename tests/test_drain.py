@@ -0,0 +1,113 @@
+import sys
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import agent
+from admission import SERVER_DRAINING, AdmissionController
+from drain import SERVER_DRAINING_EVENT_TYPE, DrainController
+from output_buffer import OutputBuffer
+from s2s_session_manager import S2sSessionManager
+from session_registry import SessionRegistry
+
+
+class FakeSession:
+    def __init__(self, user_id, idle):
+        self.user_id = user_id
+        self.idle = idle
+        self.is_active = True
+        self.output_queue = OutputBuffer()
+        self.closed_with = None
+
+    def is_idle(self):
+        return self.idle
+
+    async def close(self, flush_memory=True):
+        self.closed_with = flush_memory
+        self.is_active = False
+        self.output_queue.close()
+
+    async def flush_deferred_memory(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_drain_retires_idle_sessions_and_kills_busy_ones_at_the_deadline():
+    admission = AdmissionController(tool_executor=SimpleNamespace(queue_depth=0))
+    controller = DrainController(timeout=0.3, admission=admission, registry=SessionRegistry())
+    idle, finishing, stuck = FakeSession("u1", True), FakeSession("u2", False), FakeSession("u3", False)
+    for session in (idle, finishing, stuck):
+        controller.track(session)
+
+    drain = controller.start()
+    await asyncio.sleep(0.05)
+    assert idle.closed_with is False
+    assert finishing.closed_with is None
+    assert admission.try_admit() == (None, SERVER_DRAINING)
+
+    finishing.idle = True
+    report = await drain
+
+    assert report["sessions_drained"] == 2
+    assert report["sessions_killed"] == 1
+    assert report["memory_events_written"] == 3
+    assert stuck.closed_with is False
+    assert idle.output_queue.get_nowait()["type"] == SERVER_DRAINING_EVENT_TYPE
+    assert await controller.drain() is report
+
+
+@pytest.mark.asyncio
+async def test_close_can_defer_the_memory_write(monkeypatch):
+    monkeypatch.setenv("BEDROCK_AGENTCORE_MEMORY_ID", "memory-1")
+    written = []
+
+    async def create_memory_event(**kwargs):
+        written.append(kwargs)
+
+    session = S2sSessionManager(region="us-east-1", model_id="nova", user_id="u1", timezone="UTC")
+    monkeypatch.setattr(session, "_calendar_repository", lambda: SimpleNamespace(create_memory_event=create_memory_event))
+    session.is_active = True
+    session.conversation_history = [{"role": "USER", "content": "hi"}, {"role": "ASSISTANT", "content": "hello"}]
+
+    await session.close(flush_memory=False)
+    assert written == []
+    assert await session.flush_deferred_memory() is True
+
+    assert written[0]["actorId"] == "u1"
+    assert [turn["conversational"]["role"] for turn in written[0]["payload"]] == ["USER", "ASSISTANT"]
+    assert await session.flush_deferred_memory() is False
+
+
+@pytest.mark.asyncio
+async def test_session_is_busy_while_the_user_is_speaking():
+    session = S2sSessionManager(region="us-east-1", model_id="nova", user_id="u1", timezone="UTC")
+    sent = []
+
+    async def record(event_name, payload):
+        sent.append(event_name)
+
+    session.send_encoded_event = record
+    assert session.is_idle()
+
+    await session.send_raw_event(
+        {"event": {"contentStart": {"promptName": "p1", "contentName": "audio-1", "type": "AUDIO", "role": "USER"}}}
+    )
+    assert not session.is_idle()
+
+    await session.send_raw_event({"event": {"contentEnd": {"promptName": "p1", "contentName": "audio-1"}}})
+    assert session.is_idle()
+    assert sent == ["contentStart", "contentEnd"]
+
+
+def test_admin_drain_requires_the_admin_token(monkeypatch):
+    monkeypatch.setattr(agent, "ADMIN_TOKEN", None)
+    client = TestClient(agent.app)
+
+    assert client.post("/admin/drain").status_code == 403
+    monkeypatch.setattr(agent, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/drain", headers={"X-Admin-Token": "wrong"}).status_code == 403
@@ -0,0 +1,143 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import s2s_session_manager
+from embedding_cache import EmbeddingCache, normalize_text
+from metrics import EMBEDDING_CACHE_REQUESTS
+from s2s_session_manager import S2sSessionManager
+from tool_executor import ToolExecutor
+from in_memory_services import InMemoryBedrock, InMemoryDynamoDB, InMemoryOpenSearch
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting(vector):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return list(vector)
+
+    return compute, calls
+
+
+def test_repeated_titles_are_served_from_cache_by_normalized_text_and_model():
+    cache = EmbeddingCache(max_vectors=10, ttl_seconds=60)
+    compute, calls = counting([0.5, 0.25])
+    hits_before = EMBEDDING_CACHE_REQUESTS.labels("hit").value
+
+    assert cache.get("Dentist  Appointment", "titan", compute) == [0.5, 0.25]
+    assert cache.get(" dentist appointment", "titan", compute) == [0.5, 0.25]
+    cache.get("dentist appointment", "other-model", compute)
+
+    assert len(calls) == 2
+    assert normalize_text("  Dentist\tAPPOINTMENT ") == "dentist appointment"
+    assert cache.stats()["hits"] == 1
+    assert EMBEDDING_CACHE_REQUESTS.labels("hit").value == hits_before + 1
+
+
+def test_entries_expire_and_least_recently_used_is_evicted_first():
+    clock = Clock()
+    cache = EmbeddingCache(max_vectors=2, ttl_seconds=10, clock=clock)
+    compute, calls = counting([1.0])
+
+    cache.get("a", "m", compute)
+    cache.get("b", "m", compute)
+    cache.get("a", "m", compute)  # "b" is now least recently used
+    cache.get("c", "m", compute)
+    assert len(cache) == 2 and len(calls) == 3
+
+    cache.get("a", "m", compute)
+    assert len(calls) == 3
+    cache.get("b", "m", compute)
+    assert len(calls) == 4
+
+    clock.now = 11
+    cache.get("b", "m", compute)
+    assert len(calls) == 5
+
+
+def test_concurrent_misses_for_one_title_share_a_single_request():
+    cache = EmbeddingCache(max_vectors=10, ttl_seconds=60)
+    release = threading.Event()
+    calls = []
+
+    def slow_compute():
+        calls.append(1)
+        release.wait(2)
+        return [0.1, 0.2]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("Gym", "m", slow_compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == [[0.1, 0.2]] * 5
+
+
+def test_counters_updated_from_many_threads_add_up():
+    cache = EmbeddingCache(max_vectors=4, ttl_seconds=60)
+    before = sum(EMBEDDING_CACHE_REQUESTS.labels(result).value for result in ("hit", "miss", "coalesced"))
+
+    def lookups(n):
+        for i in range(500):
+            cache.get(f"title {(n + i) % 8}", "m", lambda: [0.1])
+
+    threads = [threading.Thread(target=lookups, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    after = sum(EMBEDDING_CACHE_REQUESTS.labels(result).value for result in ("hit", "miss", "coalesced"))
+    stats = cache.stats()
+    assert after - before == stats["hits"] + stats["misses"] + stats["coalesced"] == 8 * 500
+
+
+def test_failures_are_not_cached():
+    cache = EmbeddingCache(max_vectors=10, ttl_seconds=60)
+
+    def failing():
+        raise RuntimeError("throttled")
+
+    with pytest.raises(RuntimeError):
+        cache.get("Gym", "m", failing)
+    assert cache.get("Gym", "m", lambda: [1.0]) == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_tools_skip_the_embedding_call_for_a_title_seen_before(monkeypatch):
+    bedrock = InMemoryBedrock()
+    monkeypatch.setattr(s2s_session_manager, "ddb_client", InMemoryDynamoDB())
+    monkeypatch.setattr(s2s_session_manager, "bedrock_client", bedrock)
+    monkeypatch.setattr(s2s_session_manager, "opensearch_client", InMemoryOpenSearch())
+    executor = ToolExecutor(max_workers=2, max_per_user=2)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor)
+
+    try:
+        await s.processToolUse("open_event", {"content": '{"current_title": "Dentist"}'})
+        await s.processToolUse("delete_event", {"content": '{"title": "dentist"}'})
+        await s.processToolUse("update_event", {"content": '{"current_title": "DENTIST", "new_title": "x"}'})
+    finally:
+        executor.shutdown()
+
+    assert len(bedrock.invocations) == 1
@@ -0,0 +1,63 @@
+import sys
+import json
+import base64
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from event_serializer import EventSerializer
+
+
+def _audio_output(content, content_id="c1"):
+    return {
+        "event": {"audioOutput": {"promptName": "p1", "contentId": content_id, "content": content}},
+        "timestamp": 1767225600000,
+    }
+
+
+def test_small_events_are_encoded_like_json_dumps():
+    serializer = EventSerializer()
+    response = {"event": {"textOutput": {"content": "Hi \"there\" ☺", "role": "ASSISTANT"}}, "timestamp": 1}
+
+    assert serializer.serialize(response) == [json.dumps(response)]
+    # Events without string content are never split and use json_codec's compact encoding.
+    assert [json.loads(frame) for frame in serializer.serialize({"type": "end_conversation"})] == [
+        {"type": "end_conversation"}
+    ]
+
+
+def test_large_audio_output_is_split_on_base64_groups():
+    serializer = EventSerializer(max_size=1000)
+    content = base64.b64encode(bytes(range(256)) * 10).decode("ascii")
+
+    frames = serializer.serialize(_audio_output(content))
+    decoded = [json.loads(frame) for frame in frames]
+
+    assert len(frames) > 1
+    assert all(len(frame) <= 1000 for frame in frames)
+    assert all(len(d["event"]["audioOutput"]["content"]) % 4 == 0 for d in decoded[:-1])
+    assert "".join(d["event"]["audioOutput"]["content"] for d in decoded) == content
+    assert {(d["event"]["audioOutput"]["contentId"], d["timestamp"]) for d in decoded} == {("c1", 1767225600000)}
+
+
+def test_large_text_with_escapes_round_trips():
+    serializer = EventSerializer(max_size=300)
+    content = 'line "one"\n' * 80
+    response = {"event": {"textOutput": {"content": content, "meta": {"nested": [1, 2]}}}}
+
+    frames = serializer.serialize(response)
+
+    assert len(frames) > 1
+    assert "".join(json.loads(f)["event"]["textOutput"]["content"] for f in frames) == content
+    assert all(json.loads(f)["event"]["textOutput"]["meta"] == {"nested": [1, 2]} for f in frames)
+
+
+def test_templates_are_cached_per_event_metadata():
+    serializer = EventSerializer()
+
+    for _ in range(3):
+        serializer.serialize(_audio_output("AAEC"))
+    serializer.serialize(_audio_output("AAEC", content_id="c2"))
+
+    assert serializer.template_misses == 2
+    assert serializer.template_hits == 2
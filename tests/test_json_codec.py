@@ -0,0 +1,60 @@
+import sys
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import json_codec
+
+BACKENDS = ["stdlib", pytest.param("orjson", marks=pytest.mark.skipif(json_codec.orjson is None, reason="orjson not installed"))]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_codec.backend_name()
+    assert json_codec.use_backend(request.param) == request.param
+    yield request.param
+    json_codec.use_backend(previous)
+
+
+def test_tool_result_types_encode_like_json_default(backend):
+    result = {
+        "count": Decimal("3"),
+        "duration": Decimal("1.5"),
+        "day": date(2026, 10, 17),
+        "at": datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc),
+        "tags": {"work"},
+        "title": "Café ☕",
+    }
+
+    encoded = json_codec.dumps(result)
+
+    assert json.loads(encoded) == json.loads(json.dumps(result, default=json_codec.json_default))
+    assert json_codec.dumps_bytes(result) == encoded.encode("utf-8")
+
+
+def test_round_trips_str_and_bytes(backend):
+    event = {"event": {"audioOutput": {"contentId": "a1", "content": "AAEC"}}, "timestamp": 1}
+
+    assert json_codec.loads(json_codec.dumps(event)) == event
+    assert json_codec.loads(json_codec.dumps_bytes(event)) == event
+
+
+def test_decode_errors_are_json_decode_errors(backend):
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads('{"event": ')
+    with pytest.raises(TypeError):
+        json_codec.dumps({"value": object()})
+
+
+def test_unknown_backend_falls_back_to_an_available_one():
+    previous = json_codec.backend_name()
+    try:
+        assert json_codec.use_backend("stdlib") == "stdlib"
+        assert json_codec.use_backend("auto") == ("orjson" if json_codec.orjson is not None else "stdlib")
+    finally:
+        json_codec.use_backend(previous)
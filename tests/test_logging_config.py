@@ -0,0 +1,98 @@
+import io
+import sys
+import queue
+import logging
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import logging_config
+from logging_config import AsyncQueueHandler, SamplingFilter, Summarizer, parse_sample_rates
+
+
+def make_record(name="tools.update_event_tool", level=logging.INFO, msg="item %s", args=(), lineno=10):
+    return logging.LogRecord(name, level, "/app/src/tools/update_event_tool.py", lineno, msg, args, None)
+
+
+def test_summarize_redacts_private_fields_and_bounds_size():
+    summarize = Summarizer(max_chars=200)
+    item = {
+        "id": {"S": "evt-1"},
+        "content": {"S": "private editor document " * 200},
+        "description": {"S": "notes"},
+        "exceptionDates": {"L": [{"S": f"2026-01-{day:02d}"} for day in range(1, 29)]},
+    }
+
+    rendered = summarize(item)
+
+    assert "'id': {'S': 'evt-1'}" in rendered
+    assert "'content': <redacted>" in rendered
+    assert "'description': <redacted>" in rendered
+    assert "private editor document" not in rendered
+    assert len(rendered) <= 200 + len("...(+9999 chars)")
+    assert summarize(42) == 42
+    assert summarize("x" * 300).endswith("...(+100 chars)")
+
+
+def test_queue_handler_writes_summarized_records_from_listener(monkeypatch):
+    stream = io.StringIO()
+    logger = logging.getLogger("test_logging_config.pipeline")
+    monkeypatch.setattr(logger, "propagate", True)
+    handler = logging_config.configure_logging(stream=stream, sample_rates={})
+    try:
+        payload = {"userId": "u1", "prompt": "rewrite my notes", "content": {"type": "doc"}}
+        logger.info("Payload for content update Lambda: %s", payload)
+        payload["userId"] = "mutated after the call"
+    finally:
+        logging_config.stop_logging()
+
+    output = stream.getvalue()
+    assert isinstance(handler, AsyncQueueHandler)
+    assert "Payload for content update Lambda: {'userId': 'u1', 'prompt': <redacted>, 'content': <redacted>}" in output
+    assert "mutated" not in output
+    assert handler not in logging.getLogger().handlers
+
+
+def test_sampling_keeps_one_in_n_per_call_site_and_all_warnings():
+    sampler = SamplingFilter(parse_sample_rates("tools=5, bad, s2s_session_manager=x"))
+
+    kept = [sampler.filter(make_record()) for _ in range(10)]
+    other_site = sampler.filter(make_record(lineno=11))
+    warnings = [sampler.filter(make_record(level=logging.WARNING)) for _ in range(3)]
+    unsampled = [sampler.filter(make_record(name="agent")) for _ in range(3)]
+
+    assert sampler.rates == {"tools": 5}
+    assert kept.count(True) == 2
+    assert other_site is True
+    assert all(warnings) and all(unsampled)
+    assert sampler.sampled_out == 8
+
+
+def test_sampling_counts_stay_exact_across_threads():
+    sampler = SamplingFilter({"tools": 10})
+    record = make_record()
+    kept = []
+
+    def log_many():
+        kept.append(sum(sampler.filter(record) for _ in range(1000)))
+
+    threads = [threading.Thread(target=log_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(kept) == 800
+    assert sampler.sampled_out == 7200
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = AsyncQueueHandler(queue.Queue(maxsize=1))
+
+    handler.handle(make_record(args=({"a": 1},)))
+    handler.handle(make_record(args=({"a": 2},)))
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().getMessage() == "item {'a': 1}"
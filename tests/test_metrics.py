@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import agent
+from metrics import OUTPUT_DROPPED, MetricsRegistry
+from output_buffer import AUDIO, OutputBuffer
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    events = registry.counter("test_events_total", "Events", ["direction"])
+    latency = registry.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    registry.register_collector(lambda: [("test_depth", "Depth", ("queue",), {("audio",): 3})])
+
+    events.labels("sent").inc()
+    events.labels("sent").inc(2)
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    text = registry.render()
+
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{direction="sent"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+    assert 'test_depth{queue="audio"} 3' in text
+
+
+def test_output_buffer_drops_are_counted_per_class():
+    dropped_before = OUTPUT_DROPPED.labels(AUDIO).value
+    buffer = OutputBuffer(max_audio_ms=10)
+    chunk = {"event": {"audioOutput": {"content": "A" * 1280}}}  # 20 ms each
+
+    for _ in range(3):
+        buffer.put_nowait(chunk)
+
+    assert OUTPUT_DROPPED.labels(AUDIO).value - dropped_before == 2
+    assert buffer.queued_by_class()[AUDIO] == 1
+
+
+def test_metrics_endpoint_exposes_pipeline_gauges():
+    response = TestClient(agent.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for name in (
+        "clarity_active_sessions",
+        "clarity_output_queue_depth",
+        "clarity_audio_input_dropped_total",
+        "clarity_tool_duration_seconds",
+        "clarity_memory_flush_seconds",
+    ):
+        assert f"# TYPE {name}" in response.text
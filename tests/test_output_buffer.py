@@ -0,0 +1,93 @@
+import sys
+import base64
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from output_buffer import OutputBuffer, OutputBufferClosed
+
+
+def _audio(tag, ms=100):
+    pcm = bytes([tag]) * int(ms * 48)
+    return {"event": {"audioOutput": {"contentId": "c1", "content": base64.b64encode(pcm).decode("ascii")}}}
+
+
+def _text(content):
+    return {"event": {"textOutput": {"contentId": "t1", "content": content}}}
+
+
+def test_oldest_audio_is_evicted_and_control_events_survive():
+    buffer = OutputBuffer(max_audio_ms=300)
+    buffer.put_nowait({"event": {"contentStart": {"type": "AUDIO"}}})
+    for tag in range(3):
+        buffer.put_nowait(_audio(tag))
+    buffer.put_nowait(_text("hello"))
+    buffer.put_nowait({"event": {"toolUse": {"toolName": "read_events"}}})
+    for tag in range(3, 5):
+        buffer.put_nowait(_audio(tag))
+
+    delivered = []
+    while not buffer.empty():
+        delivered.append(buffer.get_nowait())
+
+    names = [next(iter(event["event"])) for event in delivered]
+    audio_tags = [base64.b64decode(e["event"]["audioOutput"]["content"])[0] for e in delivered if "audioOutput" in e["event"]]
+    assert names == ["contentStart", "audioOutput", "textOutput", "toolUse", "audioOutput", "audioOutput"]
+    assert audio_tags == [2, 3, 4]
+    stats = buffer.stats()
+    assert stats["dropped"] == {"audio": 2, "text": 0, "control": 0}
+    assert stats["dropped_audio_ms"] == pytest.approx(200)
+    assert stats["buffered_audio_ms"] == 0
+
+
+def test_text_and_control_events_are_never_bounded():
+    buffer = OutputBuffer(max_audio_ms=0)
+    for i in range(1000):
+        buffer.put_nowait(_text(str(i)))
+
+    assert buffer.qsize() == 1000
+    assert buffer.stats()["dropped"]["text"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_the_next_event():
+    buffer = OutputBuffer()
+    getter = asyncio.create_task(buffer.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    await buffer.put(_text("hi"))
+
+    assert await asyncio.wait_for(getter, timeout=1) == _text("hi")
+    assert buffer.empty()
+
+
+class _ClosableInputStream:
+    async def close(self):
+        pass
+
+
+class _ClosableStream:
+    input_stream = _ClosableInputStream()
+
+
+@pytest.mark.asyncio
+async def test_session_close_delivers_end_conversation_then_signals_end(monkeypatch):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    from s2s_session_manager import S2sSessionManager
+
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+    s.stream = _ClosableStream()
+    s.is_active = True
+    s.end_conversation_requested = True
+    await s.output_queue.put(_text("goodbye"))
+
+    await s.close()
+
+    assert (await s.output_queue.get()) == _text("goodbye")
+    assert (await s.output_queue.get())["type"] == "end_conversation"
+    with pytest.raises(OutputBufferClosed):
+        await s.output_queue.get()
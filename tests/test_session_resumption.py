@@ -0,0 +1,140 @@
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import agent
+from bedrock_stream_pool import BedrockStreamPool
+from output_buffer import OutputBuffer
+from session_registry import ParkedSession, SessionRegistry
+
+
+class RecordingStreamManager:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.is_active = False
+        self._session_end_sent = False
+        self.output_queue = OutputBuffer()
+        self.events = []
+        self.closed = False
+        RecordingStreamManager.instances.append(self)
+
+    async def initialize_stream(self):
+        self.is_active = True
+
+    async def send_raw_event(self, event):
+        self.events.append(event)
+
+    def add_audio_chunk(self, prompt_name, content_name, audio):
+        pass
+
+    async def close(self):
+        self.closed = True
+        self.is_active = False
+        self._session_end_sent = True
+        self.output_queue.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIALOCAL")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "local-secret")
+    RecordingStreamManager.instances = []
+    monkeypatch.setattr(agent, "S2sSessionManager", RecordingStreamManager)
+    monkeypatch.setattr(agent, "bedrock_stream_pool", BedrockStreamPool(size=0))
+    monkeypatch.setattr(agent, "session_registry", SessionRegistry(grace_seconds=30, max_parked=4))
+    # One event loop for every connection, so parked sessions survive between them.
+    with TestClient(agent.app) as test_client:
+        yield test_client
+
+
+def _init(ws, **extra):
+    ws.send_text(json.dumps({"type": "init", "userId": "u1", "timezone": "UTC", **extra}))
+    return ws.receive_json()
+
+
+def test_dropped_socket_parks_session_and_reconnect_resumes_it(client):
+    with client.websocket_connect("/ws") as ws:
+        ack = _init(ws, resumable=True)
+        ws.send_text(json.dumps({"event": {"sessionStart": {}}}))
+        ws.send_text(json.dumps({"event": {"promptStart": {"promptName": "p1"}}}))
+        ws.close(code=1006)
+
+    manager = RecordingStreamManager.instances[0]
+    assert not manager.closed
+    assert agent.session_registry.stats()["parked"] == 1
+    # Produced while the client was away; delivered after reattaching.
+    manager.output_queue.put_nowait({"event": {"textOutput": {"content": "still here"}}})
+
+    with client.websocket_connect("/ws") as ws:
+        resumed_ack = _init(ws, resumeToken=ack["resumeToken"])
+        assert ws.receive_json() == {"event": {"textOutput": {"content": "still here"}}}
+        ws.send_text(json.dumps({"event": {"promptEnd": {"promptName": "p1"}}}))
+        ws.send_text(json.dumps({"event": {"sessionEnd": {}}}))
+
+    assert resumed_ack["resumed"] is True
+    assert resumed_ack["resumeToken"] != ack["resumeToken"]
+    assert len(RecordingStreamManager.instances) == 1
+    assert manager.events[-1] == {"event": {"promptEnd": {"promptName": "p1"}}}
+    assert manager.closed
+    assert agent.session_registry.stats()["resumed"] == 1
+
+
+def test_normal_close_and_unknown_token_do_not_resume(client):
+    with client.websocket_connect("/ws") as ws:
+        ack = _init(ws, resumable=True)
+        ws.send_text(json.dumps({"event": {"sessionStart": {}}}))
+
+    assert RecordingStreamManager.instances[0].closed
+    with client.websocket_connect("/ws") as ws:
+        resumed_ack = _init(ws, resumeToken=ack["resumeToken"])
+
+    assert resumed_ack["resumed"] is False
+    assert resumed_ack["resumeToken"]
+
+
+@pytest.mark.asyncio
+async def test_parked_sessions_expire_and_are_capped():
+    registry = SessionRegistry(grace_seconds=0.05, max_parked=2)
+    sessions = [RecordingStreamManager() for _ in range(3)]
+    for session in sessions:
+        session.is_active = True
+    for i, session in enumerate(sessions):
+        registry.park(f"t{i}", ParkedSession(session, "u1", "UTC", "json", "json"))
+    await asyncio.sleep(0)
+
+    assert sessions[0].closed
+    assert registry.resume("t1", "someone-else") is None
+    await asyncio.sleep(0.1)
+
+    assert all(session.closed for session in sessions)
+    stats = registry.stats()
+    assert (stats["parked"], stats["evicted"], stats["expired"], stats["rejected"]) == (0, 1, 2, 1)
+
+
+class FailingPermit:
+    def release(self):
+        raise RuntimeError("permit already released")
+
+
+@pytest.mark.asyncio
+async def test_failed_close_of_an_evicted_session_is_logged(caplog):
+    registry = SessionRegistry(grace_seconds=30, max_parked=1)
+    first, second = RecordingStreamManager(), RecordingStreamManager()
+    registry.park("t0", ParkedSession(first, "u1", "UTC", "json", "json", permit=FailingPermit()))
+    registry.park("t1", ParkedSession(second, "u2", "UTC", "json", "json"))
+
+    assert len(registry._close_tasks) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert first.closed
+    assert not registry._close_tasks
+    assert "Error closing discarded parked session" in caplog.text
+    await registry.close_all()
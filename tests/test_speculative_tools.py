@@ -0,0 +1,122 @@
+import sys
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import s2s_session_manager
+from s2s_session_manager import PendingTool, S2sSessionManager
+from tool_executor import ToolExecutor
+from tools.candidate_lookup import candidate_lookup, parse_query
+from in_memory_services import InMemoryBedrock, InMemoryDynamoDB, InMemoryOpenSearch, text_embedding
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(max_workers=4, max_per_user=4)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def services(monkeypatch):
+    ddb, bedrock, opensearch = InMemoryDynamoDB(), InMemoryBedrock(), InMemoryOpenSearch()
+    opensearch.index(
+        "calendar-events",
+        "doc-1",
+        {
+            "eventId": "evt-42",
+            "userId": "test-user",
+            "title": "Dentist",
+            "startDate": "2026-03-02T15:00:00.000Z",
+            "endDate": "2026-03-02T16:00:00.000Z",
+            "title_vector": text_embedding("Dentist"),
+        },
+    )
+    ddb.put_item(TableName="Events", Item={"userId": {"S": "test-user"}, "id": {"S": "evt-42"}})
+    ddb.calls.clear()
+    monkeypatch.setattr(s2s_session_manager, "ddb_client", ddb)
+    monkeypatch.setattr(s2s_session_manager, "bedrock_client", bedrock)
+    monkeypatch.setattr(s2s_session_manager, "opensearch_client", opensearch)
+    return ddb, bedrock, opensearch
+
+
+def start_tool_use(s, tool_name, payload, tool_use_id="tool-1"):
+    pending = PendingTool({"toolUseId": tool_use_id, "toolName": tool_name, "content": json.dumps(payload)})
+    s._start_speculation(pending)
+    return pending
+
+
+@pytest.mark.asyncio
+async def test_open_event_lookups_start_at_tool_use_and_are_reused(services, executor):
+    ddb, bedrock, opensearch = services
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor)
+    payload = {"current_title": "dentist", "current_start_date": "2026-03-02", "current_start_time": "15:00"}
+
+    pending = start_tool_use(s, "open_event", payload)
+    _, _, task, _ = s._speculations["tool-1"]
+    assert await task is True
+    assert len(bedrock.invocations) == 1
+    assert sorted(index for index, _ in opensearch.searches) == ["calendar-events", "habits"]
+
+    res = await s.processToolUse("open_event", pending.tool_use_content)
+
+    assert res["event_details"] == {"eventId": "evt-42"}
+    assert len(bedrock.invocations) == 1
+    assert len(opensearch.searches) == 2
+    assert ddb.calls == []
+    assert s._speculations == {}
+
+
+@pytest.mark.asyncio
+async def test_delete_event_only_writes_once_the_tool_runs(services, executor):
+    ddb, bedrock, opensearch = services
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor)
+    payload = {"title": "Dentist", "start_date": "2026-03-02", "start_time": "15:00"}
+
+    pending = start_tool_use(s, "delete_event", payload)
+    await s._speculations["tool-1"][2]
+    assert ddb.calls == []
+
+    res = await s.processToolUse("delete_event", pending.tool_use_content)
+
+    assert res["result"] == "Successfully deleted the event 'Dentist'."
+    assert ddb.calls == [("delete_item", "Events")]
+    assert len(bedrock.invocations) == 1
+    assert len(opensearch.searches) == 2
+
+
+@pytest.mark.asyncio
+async def test_only_event_lookups_speculate_and_unused_ones_are_discarded(services, executor):
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="test-user", timezone="UTC", tool_executor=executor)
+    start_tool_use(s, "update_event", {"current_title": "Dentist", "new_title": "Orthodontist"})
+    start_tool_use(s, "read_events", {"title": "Dentist"}, tool_use_id="tool-2")
+    start_tool_use(s, "delete_event", {}, tool_use_id="tool-3")
+
+    assert list(s._speculations) == ["tool-1"]
+    s._discard_speculations()
+    assert s._speculations == {}
+
+
+def test_parse_query_follows_each_tools_payload_fields():
+    assert parse_query("delete_event", json.dumps({"title": "Gym", "start_date": "2026-03-02"}), "UTC") == (
+        "Gym", date(2026, 3, 2), None
+    )
+    assert parse_query("open_event", json.dumps({"current_title": "Gym", "current_start_time": "10:00"}), "UTC") == (
+        "Gym", None, "10:00"
+    )
+    # update_event searches today's events when no date is given
+    assert parse_query("update_event", json.dumps({"current_title": "Gym"}), "UTC")[1] is not None
+    assert parse_query("delete_event", json.dumps({"start_date": "2026-03-02"}), "UTC") is None
+    assert parse_query("delete_event", "not json", "UTC") is None
+    assert parse_query("create_event", json.dumps({"title": "Gym"}), "UTC") is None
+
+
+def test_speculative_lookup_is_only_reused_for_the_same_query():
+    prefetched = candidate_lookup(None, None, "u", "Gym", None, "10:00", "UTC")
+
+    assert candidate_lookup(prefetched, None, "u", "Gym", None, "10:00", "UTC") is prefetched
+    assert candidate_lookup(prefetched, None, "u", "Gym", None, "11:00", "UTC") is not prefetched
@@ -0,0 +1,193 @@
+import sys
+import json
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from metrics import TOOL_PERCEIVED_LATENCY_SECONDS, TOOL_TIMEOUT_SECONDS, TOOL_TIMEOUTS
+from s2s_session_manager import S2sSessionManager
+from tool_executor import ToolExecutor
+from tool_registry import CANCEL, CONTINUE, ToolRegistry, ToolSpec, parse_budget_overrides
+
+
+def make_session(monkeypatch, specs, tool_executor=None):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    registry = ToolRegistry(specs=specs, default_budget=1.0, overrides={})
+    s = S2sSessionManager(
+        region="us-east-1", model_id="m", user_id="u", timezone="UTC", tool_registry=registry, tool_executor=tool_executor
+    )
+    s.prompt_name = "p1"
+    sent = []
+
+    async def record(event):
+        sent.append(event)
+
+    s.send_raw_event = record
+    return s, sent
+
+
+def tool_results(sent):
+    return [json.loads(event["event"]["toolResult"]["content"]) for event in sent if "toolResult" in event["event"]]
+
+
+def context_messages(sent):
+    return [event["event"]["textInput"]["content"] for event in sent if "textInput" in event["event"]]
+
+
+@pytest.mark.asyncio
+async def test_slow_lookup_is_cancelled_and_model_gets_retry_result(monkeypatch):
+    s, sent = make_session(monkeypatch, [ToolSpec("read_events", 0.05, CANCEL)])
+    cancelled = asyncio.Event()
+    timeouts_before = TOOL_TIMEOUTS.labels("read_events", CANCEL).value
+
+    async def slow_tool(tool_name, tool_use_content):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    s.processToolUse = slow_tool
+
+    await asyncio.wait_for(s._handle_tool_processing("p1", "read_events", {"content": "{}"}, "tool-1"), timeout=2)
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    [result] = tool_results(sent)
+    assert result["status"] == "TIMED_OUT"
+    assert result["retryable"] is True
+    assert context_messages(sent) == []
+    assert TOOL_TIMEOUTS.labels("read_events", CANCEL).value == timeouts_before + 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_lookup_keeps_its_executor_slot_until_the_thread_returns(monkeypatch):
+    executor = ToolExecutor(max_workers=2, max_per_user=1)
+    s, sent = make_session(monkeypatch, [ToolSpec("read_events", 0.05, CANCEL)], tool_executor=executor)
+
+    async def blocking_lookup(tool_name, tool_use_content):
+        return await executor.run("u", time.sleep, 0.3)
+
+    s.processToolUse = blocking_lookup
+    try:
+        await asyncio.wait_for(s._handle_tool_processing("p1", "read_events", {"content": "{}"}, "tool-6"), timeout=2)
+
+        assert tool_results(sent)[0]["status"] == "TIMED_OUT"
+        await asyncio.sleep(0.01)
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["active_users"]) == (1, 0, 1)
+
+        for _ in range(100):
+            if not executor.stats()["running"]:
+                break
+            await asyncio.sleep(0.02)
+        await asyncio.sleep(0.01)
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"], stats["active_users"]) == (0, 0, 0)
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_slow_write_finishes_and_is_reported_in_a_follow_up(monkeypatch):
+    s, sent = make_session(monkeypatch, [ToolSpec("update_event", 0.05, CONTINUE)])
+    finish = asyncio.Event()
+    observed_before = TOOL_TIMEOUT_SECONDS.labels("update_event").count
+
+    async def slow_write(tool_name, tool_use_content):
+        await finish.wait()
+        return {"result": "Moved the dentist to Tuesday at 3pm"}
+
+    s.processToolUse = slow_write
+    task = asyncio.create_task(s._handle_tool_processing("p1", "update_event", {"content": "{}"}, "tool-2"))
+
+    while not tool_results(sent):
+        await asyncio.sleep(0.01)
+    [interim] = tool_results(sent)
+    assert interim["status"] == "IN_PROGRESS"
+    assert not task.done()
+
+    finish.set()
+    await asyncio.wait_for(task, timeout=2)
+
+    [follow_up] = context_messages(sent)
+    assert "update_event" in follow_up
+    assert "Moved the dentist to Tuesday at 3pm" in follow_up
+    assert len(tool_results(sent)) == 1
+    starts = [event["event"]["contentStart"] for event in sent if "contentStart" in event["event"]]
+    assert [start["role"] for start in starts] == ["TOOL", "USER"]
+    assert TOOL_TIMEOUT_SECONDS.labels("update_event").count == observed_before + 1
+
+
+@pytest.mark.asyncio
+async def test_fast_tool_result_is_sent_unchanged(monkeypatch):
+    s, sent = make_session(monkeypatch, [ToolSpec("read_events", 1.0, CANCEL)])
+
+    async def fast_tool(tool_name, tool_use_content):
+        return {"result": "2 events"}
+
+    s.processToolUse = fast_tool
+
+    await s._handle_tool_processing("p1", "read_events", {"content": "{}"}, "tool-3")
+
+    assert tool_results(sent) == [{"result": "2 events"}]
+
+
+@pytest.mark.asyncio
+async def test_slow_tool_gets_progress_prompt_before_its_result(monkeypatch):
+    s, sent = make_session(monkeypatch, [ToolSpec("update_event", 2.0, CONTINUE, progress_after_seconds=0.02)])
+    progress_before = TOOL_PERCEIVED_LATENCY_SECONDS.labels("update_event", "progress").count
+
+    async def slow_write(tool_name, tool_use_content):
+        await asyncio.sleep(0.1)
+        return {"result": "Updated the dentist notes"}
+
+    s.processToolUse = slow_write
+
+    await asyncio.wait_for(s._handle_tool_processing("p1", "update_event", {"content": "{}"}, "tool-4"), timeout=2)
+
+    [progress] = context_messages(sent)
+    assert "working on it" in progress
+    assert tool_results(sent) == [{"result": "Updated the dentist notes"}]
+    starts = [event["event"]["contentStart"] for event in sent if "contentStart" in event["event"]]
+    assert [start["role"] for start in starts] == ["USER", "TOOL"]
+    assert TOOL_PERCEIVED_LATENCY_SECONDS.labels("update_event", "progress").count == progress_before + 1
+
+
+@pytest.mark.asyncio
+async def test_no_progress_prompt_when_tool_finishes_in_time(monkeypatch):
+    s, sent = make_session(monkeypatch, [ToolSpec("create_event", 2.0, CONTINUE, progress_after_seconds=1.0)])
+    result_before = TOOL_PERCEIVED_LATENCY_SECONDS.labels("create_event", "result").count
+
+    async def fast_write(tool_name, tool_use_content):
+        return {"result": "Created"}
+
+    s.processToolUse = fast_write
+
+    await s._handle_tool_processing("p1", "create_event", {"content": "{}"}, "tool-5")
+
+    assert context_messages(sent) == []
+    assert tool_results(sent) == [{"result": "Created"}]
+    assert TOOL_PERCEIVED_LATENCY_SECONDS.labels("create_event", "result").count == result_before + 1
+
+
+def test_registry_budgets_and_overrides():
+    registry = ToolRegistry(
+        specs=[ToolSpec("update_event", 6.0, CONTINUE, progress_after_seconds=1.5)],
+        default_budget=3.0,
+        overrides=parse_budget_overrides("update_event=9, read_events=2.5, bogus, zero=0"),
+    )
+
+    assert registry.get("UPDATE_EVENT").budget_seconds == 9.0
+    assert registry.get("update_event").on_timeout == CONTINUE
+    assert registry.get("update_event").progress_prompt_due()
+    assert registry.get("read_events").budget_seconds == 2.5
+    unknown = registry.get("something_new")
+    assert (unknown.budget_seconds, unknown.on_timeout) == (3.0, CANCEL)
+    assert not unknown.progress_prompt_due()
+    assert not ToolSpec("x", 1.0, CONTINUE, progress_after_seconds=2.0).progress_prompt_due()
+    with pytest.raises(ValueError):
+        ToolSpec("x", 1.0, "ignore")
@@ -0,0 +1,129 @@
+import sys
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from tool_executor import ToolExecutor
+
+
+@pytest.mark.asyncio
+async def test_run_executes_off_the_event_loop_thread():
+    executor = ToolExecutor(max_workers=2, max_per_user=1)
+    loop_thread = threading.get_ident()
+
+    try:
+        thread_id = await executor.run("user-1", threading.get_ident)
+    finally:
+        executor.shutdown()
+
+    assert thread_id != loop_thread
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_loop_keeps_running_while_tool_blocks():
+    executor = ToolExecutor(max_workers=2, max_per_user=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    try:
+        await executor.run("user-1", time.sleep, 0.2)
+    finally:
+        tick_task.cancel()
+        await asyncio.gather(tick_task, return_exceptions=True)
+        executor.shutdown()
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_per_user_limit_serializes_one_users_calls():
+    executor = ToolExecutor(max_workers=4, max_per_user=1)
+    lock = threading.Lock()
+    concurrent = 0
+    peak = 0
+
+    def tool():
+        nonlocal concurrent, peak
+        with lock:
+            concurrent += 1
+            peak = max(peak, concurrent)
+        time.sleep(0.05)
+        with lock:
+            concurrent -= 1
+
+    try:
+        await asyncio.gather(*(executor.run("user-1", tool) for _ in range(3)))
+    finally:
+        executor.shutdown()
+
+    assert peak == 1
+    assert executor.stats()["max_queue_depth"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_cancelling_queued_call_prevents_execution():
+    executor = ToolExecutor(max_workers=1, max_per_user=1)
+    release = threading.Event()
+    ran = []
+
+    try:
+        first = asyncio.create_task(executor.run("user-1", release.wait, 1))
+        second = asyncio.create_task(executor.run("user-1", ran.append, "second"))
+        await asyncio.sleep(0.05)
+        assert executor.queue_depth == 1
+
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        release.set()
+        await first
+    finally:
+        executor.shutdown()
+
+    assert ran == []
+    stats = executor.stats()
+    assert stats["cancelled"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["active_users"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_running_call_keeps_counters_and_user_slot():
+    executor = ToolExecutor(max_workers=2, max_per_user=1)
+    ran = []
+
+    try:
+        running = asyncio.create_task(executor.run("user-1", time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+
+        stats = executor.stats()
+        assert (stats["running"], stats["queue_depth"]) == (1, 0)
+        # The cancelled call's thread still holds user-1's only slot.
+        follow_up = asyncio.create_task(executor.run("user-1", ran.append, "next"))
+        await asyncio.sleep(0.05)
+        assert ran == []
+        assert executor.queue_depth == 1
+
+        await asyncio.wait_for(follow_up, timeout=2)
+    finally:
+        executor.shutdown()
+
+    assert ran == ["next"]
+    stats = executor.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+    assert stats["cancelled"] == 1
+    assert stats["active_users"] == 0
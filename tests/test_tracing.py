@@ -0,0 +1,146 @@
+import sys
+import json
+import asyncio
+import base64
+import contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import s2s_session_manager
+import tracing
+from s2s_session_manager import S2sSessionManager
+
+
+class RecordedSpan:
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.ended = False
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        self.ended = True
+
+
+class RecordingTracer:
+    """Stands in for an OpenTelemetry tracer; the current span lives in a ContextVar like the real one."""
+
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar("current_span", default=None)
+
+    def start_span(self, name, context=None, attributes=None, start_time=None):
+        recorded = RecordedSpan(name, context if context is not None else self._current.get(), attributes)
+        self.spans.append(recorded)
+        return recorded
+
+    @contextmanager
+    def start_as_current_span(self, name, context=None, attributes=None, start_time=None):
+        recorded = self.start_span(name, context, attributes, start_time)
+        token = self._current.set(recorded)
+        try:
+            yield recorded
+        finally:
+            self._current.reset(token)
+            recorded.end()
+
+    def named(self, name):
+        matches = [recorded for recorded in self.spans if recorded.name == name]
+        assert matches, f"no {name} span in {[recorded.name for recorded in self.spans]}"
+        return matches[0]
+
+
+class ScriptedReceiver:
+    def __init__(self, events):
+        self.events = list(events)
+        self.drained = asyncio.Event()
+
+    async def receive(self):
+        if not self.events:
+            # Keep the stream open so in-flight tool tasks are not cancelled by close()
+            self.drained.set()
+            await asyncio.Event().wait()
+        payload = json.dumps(self.events.pop(0)).encode("utf-8")
+        return SimpleNamespace(value=SimpleNamespace(bytes_=payload))
+
+
+class ScriptedStream:
+    def __init__(self, events):
+        self.receiver = ScriptedReceiver(events)
+        self.input_stream = SimpleNamespace(close=self._close)
+
+    async def _close(self):
+        pass
+
+    async def await_output(self):
+        return None, self.receiver
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    recording = RecordingTracer()
+    monkeypatch.setattr(tracing, "_tracer", recording)
+    monkeypatch.setattr(tracing, "trace", SimpleNamespace(set_span_in_context=lambda parent: parent))
+    return recording
+
+
+@pytest.mark.asyncio
+async def test_turn_and_tool_spans_nest_aws_calls(tracer, monkeypatch):
+    monkeypatch.delenv("BEDROCK_AGENTCORE_MEMORY_ID", raising=False)
+    ddb = Mock()
+    monkeypatch.setattr(s2s_session_manager, "ddb_client", ddb)
+    s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
+
+    async def fake_tool(tool_name, tool_use_content):
+        repo = s._calendar_repository()
+        await repo.get_item("Events", {})
+        return {"result": "ok"}
+
+    s.processToolUse = fake_tool
+    s.stream = ScriptedStream(
+        [
+            {"event": {"contentStart": {"contentId": "u1", "type": "TEXT", "role": "USER"}}},
+            {"event": {"contentEnd": {"contentId": "u1", "type": "TEXT"}}},
+            {"event": {"toolUse": {"toolName": "read_events", "toolUseId": "tool-1", "content": "{}"}}},
+            {"event": {"contentEnd": {"contentId": "t1", "type": "TOOL", "promptName": "p1"}}},
+            {"event": {"audioOutput": {"contentId": "a1", "content": base64.b64encode(bytes(480)).decode()}}},
+        ]
+    )
+    s.is_active = True
+
+    processing = asyncio.create_task(s._process_responses())
+    await asyncio.wait_for(s.stream.receiver.drained.wait(), timeout=5)
+    await asyncio.gather(*list(s.tool_processing_tasks))
+    processing.cancel()
+    await asyncio.gather(processing, return_exceptions=True)
+
+    turn = tracer.named("voice.turn")
+    tool = tracer.named("tool.read_events")
+    ddb_call = tracer.named("dynamodb.get_item")
+    assert turn.ended
+    assert turn.attributes["clarity.turn_trigger"] == "user_transcript_end"
+    assert "clarity.time_to_first_audio_ms" in turn.attributes
+    assert tool.parent is turn
+    assert tool.attributes["clarity.tool_use_id"] == "tool-1"
+    assert ddb_call.parent is tool
+    ddb.get_item.assert_called_once_with(TableName="Events", Key={})
+
+
+def test_helpers_are_no_ops_without_opentelemetry(monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    client = object()
+
+    with tracing.span("anything") as current:
+        assert current is None
+    assert tracing.start_span("anything") is None
+    tracing.end_span(None)
+    assert tracing.traced_client(client, "dynamodb") is client
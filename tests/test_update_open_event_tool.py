@@ -8,6 +8,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 import pytest
 import s2s_session_manager
 from s2s_session_manager import S2sSessionManager
+from data_access import CalendarRepository
 from tools.update_open_event_tool import update_open_event_tool
 
 
@@ -15,18 +16,22 @@ deserializer = TypeDeserializer()
 serializer = TypeSerializer()
 
 
+def _repository(ddb_client, lambda_client):
+    return CalendarRepository(ddb_client, lambda_client, None, None, user_id="user-1")
+
+
 def _make_ddb_item(event_dict):
     return {k: serializer.serialize(v) for k, v in event_dict.items()}
 
 
 
-def test_update_open_event_tool_undo_no_snapshot_returns_noop():
+@pytest.mark.asyncio
+async def test_update_open_event_tool_undo_no_snapshot_returns_noop():
     mock_ddb = Mock()
     mock_lambda = Mock()
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"action": "undo"}),
         "UTC",
@@ -39,7 +44,8 @@ def test_update_open_event_tool_undo_no_snapshot_returns_noop():
     assert not mock_ddb.put_item.called
 
 
-def test_update_open_event_tool_undo_restores_snapshot():
+@pytest.mark.asyncio
+async def test_update_open_event_tool_undo_restores_snapshot():
     mock_ddb = Mock()
     mock_lambda = Mock()
     snapshot = {
@@ -50,9 +56,8 @@ def test_update_open_event_tool_undo_restores_snapshot():
         "endDate": "2026-01-01T11:00:00+00:00",
     }
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"action": "undo"}),
         "UTC",
@@ -65,13 +70,13 @@ def test_update_open_event_tool_undo_restores_snapshot():
     assert mock_ddb.put_item.called
 
 
-def test_update_open_event_tool_undo_noop_when_event_changed():
+@pytest.mark.asyncio
+async def test_update_open_event_tool_undo_noop_when_event_changed():
     mock_ddb = Mock()
     mock_lambda = Mock()
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"action": "undo"}),
         "UTC",
@@ -84,7 +89,8 @@ def test_update_open_event_tool_undo_noop_when_event_changed():
     assert not mock_ddb.put_item.called
 
 
-def test_update_returns_pre_update_snapshot():
+@pytest.mark.asyncio
+async def test_update_returns_pre_update_snapshot():
     """pre_update_snapshot in the result should reflect event state BEFORE the update."""
     mock_ddb = Mock()
     mock_lambda = Mock()
@@ -98,9 +104,8 @@ def test_update_returns_pre_update_snapshot():
     }
     mock_ddb.get_item.return_value = {"Item": _make_ddb_item(original_event)}
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"title": "Updated Title"}),
         "UTC",
@@ -118,7 +123,8 @@ def test_update_returns_pre_update_snapshot():
     assert updated["description"] == "Updated Title"
 
 
-def test_update_then_undo_restores_original():
+@pytest.mark.asyncio
+async def test_update_then_undo_restores_original():
     """Round-trip: update followed by undo using pre_update_snapshot restores the original event."""
     mock_ddb = Mock()
     mock_lambda = Mock()
@@ -133,9 +139,8 @@ def test_update_then_undo_restores_original():
     mock_ddb.get_item.return_value = {"Item": _make_ddb_item(original_event)}
 
     # First call: update the title
-    update_result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    update_result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"title": "Updated Title"}),
         "UTC",
@@ -151,9 +156,8 @@ def test_update_then_undo_restores_original():
     }
 
     # Second call: undo
-    undo_result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    undo_result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"action": "undo"}),
         "UTC",
@@ -172,7 +176,7 @@ async def test_update_open_event_sets_open_event_pre_last_update(monkeypatch):
     s = S2sSessionManager(region="us-east-1", model_id="m", user_id="u", timezone="UTC")
     s.open_event_id = "evt-1"
 
-    def fake_update_open_event_tool(*args, **kwargs):
+    async def fake_update_open_event_tool(*args, **kwargs):
         return {
             "result": "Updated the event.",
             "tool_name": "update_open_event_tool",
@@ -205,7 +209,8 @@ async def test_close_event_clears_open_event_pre_last_update():
 
 
 
-def test_update_open_event_tool_update_serializes_decimal_and_normalizes_utc_z():
+@pytest.mark.asyncio
+async def test_update_open_event_tool_update_serializes_decimal_and_normalizes_utc_z():
     mock_ddb = Mock()
     mock_lambda = Mock()
     mock_ddb.get_item.return_value = {
@@ -220,9 +225,8 @@ def test_update_open_event_tool_update_serializes_decimal_and_normalizes_utc_z()
         }
     }
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"title": "after update"}),
         "UTC",
@@ -236,7 +240,8 @@ def test_update_open_event_tool_update_serializes_decimal_and_normalizes_utc_z()
     assert payload["endDate"].endswith("Z")
 
 
-def test_update_open_event_tool_undo_serializes_decimal_snapshot():
+@pytest.mark.asyncio
+async def test_update_open_event_tool_undo_serializes_decimal_snapshot():
     mock_ddb = Mock()
     mock_lambda = Mock()
     snapshot = {
@@ -248,9 +253,8 @@ def test_update_open_event_tool_undo_serializes_decimal_snapshot():
         "done": Decimal("1"),
     }
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"action": "undo"}),
         "UTC",
@@ -263,7 +267,8 @@ def test_update_open_event_tool_undo_serializes_decimal_snapshot():
     assert payload["done"] == 1
 
 
-def test_update_open_event_tool_recurrence_no_habit_creates_and_attaches(monkeypatch):
+@pytest.mark.asyncio
+async def test_update_open_event_tool_recurrence_no_habit_creates_and_attaches(monkeypatch):
     mock_ddb = Mock()
     mock_lambda = Mock()
 
@@ -285,9 +290,8 @@ def test_update_open_event_tool_recurrence_no_habit_creates_and_attaches(monkeyp
 
     monkeypatch.setattr(tool_mod.uuid, "uuid4", lambda: "new-habit-id")
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({
             "frequency": 2,
@@ -317,7 +321,8 @@ def test_update_open_event_tool_recurrence_no_habit_creates_and_attaches(monkeyp
     assert habits_item["stopDate"] is None
 
 
-def test_update_open_event_tool_recurrence_with_habit_splits_series(monkeypatch):
+@pytest.mark.asyncio
+async def test_update_open_event_tool_recurrence_with_habit_splits_series(monkeypatch):
     mock_ddb = Mock()
     mock_lambda = Mock()
 
@@ -362,9 +367,8 @@ def test_update_open_event_tool_recurrence_with_habit_splits_series(monkeypatch)
 
     monkeypatch.setattr(tool_mod.uuid, "uuid4", lambda: "hid-new")
 
-    result = update_open_event_tool(
-        mock_ddb,
-        mock_lambda,
+    result = await update_open_event_tool(
+        _repository(mock_ddb, mock_lambda),
         "user-1",
         json.dumps({"frequency": 3, "time_unit": "monthly", "days": ["10"]}),
         "UTC",